@@ -11,6 +11,7 @@ Author: Reaper Security Team
 Version: 0.1.0
 """
 
+import logging
 import sys
 import time
 from libs.phantom import (
@@ -89,8 +90,8 @@ def demo_packet_crafting():
     print(f"Lost: {ping_results['lost']} ({ping_results['loss_percent']:.1f}%)")
     
     if ping_results['times']:
-        avg_time = sum(ping_results['times']) / len(ping_results['times'])
-        print(f"Average response time: {avg_time:.1f}ms")
+        print(f"Response time: min {ping_results['min_time']:.1f}ms, "
+              f"avg {ping_results['avg_time']:.1f}ms, max {ping_results['max_time']:.1f}ms")
 
 def demo_dns_operations():
     """Demonstrate DNS operations"""
@@ -207,4 +208,5 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
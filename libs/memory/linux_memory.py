@@ -4,10 +4,14 @@ Linux Memory Operations Module
 Provides memory read/write operations for Linux.
 """
 
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, Union
 import os
 
 
+# Default block size for bulk region reads
+REGION_BLOCK_SIZE = 1 << 22
+
+
 class LinuxMemoryOps:
     """
     Linux memory operations.
@@ -22,25 +26,92 @@ class LinuxMemoryOps:
         """
         self.pid = pid
         self.mem_path = f"/proc/{pid}/mem"
+        try:
+            self.fd_r = os.open(self.mem_path, os.O_RDONLY)
+        except OSError:
+            self.fd_r = None
+        self.fd_w = None
     
-    def read_memory(self, address: int, size: int) -> Optional[bytes]:
+    def read_memory(self, address: int, size: int,
+                    out: Optional[bytearray] = None) -> Optional[Union[bytes, memoryview]]:
         """
         Read memory from process.
         
         Args:
             address: Memory address
             size: Size to read
-            
+            out: Optional reusable buffer of at least size bytes to read into
+        
         Returns:
-            Memory bytes or None
+            Memory bytes, a memoryview into out when a buffer is given,
+            or None
+        
+        Raises:
+            ValueError: If out is smaller than size
         """
+        # Growing out in place would fail while a view from an earlier read
+        # is still alive, so the caller sizes the buffer once up front
+        if out is not None and len(out) < size:
+            raise ValueError(f"Buffer of {len(out)} bytes is too small for a {size} byte read")
+        if self.fd_r is None:
+            return None
         try:
-            with open(self.mem_path, 'rb') as f:
-                f.seek(address)
-                return f.read(size)
-        except (OSError, PermissionError):
+            if out is None:
+                return os.pread(self.fd_r, size, address)
+            view = memoryview(out)[:size]
+            return view[:os.preadv(self.fd_r, [view], address)]
+        except OSError:
             return None
     
+    def read_many(self, regions: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """
+        Read several memory regions, one pread per region.
+        
+        Args:
+            regions: List of (address, size) tuples
+            
+        Returns:
+            List of memory bytes (None for unreadable regions)
+        """
+        return [self.read_memory(address, size) for address, size in regions]
+    
+    def read_region(self, address: int, size: int, block: int = REGION_BLOCK_SIZE,
+                    pad: int = 0) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Read a large memory region in big blocks.
+        
+        Each block starts block bytes after the previous one and extends
+        pad bytes past it, so a pattern of up to pad + 1 bytes that straddles
+        a block boundary is still seen whole by the consumer.
+        
+        Args:
+            address: Start address
+            size: Total size of the region
+            block: Step between consecutive blocks
+            pad: Extra overlap bytes read past each block
+            
+        Yields:
+            Tuples of (block_address, block_data); block_data is a view
+            into a buffer that is overwritten by the next block
+        """
+        if self.fd_r is None:
+            return
+        
+        # One buffer serves every block; consumers must not keep the views
+        buf = bytearray(min(block + pad, size))
+        offset = 0
+        while offset < size:
+            length = min(block + pad, size - offset)
+            data = self.read_memory(address + offset, length, buf)
+            if not data:
+                return
+            
+            yield address + offset, data
+            
+            if len(data) < length:
+                return
+            offset += block
+    
     def write_memory(self, address: int, data: bytes) -> bool:
         """
         Write memory to process.
@@ -48,15 +119,24 @@ class LinuxMemoryOps:
         Args:
             address: Memory address
             data: Data to write
-            
+        
         Returns:
             True if successful
         """
         try:
-            with open(self.mem_path, 'wb') as f:
-                f.seek(address)
-                f.write(data)
-            return True
-        except (OSError, PermissionError):
+            if self.fd_w is None:
+                self.fd_w = os.open(self.mem_path, os.O_WRONLY)
+            return os.pwrite(self.fd_w, data, address) == len(data)
+        except OSError:
             return False
-
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self) -> None:
+        """Close /proc/[pid]/mem file descriptors."""
+        for fd in (getattr(self, 'fd_r', None), getattr(self, 'fd_w', None)):
+            if fd is not None:
+                os.close(fd)
+        self.fd_r = None
+        self.fd_w = None
@@ -5,8 +5,20 @@ Provides utilities for scanning process memory.
 """
 
 from typing import List, Dict, Optional, Any
+import os
+import re
 import sys
 
+from .linux_memory import LinuxMemoryOps, REGION_BLOCK_SIZE
+
+
+# One /proc/[pid]/maps line: start-end perms offset dev inode [path]
+_MAPS_RE = re.compile(
+    rb'^([0-9a-f]+)-([0-9a-f]+) ([rwxps-]{4}) ([0-9a-f]+) '
+    rb'([0-9a-f]+:[0-9a-f]+) (\d+)[ \t]*(.*)$',
+    re.MULTILINE
+)
+
 
 class MemoryScanner:
     """
@@ -90,8 +102,36 @@ class MemoryScanner:
     def _scan_linux(self, pattern: bytes, start_address: int,
                    end_address: Optional[int]) -> List[int]:
         """Scan Linux process memory."""
-        # Placeholder - would use /proc/[pid]/mem or ptrace
-        return []
+        if not pattern:
+            return []
+        
+        # Lookahead so overlapping occurrences are all reported
+        matcher = re.compile(b'(?=' + re.escape(pattern) + b')', re.DOTALL)
+        block = max(REGION_BLOCK_SIZE, len(pattern))
+        results = []
+        
+        mem = LinuxMemoryOps(self.pid or os.getpid())
+        try:
+            for region in self._get_linux_regions():
+                if 'r' not in region['permissions']:
+                    continue
+                
+                start = max(region['start'], start_address)
+                end = region['end'] if end_address is None else min(region['end'], end_address)
+                if start >= end:
+                    continue
+                
+                # One big read per block of the VMA instead of per page
+                for block_address, data in mem.read_region(start, end - start, block,
+                                                           pad=len(pattern) - 1):
+                    for match in matcher.finditer(data):
+                        # Matches in the overlap belong to the next block
+                        if match.start() < block:
+                            results.append(block_address + match.start())
+        finally:
+            mem.close()
+        
+        return results
     
     def get_memory_regions(self) -> List[Dict[str, Any]]:
         """
@@ -114,6 +154,34 @@ class MemoryScanner:
     
     def _get_linux_regions(self) -> List[Dict[str, Any]]:
         """Get Linux memory regions."""
-        # Placeholder - would parse /proc/[pid]/maps
-        return []
-
+        maps_path = f"/proc/{self.pid or 'self'}/maps"
+        
+        # Slurp the whole file with large raw reads, then parse in one pass
+        try:
+            fd = os.open(maps_path, os.O_RDONLY)
+        except OSError:
+            return []
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 1 << 20)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except OSError:
+            return []
+        finally:
+            os.close(fd)
+        
+        return [
+            {
+                'start': int(m[1], 16),
+                'end': int(m[2], 16),
+                'permissions': m[3].decode('ascii'),
+                'offset': int(m[4], 16),
+                'device': m[5].decode('ascii'),
+                'inode': int(m[6]),
+                'path': os.fsdecode(m[7]),
+            }
+            for m in _MAPS_RE.finditer(b''.join(chunks))
+        ]
@@ -0,0 +1,100 @@
+"""
+Windows API Module
+
+Provides a kernel32 handle with argument and return types declared
+for the functions used by the Windows memory and injection modules.
+"""
+
+import ctypes
+import functools
+from ctypes import wintypes
+
+
+class MEMORY_BASIC_INFORMATION(ctypes.Structure):
+    """VirtualQueryEx result (natural alignment matches both 32- and 64-bit layouts)."""
+    _fields_ = [
+        ("BaseAddress", ctypes.c_void_p),
+        ("AllocationBase", ctypes.c_void_p),
+        ("AllocationProtect", wintypes.DWORD),
+        ("RegionSize", ctypes.c_size_t),
+        ("State", wintypes.DWORD),
+        ("Protect", wintypes.DWORD),
+        ("Type", wintypes.DWORD),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def get_kernel32() -> 'ctypes.WinDLL':  # WinDLL only exists on Windows
+    """
+    Load kernel32 with typed prototypes.
+    
+    A private WinDLL instance is used so the prototypes do not leak into
+    other users of ctypes.windll. Declaring argtypes/restype up front lets
+    ctypes skip generic per-call argument conversion and keeps pointer
+    return values from being truncated to a C int on 64-bit Windows.
+    
+    Returns:
+        kernel32 library handle
+    """
+    k = ctypes.WinDLL('kernel32')
+    
+    k.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    k.OpenProcess.restype = wintypes.HANDLE
+    
+    k.ReadProcessMemory.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.c_void_p,
+        ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)
+    ]
+    k.ReadProcessMemory.restype = wintypes.BOOL
+    
+    k.WriteProcessMemory.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.c_void_p,
+        ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)
+    ]
+    k.WriteProcessMemory.restype = wintypes.BOOL
+    
+    k.VirtualAllocEx.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.c_size_t,
+        wintypes.DWORD, wintypes.DWORD
+    ]
+    k.VirtualAllocEx.restype = ctypes.c_void_p
+    
+    k.VirtualFreeEx.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.c_size_t, wintypes.DWORD
+    ]
+    k.VirtualFreeEx.restype = wintypes.BOOL
+    
+    k.VirtualProtectEx.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.c_size_t,
+        wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)
+    ]
+    k.VirtualProtectEx.restype = wintypes.BOOL
+    
+    k.VirtualQueryEx.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p,
+        ctypes.POINTER(MEMORY_BASIC_INFORMATION), ctypes.c_size_t
+    ]
+    k.VirtualQueryEx.restype = ctypes.c_size_t
+    
+    k.CreateRemoteThread.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p,
+        ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)
+    ]
+    k.CreateRemoteThread.restype = wintypes.HANDLE
+    
+    k.ResumeThread.argtypes = [wintypes.HANDLE]
+    k.ResumeThread.restype = wintypes.DWORD
+    
+    k.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    k.WaitForSingleObject.restype = wintypes.DWORD
+    
+    k.CloseHandle.argtypes = [wintypes.HANDLE]
+    k.CloseHandle.restype = wintypes.BOOL
+    
+    k.GetModuleHandleA.argtypes = [wintypes.LPCSTR]
+    k.GetModuleHandleA.restype = wintypes.HMODULE
+    
+    k.GetProcAddress.argtypes = [wintypes.HMODULE, wintypes.LPCSTR]
+    k.GetProcAddress.restype = ctypes.c_void_p
+    
+    return k
@@ -8,6 +8,8 @@ from typing import Optional
 import ctypes
 from ctypes import wintypes
 
+from .windows_api import get_kernel32
+
 
 class WindowsInjector:
     """
@@ -16,7 +18,13 @@ class WindowsInjector:
     
     def __init__(self):
         """Initialize Windows injector."""
-        self.kernel32 = ctypes.windll.kernel32
+        self.kernel32 = get_kernel32()
+        # kernel32 is mapped at the same base in every process, so the
+        # LoadLibraryW address resolved here is valid in the target too
+        self._load_library = self.kernel32.GetProcAddress(
+            self.kernel32.GetModuleHandleA(b"kernel32.dll"),
+            b"LoadLibraryW"
+        )
     
     def inject_dll(self, pid: int, dll_path: str) -> bool:
         """
@@ -42,7 +50,7 @@ class WindowsInjector:
                 return False
             
             # Allocate memory in target process
-            dll_path_bytes = dll_path.encode('utf-8') + b'\x00'
+            dll_path_bytes = dll_path.encode('utf-16-le') + b'\x00\x00'
             dll_path_len = len(dll_path_bytes)
             
             MEM_COMMIT = 0x1000
@@ -72,20 +80,13 @@ class WindowsInjector:
                 self.kernel32.CloseHandle(h_process)
                 return False
             
-            # Get LoadLibraryA address
-            h_kernel32 = self.kernel32.GetModuleHandleA(b"kernel32.dll")
-            load_library = self.kernel32.GetProcAddress(
-                h_kernel32,
-                b"LoadLibraryA"
-            )
-            
             # Create remote thread
             CREATE_SUSPENDED = 0x4
             h_thread = self.kernel32.CreateRemoteThread(
                 h_process,
                 None,
                 0,
-                load_library,
+                self._load_library,
                 alloc_addr,
                 CREATE_SUSPENDED,
                 None
@@ -6,8 +6,20 @@ Provides memory read/write operations for Windows.
 
 from typing import Optional
 import ctypes
+import threading
 from ctypes import wintypes
 
+from .windows_api import MEMORY_BASIC_INFORMATION, get_kernel32
+
+
+# Initial size of the per-thread ReadProcessMemory buffer
+READ_BUFFER_SIZE = 1 << 20
+
+MEM_COMMIT = 0x1000
+PAGE_GUARD = 0x100
+# PAGE_READWRITE | PAGE_WRITECOPY | PAGE_EXECUTE_READWRITE | PAGE_EXECUTE_WRITECOPY
+PAGE_WRITABLE = 0x04 | 0x08 | 0x40 | 0x80
+
 
 class WindowsMemoryOps:
     """
@@ -22,8 +34,9 @@ class WindowsMemoryOps:
             pid: Target process ID
         """
         self.pid = pid
-        self.kernel32 = ctypes.windll.kernel32
+        self.kernel32 = get_kernel32()
         self.h_process = None
+        self._local = threading.local()
         self._open_process()
     
     def _open_process(self) -> bool:
@@ -36,6 +49,38 @@ class WindowsMemoryOps:
         )
         return self.h_process is not None
     
+    def _read_buffer(self, size: int) -> ctypes.Array:
+        """Get this thread's reusable read buffer, grown to at least size bytes."""
+        buf = getattr(self._local, 'buf', None)
+        if buf is None or size > len(buf):
+            self._local.buf = buf = (ctypes.c_ubyte * max(size, READ_BUFFER_SIZE))()
+        return buf
+    
+    def _byte_count(self) -> ctypes.c_size_t:
+        """Get this thread's reusable bytes-transferred out parameter."""
+        count = getattr(self._local, 'count', None)
+        if count is None:
+            self._local.count = count = ctypes.c_size_t(0)
+        return count
+    
+    def _is_writable(self, address: int, size: int) -> bool:
+        """Check whether [address, address + size) lies in one committed writable region."""
+        mbi = MEMORY_BASIC_INFORMATION()
+        if not self.kernel32.VirtualQueryEx(
+            self.h_process,
+            address,
+            ctypes.byref(mbi),
+            ctypes.sizeof(mbi)
+        ):
+            return False
+        
+        return bool(
+            mbi.State == MEM_COMMIT
+            and mbi.Protect & PAGE_WRITABLE
+            and not mbi.Protect & PAGE_GUARD
+            and (mbi.BaseAddress or 0) + mbi.RegionSize >= address + size
+        )
+    
     def read_memory(self, address: int, size: int) -> Optional[bytes]:
         """
         Read memory from process.
@@ -50,17 +95,17 @@ class WindowsMemoryOps:
         if not self.h_process:
             return None
         
-        buffer = ctypes.create_string_buffer(size)
-        bytes_read = ctypes.c_size_t(0)
+        buffer = self._read_buffer(size)
+        bytes_read = self._byte_count()
         
         if self.kernel32.ReadProcessMemory(
             self.h_process,
-            ctypes.c_void_p(address),
+            address,
             buffer,
             size,
             ctypes.byref(bytes_read)
         ):
-            return buffer.raw[:bytes_read.value]
+            return ctypes.string_at(buffer, bytes_read.value)
         
         return None
     
@@ -78,16 +123,28 @@ class WindowsMemoryOps:
         if not self.h_process:
             return False
         
-        buffer = ctypes.create_string_buffer(data)
-        bytes_written = ctypes.c_size_t(0)
+        size = len(data)
+        buffer = (ctypes.c_ubyte * size).from_buffer_copy(data)
+        bytes_written = self._byte_count()
+        
+        # Already writable pages need no protect/unprotect round trip
+        if self._is_writable(address, size):
+            result = self.kernel32.WriteProcessMemory(
+                self.h_process,
+                address,
+                buffer,
+                size,
+                ctypes.byref(bytes_written)
+            )
+            return bool(result) and bytes_written.value == size
         
         # Change memory protection
         PAGE_EXECUTE_READWRITE = 0x40
         old_protect = wintypes.DWORD(0)
         if not self.kernel32.VirtualProtectEx(
             self.h_process,
-            ctypes.c_void_p(address),
-            len(data),
+            address,
+            size,
             PAGE_EXECUTE_READWRITE,
             ctypes.byref(old_protect)
         ):
@@ -96,22 +153,22 @@ class WindowsMemoryOps:
         # Write memory
         result = self.kernel32.WriteProcessMemory(
             self.h_process,
-            ctypes.c_void_p(address),
+            address,
             buffer,
-            len(data),
+            size,
             ctypes.byref(bytes_written)
         )
         
         # Restore protection
         self.kernel32.VirtualProtectEx(
             self.h_process,
-            ctypes.c_void_p(address),
-            len(data),
+            address,
+            size,
             old_protect.value,
             ctypes.byref(old_protect)
         )
         
-        return result and bytes_written.value == len(data)
+        return bool(result) and bytes_written.value == size
     
     def close(self) -> None:
         """Close process handle."""
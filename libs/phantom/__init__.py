@@ -11,7 +11,7 @@ from .scanner import (
 )
 
 from .packet import (
-    PhantomPacket, PacketConfig, Protocol,
+    PhantomPacket, PacketConfig, Protocol, TCPTemplate,
     create_tcp_packet, create_udp_packet, create_icmp_packet, ping_host
 )
 
@@ -26,7 +26,7 @@ __all__ = [
     'scan_port', 'scan_ports', 'scan_range', 'get_open_ports', 'get_service_summary',
     
     # Packet crafting
-    'PhantomPacket', 'PacketConfig', 'Protocol',
+    'PhantomPacket', 'PacketConfig', 'Protocol', 'TCPTemplate',
     'create_tcp_packet', 'create_udp_packet', 'create_icmp_packet', 'ping_host',
     
     # DNS operations
@@ -0,0 +1,161 @@
+"""
+Phantom Checksum Module
+
+This module computes the RFC 1071 Internet checksum used by Phantom
+packet crafting.
+
+A compiled kernel (csum.c) is loaded through ctypes when a built copy
+sits next to this module; otherwise a NumPy implementation is used.
+Build the kernel for the current machine with:
+
+    python -m libs.phantom.checksum
+
+Author: Reaper Security Team
+Version: 0.1.0
+"""
+
+import ctypes
+import os
+import platform
+import subprocess
+import sys
+import sysconfig
+import logging
+from typing import Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_SOURCE_PATH = os.path.join(_MODULE_DIR, 'csum.c')
+
+def library_path() -> str:
+    """Path of the compiled checksum kernel for this machine"""
+    if sys.platform == 'win32':
+        ext = '.dll'
+    elif sys.platform == 'darwin':
+        ext = '.dylib'
+    else:
+        ext = '.so'
+    return os.path.join(_MODULE_DIR, f"_csum-{platform.machine().lower()}{ext}")
+
+class _Span(ctypes.Structure):
+    """struct csum_span from csum.c"""
+    _fields_ = [('base', ctypes.c_char_p), ('len', ctypes.c_size_t)]
+
+def _load(path: str) -> Optional[ctypes.CDLL]:
+    """Load a compiled checksum kernel, or None if unavailable"""
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError as e:
+        logger.warning(f"Failed to load checksum kernel {path}: {e}")
+        return None
+    
+    try:
+        lib.rfc1071.argtypes = [ctypes.c_char_p, ctypes.c_size_t]
+        lib.rfc1071.restype = ctypes.c_uint16
+        lib.rfc1071_multi.argtypes = [ctypes.POINTER(_Span), ctypes.c_size_t]
+        lib.rfc1071_multi.restype = ctypes.c_uint16
+        lib.rfc1071_3.argtypes = [ctypes.c_char_p, ctypes.c_size_t] * 3
+        lib.rfc1071_3.restype = ctypes.c_uint16
+    except AttributeError as e:
+        logger.warning(f"Checksum kernel {path} is out of date, rebuild it: {e}")
+        return None
+    
+    return lib
+
+_lib = _load(library_path())
+
+def checksum_numpy(data: bytes) -> int:
+    """
+    Calculate the Internet checksum with NumPy.
+    
+    Args:
+        data: Data to calculate checksum for
+    
+    Returns:
+        Checksum value
+    """
+    # Add padding if odd length
+    if len(data) & 1:
+        data += b'\x00'
+    
+    # Sum 16-bit big-endian words in one vectorized pass
+    checksum = int(np.frombuffer(data, dtype='>u2').sum(dtype=np.uint64))
+    
+    # Add carry bits
+    while checksum >> 16:
+        checksum = (checksum & 0xFFFF) + (checksum >> 16)
+    
+    # One's complement
+    return ~checksum & 0xFFFF
+
+def checksum(data: bytes) -> int:
+    """
+    Calculate the Internet checksum, using the compiled kernel if loaded.
+    
+    Args:
+        data: Data to calculate checksum for
+    
+    Returns:
+        Checksum value
+    """
+    if _lib is None:
+        return checksum_numpy(data)
+    return _lib.rfc1071(bytes(data), len(data))
+
+def checksum_iov(spans: Sequence[bytes]) -> int:
+    """
+    Calculate the Internet checksum of several spans as if concatenated.
+    
+    With the compiled kernel loaded the spans are summed in place, so a
+    pseudo-header, header and payload need not be joined into one buffer.
+    
+    Args:
+        spans: Byte spans in packet order (odd lengths are allowed)
+    
+    Returns:
+        Checksum value
+    """
+    if _lib is None:
+        return checksum_numpy(b''.join(spans))
+    
+    spans = [span if type(span) is bytes else bytes(span) for span in spans]
+    if len(spans) == 3:
+        # Common pseudo-header/header/payload case, no span array to build
+        a, b, c = spans
+        return _lib.rfc1071_3(a, len(a), b, len(b), c, len(c))
+    
+    array = (_Span * len(spans))(*[(span, len(span)) for span in spans])
+    return _lib.rfc1071_multi(array, len(spans))
+
+def build(output: Optional[str] = None, compiler: Optional[str] = None) -> str:
+    """
+    Compile csum.c into a shared library.
+    
+    Args:
+        output: Output path (defaults to library_path())
+        compiler: C compiler command (defaults to $CC or Python's compiler)
+    
+    Returns:
+        Path of the built library
+    
+    Raises:
+        subprocess.CalledProcessError: If compilation fails
+    """
+    output = output or library_path()
+    compiler = compiler or os.environ.get('CC') or (sysconfig.get_config_var('CC') or 'cc').split()[0]
+    
+    command = [compiler, '-O3', '-shared', '-fPIC', '-o', output, _SOURCE_PATH]
+    logger.info(f"Building checksum kernel: {' '.join(command)}")
+    subprocess.run(command, check=True)
+    return output
+
+__all__ = ['checksum', 'checksum_iov', 'checksum_numpy', 'build', 'library_path']
+
+if __name__ == '__main__':
+    print(build())
@@ -0,0 +1,262 @@
+/*
+ * Phantom RFC 1071 Internet checksum kernel
+ *
+ * Loaded through ctypes by libs/phantom/checksum.py.
+ * Build with:  python -m libs.phantom.checksum
+ *
+ * The one's complement sum is byte-order independent (RFC 1071 section
+ * 2(B)), so the buffer is summed as native 64-bit words and the folded
+ * 16-bit result is byte-swapped once at the end on little-endian hosts.
+ *
+ * On x86-64 an AVX2 loop is selected at runtime when the CPU supports it;
+ * the library itself is built without -mavx2 so it loads everywhere.
+ * On AArch64 NEON is part of the base ISA and is always used.
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+#define CSUM_HAVE_AVX2 1
+#include <immintrin.h>
+#endif
+
+#if defined(__aarch64__) && defined(__ARM_NEON)
+#define CSUM_HAVE_NEON 1
+#include <arm_neon.h>
+#endif
+
+/* One contiguous span of a packet; same layout as struct iovec on POSIX */
+struct csum_span {
+    const uint8_t *base;
+    size_t len;
+};
+
+#ifdef _WIN32
+#define CSUM_EXPORT __declspec(dllexport)
+#else
+#define CSUM_EXPORT
+#endif
+
+#if defined(__GNUC__) || defined(__clang__)
+#define ADD_OVERFLOW(a, b, res) __builtin_add_overflow((a), (b), (res))
+#else
+static int add_overflow_u64(uint64_t a, uint64_t b, uint64_t *res)
+{
+    *res = a + b;
+    return *res < a;
+}
+#define ADD_OVERFLOW(a, b, res) add_overflow_u64((a), (b), (res))
+#endif
+
+/* Add with end-around carry */
+static uint64_t add_carry(uint64_t a, uint64_t b)
+{
+    uint64_t s;
+    unsigned carry = ADD_OVERFLOW(a, b, &s);
+    return s + carry;
+}
+
+/* Fold a 64-bit one's complement sum down to 16 bits (host byte order) */
+static uint16_t fold64(uint64_t s)
+{
+    s = (s & 0xFFFFFFFFu) + (s >> 32);
+    s = (s & 0xFFFFFFFFu) + (s >> 32);
+    s = (s & 0xFFFFu) + (s >> 16);
+    s = (s & 0xFFFFu) + (s >> 16);
+    return (uint16_t)s;
+}
+
+/* Convert a folded native-order sum to the big-endian word value */
+static uint16_t to_network(uint16_t s)
+{
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_BIG_ENDIAN__
+    return s;
+#else
+    return (uint16_t)((s >> 8) | (s << 8));
+#endif
+}
+
+/* Scalar sum: 8 bytes per add, two independent accumulators for ILP */
+static uint64_t sum_scalar(const uint8_t *p, size_t n)
+{
+    uint64_t s0 = 0, s1 = 0, c0 = 0, c1 = 0;
+    uint64_t w0, w1;
+
+    while (n >= 16) {
+        memcpy(&w0, p, 8);
+        memcpy(&w1, p + 8, 8);
+        c0 += ADD_OVERFLOW(s0, w0, &s0);
+        c1 += ADD_OVERFLOW(s1, w1, &s1);
+        p += 16;
+        n -= 16;
+    }
+    if (n >= 8) {
+        memcpy(&w0, p, 8);
+        c0 += ADD_OVERFLOW(s0, w0, &s0);
+        p += 8;
+        n -= 8;
+    }
+    if (n) {
+        /* Zero-padded tail keeps 16-bit word alignment (odd byte is a high byte) */
+        w1 = 0;
+        memcpy(&w1, p, n);
+        c1 += ADD_OVERFLOW(s1, w1, &s1);
+    }
+
+    return add_carry(add_carry(s0, s1), c0 + c1);
+}
+
+/* Below this size vector setup and reduction cost more than they save */
+#define WIDE_MIN_BYTES 64
+
+#ifdef CSUM_HAVE_AVX2
+/* 32-bit lanes gain at most one 16-bit word per iteration per accumulator */
+#define AVX2_MAX_ITERS 65535
+
+__attribute__((target("avx2")))
+static uint64_t reduce_epi32(__m256i v)
+{
+    uint32_t lanes[8];
+    uint64_t s = 0;
+    int i;
+
+    _mm256_storeu_si256((__m256i *)lanes, v);
+    for (i = 0; i < 8; i++)
+        s += lanes[i];
+    return s;
+}
+
+/* AVX2 sum: 32 bytes per iteration, two independent lane accumulators */
+__attribute__((target("avx2")))
+static uint64_t sum_avx2(const uint8_t *p, size_t n)
+{
+    const __m256i zero = _mm256_setzero_si256();
+    uint64_t total = 0;
+
+    while (n >= 32) {
+        __m256i acc_lo = zero, acc_hi = zero;
+        size_t iters = n / 32;
+
+        if (iters > AVX2_MAX_ITERS)
+            iters = AVX2_MAX_ITERS;
+        n -= iters * 32;
+
+        while (iters--) {
+            __m256i v = _mm256_loadu_si256((const __m256i *)p);
+            acc_lo = _mm256_add_epi32(acc_lo, _mm256_unpacklo_epi16(v, zero));
+            acc_hi = _mm256_add_epi32(acc_hi, _mm256_unpackhi_epi16(v, zero));
+            p += 32;
+        }
+
+        /* Reduce across lanes only once per block */
+        total += reduce_epi32(acc_lo) + reduce_epi32(acc_hi);
+    }
+
+    return add_carry(total, sum_scalar(p, n));
+}
+#endif
+
+#ifdef CSUM_HAVE_NEON
+/* NEON sum: 32 bytes per iteration, two independent 64-bit accumulators */
+static uint64_t sum_neon(const uint8_t *p, size_t n)
+{
+    uint64x2_t acc0 = vdupq_n_u64(0), acc1 = vdupq_n_u64(0);
+
+    while (n >= 32) {
+        /* Sum 16-bit words (not bytes) pairwise into 32 bits, then widen */
+        uint16x8_t w0 = vreinterpretq_u16_u8(vld1q_u8(p));
+        uint16x8_t w1 = vreinterpretq_u16_u8(vld1q_u8(p + 16));
+        acc0 = vpadalq_u32(acc0, vpaddlq_u16(w0));
+        acc1 = vpadalq_u32(acc1, vpaddlq_u16(w1));
+        p += 32;
+        n -= 32;
+    }
+
+    return add_carry(vaddvq_u64(vaddq_u64(acc0, acc1)), sum_scalar(p, n));
+}
+#endif
+
+typedef uint64_t (*sum_fn)(const uint8_t *, size_t);
+
+static sum_fn select_sum(void)
+{
+#ifdef CSUM_HAVE_AVX2
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2"))
+        return sum_avx2;
+#endif
+#ifdef CSUM_HAVE_NEON
+    return sum_neon;
+#else
+    return sum_scalar;
+#endif
+}
+
+/* Unfolded native-order sum of one buffer, picking the widest loop */
+static uint64_t sum_any(const uint8_t *p, size_t n)
+{
+    static sum_fn sum_wide;
+
+    /* Pseudo-header plus TCP header is ~32-40 bytes: stay scalar there */
+    if (n < WIDE_MIN_BYTES)
+        return sum_scalar(p, n);
+
+    if (!sum_wide)
+        sum_wide = select_sum();
+    return sum_wide(p, n);
+}
+
+CSUM_EXPORT uint16_t rfc1071(const uint8_t *p, size_t n)
+{
+    return (uint16_t)~to_network(fold64(sum_any(p, n)));
+}
+
+/*
+ * Add one span's sum to a running total as if the spans were concatenated.
+ *
+ * A span that starts at an odd offset into the packet has every byte in
+ * the other half of its 16-bit word, so its folded sum is byte-swapped
+ * before it is added (RFC 1071 section 2(B) again).
+ */
+static uint64_t add_span(uint64_t total, size_t *offset, const uint8_t *p, size_t n)
+{
+    uint16_t s = fold64(sum_any(p, n));
+
+    if (*offset & 1)
+        s = (uint16_t)((s >> 8) | (s << 8));
+    *offset += n;
+    return total + s;
+}
+
+/* Checksum several spans as if they were concatenated, without copying */
+CSUM_EXPORT uint16_t rfc1071_multi(const struct csum_span *spans, size_t count)
+{
+    uint64_t total = 0;
+    size_t offset = 0;
+    size_t i;
+
+    for (i = 0; i < count; i++)
+        total = add_span(total, &offset, spans[i].base, spans[i].len);
+
+    return (uint16_t)~to_network(fold64(total));
+}
+
+/*
+ * Three-span form (pseudo-header, header, payload) taking plain arguments,
+ * so ctypes callers do not have to marshal a span array per packet.
+ */
+CSUM_EXPORT uint16_t rfc1071_3(const uint8_t *p0, size_t n0,
+                               const uint8_t *p1, size_t n1,
+                               const uint8_t *p2, size_t n2)
+{
+    uint64_t total = 0;
+    size_t offset = 0;
+
+    total = add_span(total, &offset, p0, n0);
+    total = add_span(total, &offset, p1, n1);
+    total = add_span(total, &offset, p2, n2);
+
+    return (uint16_t)~to_network(fold64(total));
+}
@@ -14,16 +14,45 @@ Author: Reaper Security Team
 Version: 0.1.0
 """
 
+import asyncio
 import socket
 import struct
-import random
+import os
+import time
 import logging
+import threading
 from typing import List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Precompiled wire formats (avoids re-parsing format strings per packet)
+_HDR = struct.Struct('!HHHHHH')
+_QTYPE_CLASS = struct.Struct('!HH')
+_RR_FIXED = struct.Struct('!HHIH')
+_U16 = struct.Struct('!H')
+
+# Errors a malformed response can raise while it is parsed
+_PARSE_ERRORS = (ValueError, IndexError, struct.error)
+
+# EDNS0 OPT pseudo-RR advertising a 4096-byte UDP payload (RFC 6891)
+_EDNS0_OPT = b'\x00\x00\x29\x10\x00\x00\x00\x00\x00\x00\x00'
+_UDP_PAYLOAD_SIZE = 4096
+
+# Pool of unpredictable transaction IDs, refilled from os.urandom in batches
+_QUERY_ID_BATCH = 256
+_query_id_pool: List[int] = []
+
+def _new_query_id() -> int:
+    """Draw a random non-zero DNS transaction ID"""
+    while True:
+        try:
+            return _query_id_pool.pop()
+        except IndexError:
+            raw = os.urandom(2 * _QUERY_ID_BATCH)
+            _query_id_pool.extend(qid for (qid,) in _U16.iter_unpack(raw) if qid)
+
 class DNSRecordType(Enum):
     """DNS record types"""
     A = 1
@@ -50,6 +79,17 @@ class DNSRecord:
     data: str
     priority: Optional[int] = None  # For MX records
 
+# Record types queried by dns_enumeration and enumerate_many
+_ENUMERATION_RECORD_TYPES = [
+    DNSRecordType.A,
+    DNSRecordType.AAAA,
+    DNSRecordType.CNAME,
+    DNSRecordType.MX,
+    DNSRecordType.NS,
+    DNSRecordType.TXT,
+    DNSRecordType.SOA
+]
+
 @dataclass
 class DNSConfig:
     """Configuration for DNS operations"""
@@ -58,6 +98,22 @@ class DNSConfig:
     retries: int = 3
     port: int = 53
 
+class _DNSProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that hands DNS responses to waiters by transaction ID"""
+    
+    def __init__(self, futures: Dict[int, asyncio.Future]):
+        self.futures = futures
+    
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        if len(data) < 12:
+            return
+        future = self.futures.get(_U16.unpack_from(data, 0)[0])
+        if future is not None and not future.done():
+            future.set_result(data)
+    
+    def error_received(self, exc: Exception) -> None:
+        logger.warning(f"DNS socket error: {exc}")
+
 class PhantomDNS:
     """
     DNS operations class for Phantom library.
@@ -74,6 +130,29 @@ class PhantomDNS:
             config: DNSConfig with DNS server settings
         """
         self.config = config or DNSConfig()
+        self._idle_socks: List[socket.socket] = []  # UDP query sockets not in use
+        self._sock_lock = threading.Lock()  # Guards _idle_socks only
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self) -> None:
+        """Close the idle UDP query sockets."""
+        socks = getattr(self, '_idle_socks', None) or []
+        while socks:
+            socks.pop().close()
+    
+    def _acquire_socket(self) -> socket.socket:
+        """Take an idle UDP query socket, creating one if none is free."""
+        with self._sock_lock:
+            if self._idle_socks:
+                return self._idle_socks.pop()
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    
+    def _release_socket(self, sock: socket.socket) -> None:
+        """Return a UDP query socket for reuse by later queries."""
+        with self._sock_lock:
+            self._idle_socks.append(sock)
     
     def _encode_domain_name(self, domain: str) -> bytes:
         """
@@ -84,24 +163,34 @@ class PhantomDNS:
             
         Returns:
             Encoded domain name bytes
+            
+        Raises:
+            ValueError: If a label is longer than 63 bytes or not ASCII
         """
-        encoded = b''
-        for part in domain.split('.'):
-            encoded += struct.pack('!B', len(part)) + part.encode('utf-8')
-        encoded += b'\x00'  # Null terminator
-        return encoded
+        labels = [label.encode('ascii') for label in domain.rstrip('.').split('.')]
+        if any(len(label) > 63 for label in labels):
+            raise ValueError("Invalid domain name length")
+        
+        parts = [bytes((len(label),)) + label for label in labels]
+        parts.append(b'\x00')  # Null terminator
+        return b''.join(parts)
     
-    def _decode_domain_name(self, data: bytes, offset: int) -> Tuple[str, int]:
+    def _decode_domain_name(self, data: bytes, offset: int,
+                            memo: Optional[Dict[int, Tuple[str, int]]] = None) -> Tuple[str, int]:
         """
         Decode domain name from DNS packet.
         
         Args:
             data: DNS packet data
             offset: Starting offset
+            memo: Optional per-packet cache of already decoded offsets
             
         Returns:
             Tuple of (domain_name, new_offset)
         """
+        if memo is not None and offset in memo:
+            return memo[offset]
+        
         domain_parts = []
         original_offset = offset
         
@@ -115,7 +204,10 @@ class PhantomDNS:
             if length & 0xC0 == 0xC0:  # Compression pointer
                 pointer = ((length & 0x3F) << 8) + data[offset]
                 offset += 1
-                compressed_name, _ = self._decode_domain_name(data, pointer)
+                if pointer >= original_offset:
+                    # Names only point back to earlier names, which also rules out loops
+                    raise ValueError("Invalid compression pointer")
+                compressed_name, _ = self._decode_domain_name(data, pointer, memo)
                 domain_parts.append(compressed_name)
                 break
             
@@ -126,7 +218,10 @@ class PhantomDNS:
             domain_parts.append(part)
             offset += length
         
-        return '.'.join(domain_parts), offset
+        result = '.'.join(domain_parts), offset
+        if memo is not None:
+            memo[original_offset] = result
+        return result
     
     def _create_dns_query(self, domain: str, record_type: DNSRecordType, query_id: int = None) -> bytes:
         """
@@ -141,17 +236,16 @@ class PhantomDNS:
             DNS query packet bytes
         """
         if query_id is None:
-            query_id = random.randint(1, 65535)
+            query_id = _new_query_id()
         
         # DNS header
         flags = 0x0100  # Standard query, recursion desired
         questions = 1
         answers = 0
         authority = 0
-        additional = 0
+        additional = 1  # EDNS0 OPT record
         
-        header = struct.pack(
-            '!HHHHHH',
+        header = _HDR.pack(
             query_id,    # Transaction ID
             flags,       # Flags
             questions,   # Questions
@@ -162,16 +256,17 @@ class PhantomDNS:
         
         # Question section
         question = self._encode_domain_name(domain)
-        question += struct.pack('!HH', record_type.value, DNSQueryClass.IN.value)
+        question += _QTYPE_CLASS.pack(record_type.value, DNSQueryClass.IN.value)
         
-        return header + question
+        return header + question + _EDNS0_OPT
     
-    def _parse_dns_response(self, data: bytes) -> List[DNSRecord]:
+    def _parse_dns_response(self, data: bytes, question_len: Optional[int] = None) -> List[DNSRecord]:
         """
         Parse DNS response packet.
         
         Args:
             data: DNS response packet
+            question_len: Length of the single question we sent, if known
             
         Returns:
             List of DNSRecord objects
@@ -180,24 +275,29 @@ class PhantomDNS:
             raise ValueError("Invalid DNS packet")
         
         # Parse header
-        query_id, flags, questions, answers, authority, additional = struct.unpack('!HHHHHH', data[:12])
+        query_id, flags, questions, answers, authority, additional = _HDR.unpack_from(data, 0)
         
         records = []
         offset = 12
+        memo: Dict[int, Tuple[str, int]] = {}
         
-        # Skip question section
-        for _ in range(questions):
-            _, offset = self._decode_domain_name(data, offset)
-            offset += 4  # Skip type and class
+        # Skip question section; our own single question is echoed back
+        # verbatim, so its length is known without walking the labels
+        if questions == 1 and question_len is not None:
+            offset += question_len
+        else:
+            for _ in range(questions):
+                _, offset = self._decode_domain_name(data, offset, memo)
+                offset += 4  # Skip type and class
         
         # Parse answer section
         for _ in range(answers):
-            name, offset = self._decode_domain_name(data, offset)
+            name, offset = self._decode_domain_name(data, offset, memo)
             
             if offset + 10 > len(data):
                 break
             
-            record_type, record_class, ttl, data_length = struct.unpack('!HHIH', data[offset:offset + 10])
+            record_type, record_class, ttl, data_length = _RR_FIXED.unpack_from(data, offset)
             offset += 10
             
             if offset + data_length > len(data):
@@ -216,22 +316,69 @@ class PhantomDNS:
                     ip = socket.inet_ntop(socket.AF_INET6, record_data)
                     records.append(DNSRecord(name, DNSRecordType.AAAA, ttl, ip))
             elif record_type == DNSRecordType.CNAME.value:
-                cname, _ = self._decode_domain_name(data, offset - data_length)
+                cname, _ = self._decode_domain_name(data, offset - data_length, memo)
                 records.append(DNSRecord(name, DNSRecordType.CNAME, ttl, cname))
             elif record_type == DNSRecordType.MX.value:
                 if len(record_data) >= 2:
-                    priority = struct.unpack('!H', record_data[:2])[0]
-                    mx_host, _ = self._decode_domain_name(data, offset - data_length + 2)
+                    priority = _U16.unpack_from(data, offset - data_length)[0]
+                    mx_host, _ = self._decode_domain_name(data, offset - data_length + 2, memo)
                     records.append(DNSRecord(name, DNSRecordType.MX, ttl, mx_host, priority))
             elif record_type == DNSRecordType.TXT.value:
-                txt_data = record_data.decode('utf-8', errors='ignore')
-                records.append(DNSRecord(name, DNSRecordType.TXT, ttl, txt_data))
+                # RDATA is a sequence of <length><bytes> character-strings
+                chunks, p = [], 0
+                while p < len(record_data):
+                    length = record_data[p]
+                    p += 1
+                    chunks.append(record_data[p:p + length].decode('latin-1'))
+                    p += length
+                records.append(DNSRecord(name, DNSRecordType.TXT, ttl, ''.join(chunks)))
             elif record_type == DNSRecordType.NS.value:
-                ns_host, _ = self._decode_domain_name(data, offset - data_length)
+                ns_host, _ = self._decode_domain_name(data, offset - data_length, memo)
                 records.append(DNSRecord(name, DNSRecordType.NS, ttl, ns_host))
         
         return records
     
+    def _build_and_send(self, sock: socket.socket, domain: str, record_type: DNSRecordType,
+                        query_id: int) -> int:
+        """
+        Build a DNS query packet and send it on an existing UDP socket.
+        
+        Args:
+            sock: UDP socket to send on
+            domain: Domain to query
+            record_type: Type of DNS record
+            query_id: Transaction ID to stamp into the header
+            
+        Returns:
+            Length of the question section that was sent
+        """
+        query_packet = self._create_dns_query(domain, record_type, query_id)
+        sock.sendto(query_packet, (self.config.dns_server, self.config.port))
+        return self._question_len(query_packet)
+    
+    @staticmethod
+    def _question_len(query_packet: bytes) -> int:
+        """Length of the question section of a packet built by _create_dns_query."""
+        return len(query_packet) - 12 - len(_EDNS0_OPT)
+    
+    def _match_response(self, data: bytes, query_id: int,
+                        question_len: Optional[int] = None) -> Optional[List[DNSRecord]]:
+        """
+        Parse a DNS response if it answers the given transaction.
+        
+        Args:
+            data: DNS response packet
+            query_id: Expected transaction ID
+            question_len: Length of the question that was sent, if known
+            
+        Returns:
+            List of DNSRecord objects, or None if the response belongs to
+            a different transaction
+        """
+        if len(data) < 12 or _U16.unpack_from(data, 0)[0] != query_id:
+            return None
+        return self._parse_dns_response(data, question_len)
+    
     def query(self, domain: str, record_type: DNSRecordType = DNSRecordType.A) -> List[DNSRecord]:
         """
         Perform DNS query.
@@ -245,25 +392,41 @@ class PhantomDNS:
         """
         logger.info(f"Querying {record_type.name} record for {domain}")
         
-        query_packet = self._create_dns_query(domain, record_type)
+        query_id = _new_query_id()
         
+        # Each call holds a socket of its own for all attempts, so concurrent
+        # queries never wait on each other's timeouts
+        sock = self._acquire_socket()
         for attempt in range(self.config.retries):
             try:
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                    sock.settimeout(self.config.timeout)
-                    sock.sendto(query_packet, (self.config.dns_server, self.config.port))
-                    
-                    response, _ = sock.recvfrom(512)
-                    records = self._parse_dns_response(response)
-                    
-                    logger.info(f"Received {len(records)} records")
-                    return records
+                question_len = self._build_and_send(sock, domain, record_type, query_id)
+                
+                deadline = time.monotonic() + self.config.timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise socket.timeout()
+                    sock.settimeout(remaining)
                     
+                    response, _ = sock.recvfrom(_UDP_PAYLOAD_SIZE)
+                    records = self._match_response(response, query_id, question_len)
+                    # Late replies to earlier queries on this socket are dropped
+                    if records is not None:
+                        break
+                
+                logger.info(f"Received {len(records)} records")
+                self._release_socket(sock)
+                return records
+                
             except socket.timeout:
                 logger.warning(f"DNS query timeout (attempt {attempt + 1})")
             except Exception as e:
                 logger.error(f"DNS query error: {e}")
+                # Replace a socket that failed rather than pooling it again
+                sock.close()
+                sock = self._acquire_socket()
         
+        self._release_socket(sock)
         logger.error(f"DNS query failed after {self.config.retries} attempts")
         return []
     
@@ -394,27 +557,219 @@ class PhantomDNS:
         """
         logger.info(f"Performing DNS enumeration for {domain}")
         
-        results = {}
-        record_types = [
-            DNSRecordType.A,
-            DNSRecordType.AAAA,
-            DNSRecordType.CNAME,
-            DNSRecordType.MX,
-            DNSRecordType.NS,
-            DNSRecordType.TXT,
-            DNSRecordType.SOA
-        ]
+        # Reject a name that cannot be encoded before any query is sent
+        try:
+            self._encode_domain_name(domain)
+        except ValueError as e:
+            logger.warning(f"Invalid domain name {domain!r}: {e}")
+            return {}
+        
+        record_types = _ENUMERATION_RECORD_TYPES
         
+        # All record types are pipelined on one socket; responses are
+        # dispatched back to their record type via the transaction ID.
+        pending: Dict[int, DNSRecordType] = {}
         for record_type in record_types:
-            try:
-                records = self.query(domain, record_type)
-                if records:
-                    results[record_type.name] = records
-            except Exception as e:
-                logger.warning(f"Failed to query {record_type.name} records: {e}")
+            query_id = _new_query_id()
+            while query_id in pending:
+                query_id = _new_query_id()
+            pending[query_id] = record_type
+        answered: Dict[DNSRecordType, List[DNSRecord]] = {}
+        
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                for attempt in range(self.config.retries):
+                    # Every query carries the same domain, so one question length fits all
+                    for query_id, record_type in pending.items():
+                        question_len = self._build_and_send(sock, domain, record_type, query_id)
+                    
+                    deadline = time.monotonic() + self.config.timeout
+                    while pending:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        sock.settimeout(remaining)
+                        try:
+                            response, _ = sock.recvfrom(_UDP_PAYLOAD_SIZE)
+                        except socket.timeout:
+                            break
+                        
+                        if len(response) < 12:
+                            continue
+                        query_id = _U16.unpack_from(response, 0)[0]
+                        record_type = pending.get(query_id)
+                        if record_type is None:
+                            continue
+                        
+                        try:
+                            records = self._match_response(response, query_id, question_len)
+                        except _PARSE_ERRORS as e:
+                            # Skip the malformed reply; its record type stays pending
+                            logger.warning(f"Failed to parse {record_type.name} records: {e}")
+                            continue
+                        answered[record_type] = records
+                        del pending[query_id]
+                    
+                    if not pending:
+                        break
+                    logger.warning(f"DNS enumeration timeout for {len(pending)} record types "
+                                   f"(attempt {attempt + 1})")
+        except OSError as e:
+            logger.warning(f"DNS enumeration error: {e}")
+        
+        results = {}
+        for record_type in record_types:
+            records = answered.get(record_type)
+            if records:
+                results[record_type.name] = records
         
         return results
 
+    async def _query_async(self, domain: str, record_type: DNSRecordType,
+                           transport: asyncio.DatagramTransport,
+                           futures: Dict[int, asyncio.Future]) -> List[DNSRecord]:
+        """
+        Perform one DNS query over a shared datagram endpoint.
+        
+        Args:
+            domain: Domain to query
+            record_type: Type of DNS record
+            transport: Datagram transport connected to the DNS server
+            futures: Pending responses keyed by transaction ID
+            
+        Returns:
+            List of DNSRecord objects
+        """
+        query_id = _new_query_id()
+        while query_id in futures:
+            query_id = _new_query_id()
+        
+        future = asyncio.get_running_loop().create_future()
+        futures[query_id] = future
+        
+        # One bad name or reply must not escape and fail the whole gather()
+        try:
+            query_packet = self._create_dns_query(domain, record_type, query_id)
+            for attempt in range(self.config.retries):
+                transport.sendto(query_packet)
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(future), self.config.timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"DNS query timeout for {record_type.name} {domain} "
+                                   f"(attempt {attempt + 1})")
+                    continue
+                return self._parse_dns_response(response, self._question_len(query_packet))
+        except _PARSE_ERRORS as e:
+            logger.warning(f"Failed to parse {record_type.name} records for {domain}: {e}")
+        finally:
+            del futures[query_id]
+        
+        return []
+    
+    async def enumerate_many(self, domains: List[str],
+                             record_types: Optional[List[DNSRecordType]] = None,
+                             max_concurrency: int = 256) -> Dict[str, Dict[str, List[DNSRecord]]]:
+        """
+        Enumerate DNS records for many domains concurrently.
+        
+        All queries share one UDP endpoint and are kept in flight together
+        (up to max_concurrency), so throughput is no longer bound to one
+        query per round trip.
+        
+        Args:
+            domains: Domains to enumerate
+            record_types: Record types to query (defaults to the dns_enumeration set)
+            max_concurrency: Maximum number of queries in flight
+            
+        Returns:
+            Dictionary mapping each domain to its record type -> records mapping
+        """
+        record_types = record_types or _ENUMERATION_RECORD_TYPES
+        logger.info(f"Performing DNS enumeration for {len(domains)} domains")
+        
+        futures: Dict[int, asyncio.Future] = {}
+        transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _DNSProtocol(futures),
+            remote_addr=(self.config.dns_server, self.config.port)
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def limited_query(domain: str, record_type: DNSRecordType) -> List[DNSRecord]:
+            async with semaphore:
+                return await self._query_async(domain, record_type, transport, futures)
+        
+        jobs = [(domain, record_type) for domain in domains for record_type in record_types]
+        try:
+            answers = await asyncio.gather(*(limited_query(d, t) for d, t in jobs))
+        finally:
+            transport.close()
+        
+        results: Dict[str, Dict[str, List[DNSRecord]]] = {domain: {} for domain in domains}
+        for (domain, record_type), records in zip(jobs, answers):
+            if records:
+                results[domain][record_type.name] = records
+        
+        return results
+    
+    async def _zone_transfer_async(self, domain: str, nameserver: str) -> List[DNSRecord]:
+        """
+        Attempt one DNS zone transfer (AXFR) over an asyncio TCP stream.
+        
+        Args:
+            domain: Domain for zone transfer
+            nameserver: Nameserver to query
+            
+        Returns:
+            List of DNS records from zone transfer
+        """
+        timeout = self.config.timeout
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(nameserver, self.config.port), timeout
+            )
+            try:
+                # DNS over TCP prefixes each message with its 16-bit length
+                query_packet = self._create_dns_query(domain, DNSRecordType.AXFR)
+                writer.write(_U16.pack(len(query_packet)) + query_packet)
+                await writer.drain()
+                
+                length = _U16.unpack(await asyncio.wait_for(reader.readexactly(2), timeout))[0]
+                response = await asyncio.wait_for(reader.readexactly(length), timeout)
+            finally:
+                writer.close()
+            
+            records = self._parse_dns_response(response)
+            logger.info(f"Zone transfer successful for {domain}: {len(records)} records")
+            return records
+            
+        except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            logger.warning(f"Zone transfer failed for {domain}: {e}")
+            return []
+    
+    async def zone_transfer_many(self, domains: List[str],
+                                 nameserver: str = None) -> Dict[str, List[DNSRecord]]:
+        """
+        Attempt DNS zone transfers (AXFR) for many domains concurrently.
+        
+        Args:
+            domains: Domains for zone transfer
+            nameserver: Nameserver to query (uses configured DNS server if None)
+            
+        Returns:
+            Dictionary mapping each domain to its zone transfer records
+            
+        Note:
+            Zone transfers are often restricted for security reasons.
+            This is for educational purposes only.
+        """
+        nameserver = nameserver or self.config.dns_server
+        logger.warning(f"Attempting zone transfer for {len(domains)} domains from {nameserver}")
+        
+        answers = await asyncio.gather(
+            *(self._zone_transfer_async(domain, nameserver) for domain in domains)
+        )
+        return dict(zip(domains, answers))
+
 # Convenience functions
 def resolve_domain(domain: str, dns_server: str = "8.8.8.8") -> List[str]:
     """Resolve domain to IP addresses"""
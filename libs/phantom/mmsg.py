@@ -0,0 +1,124 @@
+"""
+Phantom Batched Datagram I/O Module
+
+This module sends bursts of datagrams with a single sendmmsg(2) call on
+Linux, falling back to one sendto() per datagram elsewhere.
+
+Author: Reaper Security Team
+Version: 0.1.0
+"""
+
+import ctypes
+import os
+import socket
+import struct
+import sys
+from typing import List, Optional
+
+class _IOVec(ctypes.Structure):
+    """struct iovec"""
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len', ctypes.c_size_t),
+    ]
+
+class _MsgHdr(ctypes.Structure):
+    """struct msghdr (Linux layout)"""
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(_IOVec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+class _MMsgHdr(ctypes.Structure):
+    """struct mmsghdr"""
+    _fields_ = [
+        ('msg_hdr', _MsgHdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+def _load_sendmmsg():
+    """Look up sendmmsg in libc, or None if unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None
+    
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        sendmmsg = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
+_sendmmsg = _load_sendmmsg()
+
+def _sockaddr_in(ip: str, port: int) -> bytes:
+    """struct sockaddr_in for an IPv4 address"""
+    return struct.pack('=H', socket.AF_INET) + struct.pack('!H4s8x', port, socket.inet_aton(ip))
+
+def send_many(sock: socket.socket, packets: List[bytes], address: str, port: int = 0,
+              use_sendmmsg: Optional[bool] = None) -> int:
+    """
+    Send several datagrams to one IPv4 address.
+    
+    Args:
+        sock: Bound or unbound AF_INET datagram or raw socket
+        packets: Datagrams to send, in order
+        address: Destination IP address
+        port: Destination port (0 for raw sockets)
+        use_sendmmsg: Force (True) or disable (False) sendmmsg; defaults to
+            using it when available
+    
+    Returns:
+        Number of datagrams sent
+    
+    Raises:
+        OSError: If sending fails before any datagram is sent
+    """
+    if use_sendmmsg is None:
+        use_sendmmsg = _sendmmsg is not None
+    
+    if not use_sendmmsg or not packets:
+        for packet in packets:
+            sock.sendto(packet, (address, port))
+        return len(packets)
+    
+    # Every message shares one destination; the buffers must stay referenced
+    # until the call returns, which the local names guarantee
+    sockaddr = _sockaddr_in(address, port)
+    name = ctypes.create_string_buffer(sockaddr, len(sockaddr))
+    buffers = [ctypes.create_string_buffer(packet, len(packet)) for packet in packets]
+    iovecs = (_IOVec * len(packets))()
+    msgs = (_MMsgHdr * len(packets))()
+    for i, buf in enumerate(buffers):
+        iovecs[i].iov_base = ctypes.addressof(buf)
+        iovecs[i].iov_len = len(packets[i])
+        hdr = msgs[i].msg_hdr
+        hdr.msg_name = ctypes.addressof(name)
+        hdr.msg_namelen = len(sockaddr)
+        hdr.msg_iov = ctypes.pointer(iovecs[i])
+        hdr.msg_iovlen = 1
+    
+    # sendmmsg may stop early (e.g. a full send buffer); resume where it left off
+    sent = 0
+    fd = sock.fileno()
+    base = ctypes.addressof(msgs)
+    while sent < len(packets):
+        pending = ctypes.cast(base + sent * ctypes.sizeof(_MMsgHdr), ctypes.POINTER(_MMsgHdr))
+        result = _sendmmsg(fd, pending, len(packets) - sent, 0)
+        if result < 0:
+            errno = ctypes.get_errno()
+            if sent:
+                break
+            raise OSError(errno, os.strerror(errno))
+        sent += result
+    
+    return sent
+
+__all__ = ['send_many']
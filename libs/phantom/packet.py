@@ -14,17 +14,49 @@ Author: Reaper Security Team
 Version: 0.1.0
 """
 
+import functools
+import os
+import select
 import socket
 import struct
-import random
+import threading
 import time
 import logging
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+from .checksum import checksum as _rfc1071_checksum
+from .mmsg import send_many
+
 logger = logging.getLogger(__name__)
 
+# Precompiled header layouts
+_TCP_HDR = struct.Struct('!HHLLBBHHH')
+_CSUM = struct.Struct('!H')
+_PSEUDO = struct.Struct('!4s4sBBH')
+_UDP_HDR = struct.Struct('!HHHH')
+_ICMP_HDR = struct.Struct('!BBHHH')
+_U16 = struct.Struct('!H')
+_U32 = struct.Struct('!L')
+_ICMP_IDS = struct.Struct('!HH')
+
+# Bytes of randomness fetched per os.urandom call
+_RNG_BUFFER_SIZE = 4096
+
+# Non-blocking receive flag (not available on Windows)
+_RECV_NOWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
+
+# Receive buffer requested for the raw ping socket
+_PING_RCVBUF = 1 << 20
+
+@functools.lru_cache(maxsize=256)
+def _inet_aton(ip: str) -> bytes:
+    """Packed form of a dotted-quad address, parsed once per address"""
+    return socket.inet_aton(ip)
+
 class Protocol(Enum):
     """Supported protocols for packet crafting"""
     TCP = "tcp"
@@ -43,6 +75,95 @@ class PacketConfig:
     flags: int = 0
     payload: bytes = b''
 
+class TCPTemplate:
+    """
+    Precomputed TCP packet for probes that differ only in source port and
+    sequence number (SYN scans, fuzzing loops).
+    
+    The header and checksum are built once with both fields zero; craft()
+    writes the two fields and folds them into the stored checksum with the
+    RFC 1624 incremental update instead of re-summing the whole packet.
+    """
+    
+    def __init__(self, source_ip: str, dest_ip: str, dest_port: int,
+                 flags: int = 0, payload: bytes = b''):
+        """
+        Build the template.
+        
+        Args:
+            source_ip: Source IP for the pseudo-header
+            dest_ip: Destination IP
+            dest_port: Destination port
+            flags: TCP flags
+            payload: Data payload carried by every crafted packet
+        """
+        self.source_ip = source_ip
+        self.dest_ip = dest_ip
+        self.dest_port = dest_port
+        self.flags = flags
+        self.payload = payload
+        
+        # TCP header fields
+        ack_num = 0
+        data_offset = 5  # 5 * 4 = 20 bytes header
+        window_size = 65535
+        urgent_ptr = 0
+        
+        self._header = bytearray(_TCP_HDR.size)
+        _TCP_HDR.pack_into(
+            self._header, 0,
+            0,                # Source port (patched per packet)
+            dest_port,        # Destination port
+            0,                # Sequence number (patched per packet)
+            ack_num,          # Acknowledgment number
+            data_offset << 4, # Data offset + reserved
+            flags,            # Flags
+            window_size,      # Window size
+            0,                # Checksum (calculated below)
+            urgent_ptr        # Urgent pointer
+        )
+        
+        pseudo_header = _PSEUDO.pack(
+            _inet_aton(source_ip),
+            _inet_aton(dest_ip),
+            0,  # Reserved
+            socket.IPPROTO_TCP,
+            len(self._header) + len(payload)
+        )
+        
+        self._base_checksum = _rfc1071_checksum(pseudo_header + self._header + payload)
+    
+    def matches(self, source_ip: str, dest_ip: str, dest_port: int,
+                flags: int, payload: bytes) -> bool:
+        """Check whether this template builds packets for these fields"""
+        return (self.dest_port == dest_port and self.flags == flags and
+                self.dest_ip == dest_ip and self.source_ip == source_ip and
+                (self.payload is payload or self.payload == payload))
+    
+    def craft(self, source_port: int, seq_num: int) -> bytes:
+        """
+        Craft one packet from the template.
+        
+        Args:
+            source_port: TCP source port
+            seq_num: TCP sequence number
+            
+        Returns:
+            Raw TCP packet bytes
+        """
+        # RFC 1624 eqn. 3, HC' = ~(~HC + ~m + m'), where every old field m
+        # is zero in the template so only the new 16-bit words are added
+        total = (~self._base_checksum & 0xFFFF) + source_port + (seq_num >> 16) + (seq_num & 0xFFFF)
+        total = (total & 0xFFFF) + (total >> 16)
+        total = (total & 0xFFFF) + (total >> 16)
+        
+        header = bytearray(self._header)
+        _U16.pack_into(header, 0, source_port)
+        _U32.pack_into(header, 4, seq_num)
+        _CSUM.pack_into(header, 16, ~total & 0xFFFF)
+        
+        return bytes(header) + self.payload
+
 class PhantomPacket:
     """
     Packet crafting and manipulation class.
@@ -60,6 +181,14 @@ class PhantomPacket:
         """
         self.config = config or PacketConfig()
         self._validate_config()
+        self._rng_buf = b''
+        self._rng_pos = 0
+        self._rng_lock = threading.Lock()  # Instances may be shared across threads
+        self._cached_src_ip: Optional[str] = None
+        self._cached_src_dest: Optional[str] = None
+        self._tcp_template: Optional[TCPTemplate] = None
+        self._raw_icmp_sock: Optional[socket.socket] = None
+        self._ping_lock = threading.Lock()  # One ping burst on the raw socket at a time
     
     def _validate_config(self) -> None:
         """Validate packet configuration"""
@@ -72,27 +201,70 @@ class PhantomPacket:
         if self.config.source_port is not None and (self.config.source_port < 1 or self.config.source_port > 65535):
             raise ValueError("Source port must be between 1 and 65535")
     
+    def _take_random(self, size: int) -> Tuple[bytes, int]:
+        """
+        Take size random bytes from the buffered pool.
+        
+        Returns:
+            Tuple of (buffer, offset) for Struct.unpack_from
+        """
+        with self._rng_lock:
+            pos = self._rng_pos
+            if pos + size > len(self._rng_buf):
+                self._rng_buf = os.urandom(_RNG_BUFFER_SIZE)
+                pos = 0
+            self._rng_pos = pos + size
+            return self._rng_buf, pos
+    
     def _generate_source_port(self) -> int:
         """Generate random source port"""
-        return random.randint(1024, 65535)
+        return 1024 + _U16.unpack_from(*self._take_random(2))[0] % 64512
     
     def _get_source_ip(self) -> str:
         """Get source IP address"""
         if self.config.source_ip:
             return self.config.source_ip
         
-        # Try to get local IP
+        # The local address depends on the route to the destination, so the
+        # cached lookup is only reused while dest_ip is unchanged
+        dest_ip = self.config.dest_ip
+        if self._cached_src_ip is None or self._cached_src_dest != dest_ip:
+            self._cached_src_ip = self._compute_source_ip(dest_ip)
+            self._cached_src_dest = dest_ip
+        
+        return self._cached_src_ip
+    
+    def _compute_source_ip(self, dest_ip: str) -> str:
+        """
+        Find the local address the kernel would use to reach dest_ip.
+        
+        Args:
+            dest_ip: Destination IP address
+            
+        Returns:
+            Local IP address, or 127.0.0.1 if no route is found
+        """
         try:
+            # Connecting a UDP socket picks a route without sending anything
             with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
+                s.connect((dest_ip, 80))
                 return s.getsockname()[0]
-        except:
+        except (OSError, UnicodeError):
             return "127.0.0.1"
     
+    def invalidate_source_ip(self) -> None:
+        """Forget the detected source IP, e.g. after a route or interface change"""
+        self._cached_src_ip = None
+        self._cached_src_dest = None
+    
     def create_tcp_packet(self, payload: bytes = b'') -> bytes:
         """
         Create a TCP packet.
         
+        Packets for the same addresses, flags and payload are crafted from
+        a cached TCPTemplate, so only the source port and sequence number
+        are written and the checksum is updated incrementally.
+        
         Args:
             payload: Data payload for the packet
             
@@ -103,44 +275,14 @@ class PhantomPacket:
         dest_ip = self.config.dest_ip
         source_port = self.config.source_port or self._generate_source_port()
         dest_port = self.config.dest_port
-        
-        # TCP header fields
-        seq_num = random.randint(0, 2**32 - 1)
-        ack_num = 0
-        data_offset = 5  # 5 * 4 = 20 bytes header
         flags = self.config.flags
-        window_size = 65535
-        checksum = 0
-        urgent_ptr = 0
-        
-        # Build TCP header
-        tcp_header = struct.pack(
-            '!HHLLBBHHH',
-            source_port,      # Source port
-            dest_port,        # Destination port
-            seq_num,          # Sequence number
-            ack_num,          # Acknowledgment number
-            data_offset << 4, # Data offset + reserved
-            flags,            # Flags
-            window_size,      # Window size
-            checksum,         # Checksum (calculated later)
-            urgent_ptr        # Urgent pointer
-        )
+        seq_num = _U32.unpack_from(*self._take_random(4))[0]
         
-        # Calculate TCP checksum
-        pseudo_header = struct.pack(
-            '!4s4sBBH',
-            socket.inet_aton(source_ip),
-            socket.inet_aton(dest_ip),
-            0,  # Reserved
-            socket.IPPROTO_TCP,
-            len(tcp_header) + len(payload)
-        )
+        template = self._tcp_template
+        if template is None or not template.matches(source_ip, dest_ip, dest_port, flags, payload):
+            template = self._tcp_template = TCPTemplate(source_ip, dest_ip, dest_port, flags, payload)
         
-        checksum = self._calculate_checksum(pseudo_header + tcp_header + payload)
-        tcp_header = tcp_header[:16] + struct.pack('!H', checksum) + tcp_header[18:]
-        
-        return tcp_header + payload
+        return template.craft(source_port, seq_num)
     
     def create_udp_packet(self, payload: bytes = b'') -> bytes:
         """
@@ -159,8 +301,7 @@ class PhantomPacket:
         length = 8 + len(payload)  # UDP header + payload
         checksum = 0  # Optional for UDP
         
-        udp_header = struct.pack(
-            '!HHHH',
+        udp_header = _UDP_HDR.pack(
             source_port,  # Source port
             dest_port,    # Destination port
             length,       # Length
@@ -169,7 +310,8 @@ class PhantomPacket:
         
         return udp_header + payload
     
-    def create_icmp_packet(self, icmp_type: int = 8, icmp_code: int = 0, payload: bytes = b'') -> bytes:
+    def create_icmp_packet(self, icmp_type: int = 8, icmp_code: int = 0, payload: bytes = b'',
+                           identifier: Optional[int] = None, sequence: Optional[int] = None) -> bytes:
         """
         Create an ICMP packet.
         
@@ -177,17 +319,23 @@ class PhantomPacket:
             icmp_type: ICMP type (8 for echo request)
             icmp_code: ICMP code
             payload: Data payload for the packet
+            identifier: Identifier field (random if not given)
+            sequence: Sequence number field (random if not given)
             
         Returns:
             Raw ICMP packet bytes
         """
         # ICMP header
         checksum = 0
-        identifier = random.randint(0, 65535)
-        sequence = random.randint(0, 65535)
-        
-        icmp_header = struct.pack(
-            '!BBHHH',
+        random_identifier, random_sequence = _ICMP_IDS.unpack_from(*self._take_random(4))
+        if identifier is None:
+            identifier = random_identifier
+        if sequence is None:
+            sequence = random_sequence
+        
+        icmp_header = bytearray(_ICMP_HDR.size)
+        _ICMP_HDR.pack_into(
+            icmp_header, 0,
             icmp_type,    # Type
             icmp_code,    # Code
             checksum,     # Checksum
@@ -197,9 +345,9 @@ class PhantomPacket:
         
         # Calculate ICMP checksum
         checksum = self._calculate_checksum(icmp_header + payload)
-        icmp_header = icmp_header[:2] + struct.pack('!H', checksum) + icmp_header[4:]
+        _CSUM.pack_into(icmp_header, 2, checksum)
         
-        return icmp_header + payload
+        return bytes(icmp_header) + payload
     
     def _calculate_checksum(self, data: bytes) -> int:
         """
@@ -211,23 +359,7 @@ class PhantomPacket:
         Returns:
             Checksum value
         """
-        checksum = 0
-        
-        # Add padding if odd length
-        if len(data) % 2:
-            data += b'\x00'
-        
-        # Sum 16-bit words
-        for i in range(0, len(data), 2):
-            word = (data[i] << 8) + data[i + 1]
-            checksum += word
-        
-        # Add carry bits
-        while checksum >> 16:
-            checksum = (checksum & 0xFFFF) + (checksum >> 16)
-        
-        # One's complement
-        return ~checksum & 0xFFFF
+        return _rfc1071_checksum(data)
     
     def send_packet(self, packet: bytes, protocol: Protocol = None) -> bool:
         """
@@ -302,13 +434,92 @@ class PhantomPacket:
         
         return self.send_packet(packet, protocol)
     
-    def ping(self, target: str = None, count: int = 4) -> Dict[str, Any]:
+    def _get_raw_icmp_socket(self) -> socket.socket:
+        """
+        Get the raw ICMP socket shared by ping() calls.
+        
+        Returns:
+            Raw ICMP socket (the kernel adds the IP header)
+        
+        Raises:
+            PermissionError: Without the privileges raw sockets need
+        """
+        if self._raw_icmp_sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            # A whole burst of replies arrives at once; the default buffer
+            # drops them past ~128 probes (the kernel caps this at rmem_max)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _PING_RCVBUF)
+            self._raw_icmp_sock = sock
+        return self._raw_icmp_sock
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self) -> None:
+        """Close the cached raw ICMP socket."""
+        sock = getattr(self, '_raw_icmp_sock', None)
+        if sock is not None:
+            sock.close()
+            self._raw_icmp_sock = None
+    
+    def _receive_replies(self, sock: socket.socket, address: str,
+                         pending: Dict[int, Tuple[int, float]], timeout: float) -> List[float]:
+        """
+        Collect ICMP echo replies for outstanding probes.
+        
+        Args:
+            sock: Raw ICMP socket the probes were sent on
+            address: Probed IP address
+            pending: Maps identifier -> (sequence, send time) for unanswered
+                probes; answered probes are removed
+            timeout: Seconds to wait for all replies
+            
+        Returns:
+            Round-trip times in ms, in arrival order
+        """
+        times = []
+        deadline = time.monotonic() + timeout
+        
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+            
+            try:
+                # Readiness from select() is only a hint; never block past the deadline
+                data, (source, _) = sock.recvfrom(2048, _RECV_NOWAIT)
+            except BlockingIOError:
+                continue
+            now = time.monotonic()
+            if source != address:
+                continue
+            
+            # Raw ICMP sockets deliver the IP header too; skip it by its length
+            header_len = (data[0] & 0x0F) * 4
+            if len(data) < header_len + 8 or data[header_len] != 0:  # echo reply
+                continue
+            
+            identifier, sequence = _ICMP_IDS.unpack_from(data, header_len + 4)
+            probe = pending.get(identifier)
+            if probe is None or probe[0] != sequence:
+                continue
+            
+            del pending[identifier]
+            times.append((now - probe[1]) * 1000)
+        
+        return times
+    
+    def ping(self, target: str = None, count: int = 4, timeout: float = 1.0) -> Dict[str, Any]:
         """
         Send ICMP ping packets.
         
         Args:
             target: Target IP address
             count: Number of ping packets to send
+            timeout: Seconds to wait for replies after the burst is sent
             
         Returns:
             Dictionary with ping results
@@ -324,64 +535,91 @@ class PhantomPacket:
         
         logger.info(f"Pinging {target} with {count} packets")
         
-        for i in range(count):
+        # Round-trip times in ms, filled up to received
+        times = np.empty(max(count, 0), dtype=np.float32)
+        
+        # One unique identifier per probe so each reply maps back to its send time
+        first_identifier = _U16.unpack_from(*self._take_random(2))[0]
+        identifiers = [(first_identifier + i) & 0xFFFF for i in range(count)]
+        
+        # Craft the whole burst up front and send it in one batch
+        packets = [
+            self.create_icmp_packet(identifier=identifier, sequence=i)
+            for i, identifier in enumerate(identifiers)
+        ]
+        received = 0
+        
+        if packets:
             try:
-                start_time = time.time()
-                
-                # Create ICMP packet
-                packet = self.create_icmp_packet()
-                
-                # Send packet
-                if self.send_packet(packet, Protocol.ICMP):
-                    results['sent'] += 1
-                    
-                    # Try to receive response (simplified)
-                    # In a real implementation, you'd listen for ICMP responses
-                    time.sleep(0.1)
-                    
-                    # For now, assume packet was received
-                    results['received'] += 1
-                    results['times'].append((time.time() - start_time) * 1000)
-                else:
-                    results['sent'] += 1
-                    results['lost'] += 1
+                address = socket.gethostbyname(target)
+                # Concurrent pings on this instance would read each other's
+                # replies off the shared socket, so each burst owns it
+                with self._ping_lock:
+                    sock = self._get_raw_icmp_socket()
+                    sent_at = time.monotonic()
+                    transmitted = send_many(sock, packets, address)
+                    pending = {identifiers[i]: (i, sent_at) for i in range(transmitted)}
                     
+                    for rtt in self._receive_replies(sock, address, pending, timeout):
+                        times[received] = rtt
+                        received += 1
+            except PermissionError:
+                logger.error("Raw socket access denied - may need elevated privileges")
             except Exception as e:
                 logger.error(f"Ping error: {e}")
-                results['sent'] += 1
-                results['lost'] += 1
+        
+        results['sent'] = count
+        results['received'] = received
+        results['lost'] = count - received
         
         results['loss_percent'] = (results['lost'] / results['sent']) * 100 if results['sent'] > 0 else 0
         
+        received = times[:results['received']]
+        results['times'] = received.tolist()
+        if received.size:
+            results['min_time'] = float(received.min())
+            results['avg_time'] = float(received.mean())
+            results['max_time'] = float(received.max())
+            results['stddev_time'] = float(received.std())
+        
         return results
 
 # Convenience functions
+@functools.lru_cache(maxsize=128)
+def _default_packet(dest_ip: str, dest_port: int = 80, source_port: Optional[int] = None) -> PhantomPacket:
+    """
+    Shared PhantomPacket per destination, so repeated calls reuse its caches.
+    
+    Only packet crafting goes through these shared instances; they never
+    open a socket.
+    """
+    config = PacketConfig(dest_ip=dest_ip, dest_port=dest_port, source_port=source_port)
+    return PhantomPacket(config)
+
 def create_tcp_packet(dest_ip: str, dest_port: int, payload: bytes = b'', source_port: int = None) -> bytes:
     """Create a TCP packet"""
-    config = PacketConfig(dest_ip=dest_ip, dest_port=dest_port, source_port=source_port)
-    packet = PhantomPacket(config)
-    return packet.create_tcp_packet(payload)
+    return _default_packet(dest_ip, dest_port, source_port).create_tcp_packet(payload)
 
 def create_udp_packet(dest_ip: str, dest_port: int, payload: bytes = b'', source_port: int = None) -> bytes:
     """Create a UDP packet"""
-    config = PacketConfig(dest_ip=dest_ip, dest_port=dest_port, source_port=source_port)
-    packet = PhantomPacket(config)
-    return packet.create_udp_packet(payload)
+    return _default_packet(dest_ip, dest_port, source_port).create_udp_packet(payload)
 
 def create_icmp_packet(dest_ip: str, payload: bytes = b'') -> bytes:
     """Create an ICMP packet"""
-    config = PacketConfig(dest_ip=dest_ip)
-    packet = PhantomPacket(config)
-    return packet.create_icmp_packet(payload=payload)
+    return _default_packet(dest_ip).create_icmp_packet(payload=payload)
 
 def ping_host(target: str, count: int = 4) -> Dict[str, Any]:
     """Ping a host"""
-    config = PacketConfig(dest_ip=target)
-    packet = PhantomPacket(config)
-    return packet.ping(target, count)
+    # A private instance, so concurrent pings run in parallel and no raw
+    # socket outlives the call
+    packet = PhantomPacket(PacketConfig(dest_ip=target))
+    try:
+        return packet.ping(target, count)
+    finally:
+        packet.close()
 
 # Export main classes and functions
 __all__ = [
-    'PhantomPacket', 'PacketConfig', 'Protocol',
+    'PhantomPacket', 'PacketConfig', 'Protocol', 'TCPTemplate',
     'create_tcp_packet', 'create_udp_packet', 'create_icmp_packet', 'ping_host'
 ]
@@ -15,18 +15,37 @@ Author: Reaper Security Team
 Version: 0.1.0
 """
 
+import asyncio
+import re
+import select
 import socket
+import struct
+import sys
 import threading
 import time
 import logging
-from typing import List, Dict, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Deque, List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
-# Configure logging for phantom operations
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# struct linger {onoff=1, linger=0}: close() sends RST instead of lingering in TIME_WAIT
+_LINGER_RST = struct.pack('HH' if sys.platform == 'win32' else 'ii', 1, 0)
+
+# Common port mappings
+_PORT_SERVICES = {
+    21: "FTP", 22: "SSH", 23: "Telnet", 25: "SMTP", 53: "DNS",
+    80: "HTTP", 110: "POP3", 143: "IMAP", 443: "HTTPS", 993: "IMAPS",
+    995: "POP3S", 3389: "RDP", 5432: "PostgreSQL", 3306: "MySQL"
+}
+
+# Banner service indicators, highest priority first
+_BANNER_KEYWORDS = ('ssh', 'http', 'ftp', 'smtp')
+_BANNER_RE = re.compile('|'.join(_BANNER_KEYWORDS), re.IGNORECASE)
+
 class ScanType(Enum):
     """Types of port scans available"""
     TCP_CONNECT = "tcp_connect"
@@ -55,6 +74,7 @@ class ScanConfig:
     timeout: float = 1.0
     threads: int = 10
     rate_limit: float = 0.1  # seconds between scans
+    strict_limit: bool = True  # keep the per-minute cap when rate_limit is 0
     stealth_mode: bool = False
     banner_grab: bool = False
 
@@ -77,22 +97,67 @@ class PhantomScanner:
         self.scan_lock = threading.Lock()
         self.last_scan_time = 0
         self.scan_count = 0
+        self._next_scan_time = 0.0
+        self._scan_times: Deque[float] = deque()
         self.max_scans_per_minute = 100  # Safety limit
         
+    def _rate_limit_delay(self) -> float:
+        """
+        Reserve a start slot for one scan against the rate limits.
+        
+        Scans are paced config.rate_limit seconds apart and capped at
+        max_scans_per_minute over a sliding one-minute window. Slots are
+        reserved up front, so concurrent callers are staggered rather than
+        all sleeping the same interval.
+        
+        Returns:
+            Seconds the caller should wait before scanning
+        """
+        if not self.config.rate_limit and not self.config.strict_limit:
+            return 0.0
+        
+        with self.scan_lock:
+            now = time.monotonic()
+            start = max(now, self._next_scan_time)
+            
+            window = self._scan_times
+            while window and window[0] <= start - 60:
+                window.popleft()
+            
+            # Check scan count per minute
+            if len(window) >= self.max_scans_per_minute:
+                logger.warning("Rate limit exceeded, pausing scans")
+                start = window[0] + 60
+                while window and window[0] <= start - 60:
+                    window.popleft()
+            
+            window.append(start)
+            self._next_scan_time = start + self.config.rate_limit
+            self.last_scan_time = start
+            self.scan_count = len(window)
+        
+        return start - now
+    
     def _rate_limit_check(self) -> None:
         """Check if we're within rate limits"""
-        current_time = time.time()
-        if current_time - self.last_scan_time < self.config.rate_limit:
-            time.sleep(self.config.rate_limit)
-        
-        # Check scan count per minute
-        if self.scan_count > self.max_scans_per_minute:
-            logger.warning("Rate limit exceeded, pausing scans")
-            time.sleep(60)  # Wait a minute
-            self.scan_count = 0
-            
-        self.last_scan_time = current_time
-        self.scan_count += 1
+        delay = self._rate_limit_delay()
+        if delay:
+            time.sleep(delay)
+    
+    def _new_scan_socket(self) -> socket.socket:
+        """
+        Create a TCP socket tuned for connect scans.
+        
+        Returns:
+            Socket that resets on close and, where supported, lets the
+            kernel enforce the scan timeout
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
+        if hasattr(socket, 'TCP_USER_TIMEOUT'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT,
+                            max(1, int(self.config.timeout * 1000)))
+        return sock
     
     def _tcp_connect_scan(self, host: str, port: int) -> PortResult:
         """
@@ -108,7 +173,7 @@ class PhantomScanner:
         start_time = time.time()
         
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            with self._new_scan_socket() as sock:
                 sock.settimeout(self.config.timeout)
                 result = sock.connect_ex((host, port))
                 
@@ -200,6 +265,153 @@ class PhantomScanner:
                 response_time=time.time() - start_time
             )
     
+    def _udp_scan_batch(self, host: str, ports: List[int]) -> List[PortResult]:
+        """
+        Perform UDP scan on many ports through one non-blocking socket.
+        
+        Probes are sent back to back and replies are matched to ports by
+        their source port, so no per-port socket setup is needed.
+        
+        Args:
+            host: Target hostname or IP
+            ports: Target port numbers
+            
+        Returns:
+            List of PortResult objects in the order of ports
+        """
+        timeout = self.config.timeout
+        results: Dict[int, PortResult] = {}
+        sent_at: Dict[int, float] = {}
+        
+        try:
+            address = socket.gethostbyname(host)
+        except (OSError, UnicodeError) as e:
+            logger.error(f"Error UDP scanning {host}: {e}")
+            return [PortResult(port=port, status=ScanResult.ERROR, response_time=0.0) for port in ports]
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            
+            def drain() -> None:
+                """Record every reply already queued on the socket"""
+                while True:
+                    try:
+                        data, (source, port) = sock.recvfrom(1024)
+                    except BlockingIOError:
+                        return
+                    except ConnectionResetError:
+                        # Windows surfaces ICMP port unreachable here
+                        continue
+                    if source != address or port not in sent_at or port in results:
+                        continue
+                    results[port] = PortResult(
+                        port=port,
+                        status=ScanResult.OPEN,
+                        response_time=time.monotonic() - sent_at[port],
+                        banner=data.decode('utf-8', errors='ignore')[:100]
+                    )
+            
+            for port in ports:
+                if not isinstance(port, int) or port < 1 or port > 65535:
+                    logger.error(f"Error UDP scanning port {port}: Port must be between 1 and 65535")
+                    results[port] = PortResult(port=port, status=ScanResult.ERROR, response_time=0.0)
+                    continue
+                
+                # Rate limiting
+                delay = self._rate_limit_delay()
+                if delay:
+                    time.sleep(delay)
+                
+                try:
+                    try:
+                        # Send empty packet
+                        sock.sendto(b'', (address, port))
+                    except BlockingIOError:
+                        select.select([], [sock], [], timeout)
+                        sock.sendto(b'', (address, port))
+                except OSError as e:
+                    logger.error(f"Error UDP scanning port {port}: {e}")
+                    results[port] = PortResult(port=port, status=ScanResult.ERROR, response_time=0.0)
+                    continue
+                
+                sent_at[port] = time.monotonic()
+                drain()
+            
+            # Wait out the timeout after the last probe for late replies
+            deadline = time.monotonic() + timeout
+            while len(results) < len(set(ports)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                readable, _, _ = select.select([sock], [], [], remaining)
+                if readable:
+                    drain()
+        
+        # No response - could be open or filtered
+        return [
+            results.get(port) or PortResult(port=port, status=ScanResult.FILTERED, response_time=timeout)
+            for port in ports
+        ]
+    
+    async def _tcp_connect_scan_async(self, host: str, port: int) -> PortResult:
+        """
+        Perform TCP connect scan on a single port without blocking the event loop.
+        
+        Drives a non-blocking socket through the loop directly rather than
+        wrapping it in stream reader/writer objects.
+        
+        Args:
+            host: Target hostname or IP
+            port: Target port number
+            
+        Returns:
+            PortResult with scan results
+        """
+        loop = asyncio.get_running_loop()
+        timeout = self.config.timeout
+        start_time = time.monotonic()
+        
+        try:
+            sock = self._new_scan_socket()
+        except OSError as e:
+            logger.error(f"Error scanning port {port}: {e}")
+            return PortResult(port=port, status=ScanResult.ERROR, response_time=0.0)
+        
+        with sock:
+            sock.setblocking(False)
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, (host, port)), timeout)
+            except asyncio.TimeoutError:
+                return PortResult(port=port, status=ScanResult.FILTERED, response_time=timeout)
+            except socket.gaierror as e:
+                logger.error(f"Error scanning port {port}: {e}")
+                return PortResult(port=port, status=ScanResult.ERROR,
+                                  response_time=time.monotonic() - start_time)
+            except OSError:
+                # Refused or unreachable, as connect_ex would report
+                return PortResult(port=port, status=ScanResult.CLOSED,
+                                  response_time=time.monotonic() - start_time)
+            
+            response_time = time.monotonic() - start_time
+            service = None
+            banner = None
+            
+            if self.config.banner_grab:
+                try:
+                    data = await asyncio.wait_for(loop.sock_recv(sock, 1024), timeout)
+                    banner = data.decode('utf-8', errors='ignore')
+                    service = self._identify_service(port, banner)
+                except (OSError, asyncio.TimeoutError):
+                    pass
+        
+        return PortResult(
+            port=port,
+            status=ScanResult.OPEN,
+            response_time=response_time,
+            service=service,
+            banner=banner
+        )
+    
     def _identify_service(self, port: int, banner: str) -> Optional[str]:
         """
         Identify service based on port and banner.
@@ -211,27 +423,16 @@ class PhantomScanner:
         Returns:
             Service name if identified
         """
-        # Common port mappings
-        port_services = {
-            21: "FTP", 22: "SSH", 23: "Telnet", 25: "SMTP", 53: "DNS",
-            80: "HTTP", 110: "POP3", 143: "IMAP", 443: "HTTPS", 993: "IMAPS",
-            995: "POP3S", 3389: "RDP", 5432: "PostgreSQL", 3306: "MySQL"
-        }
-        
         # Check port first
-        if port in port_services:
-            return port_services[port]
-        
-        # Check banner for service indicators
-        banner_lower = banner.lower()
-        if "ssh" in banner_lower:
-            return "SSH"
-        elif "http" in banner_lower:
-            return "HTTP"
-        elif "ftp" in banner_lower:
-            return "FTP"
-        elif "smtp" in banner_lower:
-            return "SMTP"
+        service = _PORT_SERVICES.get(port)
+        if service:
+            return service
+        
+        # Check banner for service indicators in one pass; the highest
+        # priority keyword wins wherever it appears
+        matches = _BANNER_RE.findall(banner)
+        if matches:
+            return min((m.lower() for m in matches), key=_BANNER_KEYWORDS.index).upper()
         
         return None
     
@@ -257,7 +458,8 @@ class PhantomScanner:
         if not host or not isinstance(host, str):
             raise ValueError("Host must be a non-empty string")
         
-        logger.info(f"Scanning {host}:{port} with {scan_type.value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Scanning %s:%s with %s", host, port, scan_type.value)
         
         if scan_type == ScanType.TCP_CONNECT:
             return self._tcp_connect_scan(host, port)
@@ -270,20 +472,53 @@ class PhantomScanner:
         else:
             raise ValueError(f"Unsupported scan type: {scan_type}")
     
-    def scan_ports(self, host: str, ports: List[int], scan_type: ScanType = ScanType.TCP_CONNECT) -> List[PortResult]:
+    async def _scan_port_async(self, host: str, port: int, scan_type: ScanType) -> PortResult:
         """
-        Scan multiple ports on a host.
+        Scan a single TCP port on the event loop (async counterpart of scan_port).
         
         Args:
             host: Target hostname or IP
-            ports: List of port numbers to scan
+            port: Port number to scan
             scan_type: Type of scan to perform
             
         Returns:
-            List of PortResult objects
+            PortResult with scan results
         """
-        results = []
+        # Rate limiting
+        delay = self._rate_limit_delay()
+        if delay:
+            await asyncio.sleep(delay)
         
+        # Validate inputs
+        if not isinstance(port, int) or port < 1 or port > 65535:
+            raise ValueError("Port must be between 1 and 65535")
+        
+        if not host or not isinstance(host, str):
+            raise ValueError("Host must be a non-empty string")
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Scanning %s:%s with %s", host, port, scan_type.value)
+        
+        # SYN scan requires raw sockets, so it falls back to TCP connect as in scan_port
+        return await self._tcp_connect_scan_async(host, port)
+    
+    async def scan_ports_async(self, host: str, ports: List[int],
+                               scan_type: ScanType = ScanType.TCP_CONNECT) -> List[PortResult]:
+        """
+        Scan multiple ports on a host concurrently on the running event loop.
+        
+        Up to config.threads * 50 TCP probes are kept in flight at once, so
+        many connects overlap without a thread per socket. UDP probes are
+        batched through one socket in a worker thread.
+        
+        Args:
+            host: Target hostname or IP
+            ports: List of port numbers to scan
+            scan_type: Type of scan to perform
+            
+        Returns:
+            List of PortResult objects, sorted by port
+        """
         # Validate inputs
         if not ports:
             raise ValueError("Ports list cannot be empty")
@@ -293,38 +528,97 @@ class PhantomScanner:
         
         logger.info(f"Scanning {len(ports)} ports on {host}")
         
-        # Use threading for concurrent scans
-        threads = []
-        results_lock = threading.Lock()
+        if scan_type == ScanType.UDP_SCAN:
+            if not host or not isinstance(host, str):
+                raise ValueError("Host must be a non-empty string")
+            results = await asyncio.to_thread(self._udp_scan_batch, host, ports)
+            results.sort(key=lambda x: x.port)
+            logger.info(f"Scan completed: {len(results)} results")
+            return results
+        
+        semaphore = asyncio.Semaphore(max(1, self.config.threads) * 50)
         
-        def scan_worker(port_list: List[int]):
-            """Worker function for threaded scanning"""
-            for port in port_list:
+        async def limited_scan(port: int) -> PortResult:
+            async with semaphore:
                 try:
-                    result = self.scan_port(host, port, scan_type)
-                    with results_lock:
-                        results.append(result)
+                    return await self._scan_port_async(host, port, scan_type)
                 except Exception as e:
                     logger.error(f"Error scanning port {port}: {e}")
-                    with results_lock:
+                    return PortResult(
+                        port=port,
+                        status=ScanResult.ERROR,
+                        response_time=0.0
+                    )
+        
+        results = list(await asyncio.gather(*(limited_scan(port) for port in ports)))
+        
+        # Sort results by port number
+        results.sort(key=lambda x: x.port)
+        
+        logger.info(f"Scan completed: {len(results)} results")
+        return results
+    
+    def scan_ports(self, host: str, ports: List[int], scan_type: ScanType = ScanType.TCP_CONNECT) -> List[PortResult]:
+        """
+        Scan multiple ports on a host.
+        
+        Runs scan_ports_async on a new event loop. When called from a thread
+        that is already running an event loop (where asyncio.run is not
+        allowed), ports are scanned on a thread pool instead.
+        
+        Args:
+            host: Target hostname or IP
+            ports: List of port numbers to scan
+            scan_type: Type of scan to perform
+            
+        Returns:
+            List of PortResult objects
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.scan_ports_async(host, ports, scan_type))
+        
+        return self._scan_ports_threaded(host, ports, scan_type)
+    
+    def _scan_ports_threaded(self, host: str, ports: List[int], scan_type: ScanType) -> List[PortResult]:
+        """
+        Scan multiple ports with one thread-pool task per port.
+        
+        Args:
+            host: Target hostname or IP
+            ports: List of port numbers to scan
+            scan_type: Type of scan to perform
+            
+        Returns:
+            List of PortResult objects, sorted by port
+        """
+        # Validate inputs
+        if not ports:
+            raise ValueError("Ports list cannot be empty")
+        
+        logger.info(f"Scanning {len(ports)} ports on {host}")
+        
+        if scan_type == ScanType.UDP_SCAN:
+            if not host or not isinstance(host, str):
+                raise ValueError("Host must be a non-empty string")
+            results = self._udp_scan_batch(host, ports)
+        else:
+            results = []
+            # Per-port tasks keep every worker busy however long each probe takes
+            with ThreadPoolExecutor(max_workers=max(1, self.config.threads)) as executor:
+                futures = {executor.submit(self.scan_port, host, port, scan_type): port for port in ports}
+                for future in as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Error scanning port {futures[future]}: {e}")
                         results.append(PortResult(
-                            port=port,
+                            port=futures[future],
                             status=ScanResult.ERROR,
                             response_time=0.0
                         ))
         
-        # Split ports among threads
-        ports_per_thread = max(1, len(ports) // self.config.threads)
-        for i in range(0, len(ports), ports_per_thread):
-            thread_ports = ports[i:i + ports_per_thread]
-            thread = threading.Thread(target=scan_worker, args=(thread_ports,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
         # Sort results by port number
         results.sort(key=lambda x: x.port)
         
@@ -375,37 +669,34 @@ class PhantomScanner:
         services = {}
         for result in results:
             if result.status == ScanResult.OPEN and result.service:
-                if result.service not in services:
-                    services[result.service] = []
-                services[result.service].append(result.port)
+                services.setdefault(result.service, []).append(result.port)
         
         return services
 
-# Convenience functions for easy access
+# Convenience functions for easy access. Each scan gets its own scanner, so
+# independent callers do not share a rate-limit window; the result helpers
+# keep no state and share one
+_DEFAULT_SCANNER = PhantomScanner()
+
 def scan_port(host: str, port: int, scan_type: ScanType = ScanType.TCP_CONNECT) -> PortResult:
     """Scan a single port"""
-    scanner = PhantomScanner()
-    return scanner.scan_port(host, port, scan_type)
+    return PhantomScanner().scan_port(host, port, scan_type)
 
 def scan_ports(host: str, ports: List[int], scan_type: ScanType = ScanType.TCP_CONNECT) -> List[PortResult]:
     """Scan multiple ports"""
-    scanner = PhantomScanner()
-    return scanner.scan_ports(host, ports, scan_type)
+    return PhantomScanner().scan_ports(host, ports, scan_type)
 
 def scan_range(host: str, start_port: int, end_port: int, scan_type: ScanType = ScanType.TCP_CONNECT) -> List[PortResult]:
     """Scan a range of ports"""
-    scanner = PhantomScanner()
-    return scanner.scan_range(host, start_port, end_port, scan_type)
+    return PhantomScanner().scan_range(host, start_port, end_port, scan_type)
 
 def get_open_ports(results: List[PortResult]) -> List[int]:
     """Extract open ports from scan results"""
-    scanner = PhantomScanner()
-    return scanner.get_open_ports(results)
+    return _DEFAULT_SCANNER.get_open_ports(results)
 
 def get_service_summary(results: List[PortResult]) -> Dict[str, List[int]]:
     """Get summary of services found"""
-    scanner = PhantomScanner()
-    return scanner.get_service_summary(results)
+    return _DEFAULT_SCANNER.get_service_summary(results)
 
 # Export main classes and functions
 __all__ = [
@@ -13,12 +13,34 @@ This library provides advanced reverse engineering tools:
 Use responsibly and legally. Unauthorized use is illegal.
 """
 
-from .decompiler import Decompiler
-from .pattern import PatternMatcher
-from .hooking import APIHooker
-from .unpacking import Unpacker
-from .antidebug import AntiDebugDetector
-from .obfuscation import ObfuscationAnalyzer
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# the package does not pay for every tool's dependencies up front
+_LAZY = {
+    'Decompiler': ('.decompiler', 'Decompiler'),
+    'PatternMatcher': ('.pattern', 'PatternMatcher'),
+    'APIHooker': ('.hooking', 'APIHooker'),
+    'Unpacker': ('.unpacking', 'Unpacker'),
+    'AntiDebugDetector': ('.antidebug', 'AntiDebugDetector'),
+    'ObfuscationAnalyzer': ('.obfuscation', 'ObfuscationAnalyzer'),
+}
+
+
+def __getattr__(name):
+    try:
+        module, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     'Decompiler',
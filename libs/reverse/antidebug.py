@@ -4,9 +4,30 @@ Anti-Debugging Detection Module
 Provides detection of anti-debugging techniques.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set
 import sys
 
+import numpy as np
+
+from .scan import Buffer, NeedleScanner, scan_file, window_entropy
+from .signatures import ANTI_DEBUG_APIS, PEB_PATTERNS, TIMING_APIS
+
+
+# Signatures for the individual _check_* methods; detect() uses scan_file
+_NEEDLE_SCANNER = NeedleScanner(ANTI_DEBUG_APIS + TIMING_APIS + PEB_PATTERNS)
+
+# Compressed or encrypted data sits close to 8 bits/byte over a 64 KiB
+# window, while code and tables stay near 6.5. Unpacked binaries often embed
+# some compressed data too (curl's built-in manual, crypto tables), so a file
+# only counts as packed when high-entropy windows make up most of it
+_PACKED_ENTROPY = 7.2
+_PACKED_FRACTION = 0.5
+
+
+def _packed(windows: np.ndarray) -> bool:
+    """Whether enough window entropies (see window_entropy) look packed."""
+    return bool(windows.size and (windows > _PACKED_ENTROPY).mean() >= _PACKED_FRACTION)
+
 
 class AntiDebugDetector:
     """
@@ -27,64 +48,42 @@ class AntiDebugDetector:
         Returns:
             Detection results
         """
-        from pathlib import Path
-        data = Path(binary_path).read_bytes()
+        scan = scan_file(binary_path)
+        found = scan['needles']
         
         results = {
-            'is_packed': self._check_packed(data),
-            'anti_debug_apis': self._check_anti_debug_apis(data),
-            'timing_checks': self._check_timing_checks(data),
-            'debugger_detection': self._check_debugger_detection(data),
+            'is_packed': _packed(scan['window_entropies']),
+            'anti_debug_apis': self._anti_debug_apis_in(found),
+            'timing_checks': self._timing_checks_in(found),
+            'debugger_detection': self._debugger_detection_in(found),
         }
         
         return results
     
-    def _check_packed(self, data: bytes) -> bool:
+    def _check_packed(self, data: Buffer) -> bool:
         """Check if binary is packed."""
-        # Simple heuristic - check for low entropy sections
-        # Real implementation would be more sophisticated
-        return False
+        return _packed(window_entropy(data))
     
-    def _check_anti_debug_apis(self, data: bytes) -> List[str]:
+    def _check_anti_debug_apis(self, data: Buffer) -> List[str]:
         """Check for anti-debugging API calls."""
-        anti_debug_apis = [
-            b'IsDebuggerPresent',
-            b'CheckRemoteDebuggerPresent',
-            b'NtQueryInformationProcess',
-            b'OutputDebugString',
-        ]
-        
-        found = []
-        for api in anti_debug_apis:
-            if api in data:
-                found.append(api.decode('utf-8', errors='ignore'))
-        
-        return found
+        return self._anti_debug_apis_in(_NEEDLE_SCANNER.present(data))
     
-    def _check_timing_checks(self, data: bytes) -> bool:
+    def _check_timing_checks(self, data: Buffer) -> bool:
         """Check for timing-based anti-debugging."""
-        timing_apis = [
-            b'GetTickCount',
-            b'QueryPerformanceCounter',
-            b'rdtsc',
-        ]
-        
-        for api in timing_apis:
-            if api in data:
-                return True
-        
-        return False
+        return self._timing_checks_in(_NEEDLE_SCANNER.present(data))
+    
+    def _anti_debug_apis_in(self, found: Set[bytes]) -> List[str]:
+        """Anti-debugging API names among scanned needles, in table order."""
+        return [api.decode('utf-8', errors='ignore') for api in ANTI_DEBUG_APIS if api in found]
+    
+    def _timing_checks_in(self, found: Set[bytes]) -> bool:
+        """Whether any timing API is among scanned needles."""
+        return any(api in found for api in TIMING_APIS)
     
-    def _check_debugger_detection(self, data: bytes) -> bool:
+    def _check_debugger_detection(self, data: Buffer) -> bool:
         """Check for debugger detection code."""
-        # Check for PEB flags manipulation
-        peb_patterns = [
-            b'\x64\xA1\x30\x00\x00\x00',  # mov eax, fs:[0x30] (PEB)
-        ]
-        
-        for pattern in peb_patterns:
-            if pattern in data:
-                return True
-        
-        return False
-
+        return self._debugger_detection_in(_NEEDLE_SCANNER.present(data))
+    
+    def _debugger_detection_in(self, found: Set[bytes]) -> bool:
+        """Whether any PEB access pattern is among scanned needles."""
+        return any(pattern in found for pattern in PEB_PATTERNS)
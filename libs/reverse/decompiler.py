@@ -6,10 +6,49 @@ Provides decompiler integration for reverse engineering.
 
 from typing import Optional, Dict, Any, List
 from pathlib import Path
+import functools
+import os
+import shutil
 import subprocess
 import sys
 
 
+@functools.lru_cache(maxsize=None)
+def _check_availability(decompiler_type: str) -> bool:
+    """
+    Check if a decompiler is available, probing each type once per process.
+    
+    Only PATH (and $GHIDRA_INSTALL_DIR) is searched; nothing is executed.
+    
+    Args:
+        decompiler_type: Type of decompiler ('ghidra', 'ida', 'radare2')
+    
+    Returns:
+        True if the decompiler can be run
+    """
+    if decompiler_type == 'ghidra':
+        # Check for Ghidra's headless analyzer
+        if shutil.which('analyzeHeadless'):
+            return True
+        install_dir = os.environ.get('GHIDRA_INSTALL_DIR')
+        return bool(install_dir) and os.path.isfile(os.path.join(install_dir, 'support', 'analyzeHeadless'))
+    elif decompiler_type == 'ida':
+        # Check for IDA's text-mode executable
+        return any(shutil.which(name) for name in ('idat64', 'idat'))
+    elif decompiler_type == 'radare2':
+        # Check for radare2
+        return shutil.which('r2') is not None
+    return False
+
+
+def _quit_session(r2: Any) -> None:
+    """Quit an r2pipe session, ignoring a process that already died."""
+    try:
+        r2.quit()
+    except Exception:
+        pass
+
+
 class Decompiler:
     """
     Decompiler interface for reverse engineering.
@@ -24,23 +63,22 @@ class Decompiler:
         """
         self.decompiler_type = decompiler_type
         self.available = self._check_availability()
+        # Open radare2 sessions by binary path, analysed once and reused
+        self._sessions: Dict[str, Any] = {}
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self) -> None:
+        """Quit any open radare2 sessions."""
+        sessions = getattr(self, '_sessions', None) or {}
+        for r2 in sessions.values():
+            _quit_session(r2)
+        sessions.clear()
     
     def _check_availability(self) -> bool:
         """Check if decompiler is available."""
-        if self.decompiler_type == 'ghidra':
-            # Check for Ghidra
-            return False  # Placeholder
-        elif self.decompiler_type == 'ida':
-            # Check for IDA
-            return False  # Placeholder
-        elif self.decompiler_type == 'radare2':
-            # Check for radare2
-            try:
-                subprocess.run(['r2', '-v'], capture_output=True, check=True)
-                return True
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                return False
-        return False
+        return _check_availability(self.decompiler_type)
     
     def decompile(self, binary_path: str, function_address: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -63,6 +101,41 @@ class Decompiler:
     
     def _decompile_radare2(self, binary_path: str, function_address: Optional[int]) -> Dict[str, Any]:
         """Decompile using radare2."""
+        try:
+            import r2pipe
+        except ImportError:
+            return self._decompile_radare2_subprocess(binary_path, function_address)
+        
+        try:
+            r2 = self._sessions.get(binary_path)
+            if r2 is None:
+                # Full analysis dominates the cost; pay it once per binary
+                r2 = r2pipe.open(binary_path, flags=['-2'])
+                r2.cmd('aaa')
+                self._sessions[binary_path] = r2
+            
+            # Temporary seek (@) leaves the session positioned for the next call
+            code = r2.cmd(f'pdf @ {function_address}' if function_address else 'pdf')
+            
+            return {
+                'success': True,
+                'code': code,
+                'errors': '',
+            }
+        except Exception as e:
+            # Drop a session that failed so the next call starts afresh
+            r2 = self._sessions.pop(binary_path, None)
+            if r2 is not None:
+                _quit_session(r2)
+            return {
+                'success': False,
+                'code': '',
+                'errors': str(e),
+            }
+    
+    def _decompile_radare2_subprocess(self, binary_path: str,
+                                      function_address: Optional[int]) -> Dict[str, Any]:
+        """Decompile using a one-off radare2 process (no r2pipe installed)."""
         try:
             cmd = ['r2', '-A', '-c', 'pdf', binary_path]
             if function_address:
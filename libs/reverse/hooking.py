@@ -4,7 +4,7 @@ API Hooking Module
 Provides API hooking capabilities for reverse engineering.
 """
 
-from typing import List, Dict, Optional, Callable, Any
+from typing import List, Dict, Optional, Callable, Any, Tuple
 import sys
 import ctypes
 
@@ -16,7 +16,8 @@ class APIHooker:
     
     def __init__(self):
         """Initialize API hooker."""
-        self.hooks: Dict[str, Callable] = {}
+        # Keyed by (module, function)
+        self.hooks: Dict[Tuple[str, str], Callable] = {}
         self.original_functions: Dict[str, Any] = {}
         self.platform = sys.platform
     
@@ -42,15 +43,13 @@ class APIHooker:
     def _hook_windows(self, module: str, function: str, hook_func: Callable) -> bool:
         """Hook Windows function."""
         # Placeholder - would use detours or similar
-        hook_key = f"{module}:{function}"
-        self.hooks[hook_key] = hook_func
+        self.hooks[(module, function)] = hook_func
         return True
     
     def _hook_linux(self, module: str, function: str, hook_func: Callable) -> bool:
         """Hook Linux function."""
         # Placeholder - would use LD_PRELOAD or ptrace
-        hook_key = f"{module}:{function}"
-        self.hooks[hook_key] = hook_func
+        self.hooks[(module, function)] = hook_func
         return True
     
     def unhook_function(self, module: str, function: str) -> bool:
@@ -64,7 +63,7 @@ class APIHooker:
         Returns:
             True if successful
         """
-        hook_key = f"{module}:{function}"
+        hook_key = (module, function)
         if hook_key in self.hooks:
             del self.hooks[hook_key]
             return True
@@ -77,5 +76,5 @@ class APIHooker:
         Returns:
             List of hook keys
         """
-        return list(self.hooks.keys())
+        return [f"{module}:{function}" for module, function in self.hooks]
 
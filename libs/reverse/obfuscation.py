@@ -5,7 +5,20 @@ Provides analysis of code obfuscation techniques.
 """
 
 from typing import List, Dict, Optional, Any
-from pathlib import Path
+
+import numpy as np
+
+from .scan import (
+    Buffer, byte_histogram, count_matches, histogram_entropy, parallel_scan, scan_file
+)
+from .signatures import INDIRECT_BRANCH_RE
+
+
+def _count_printable(view: memoryview) -> int:
+    """Count printable ASCII bytes (32-126) in a buffer."""
+    arr = np.frombuffer(view, dtype=np.uint8)
+    # One wrapping subtract maps 32..126 to 0..94 and everything else above it
+    return int(np.count_nonzero((arr - np.uint8(32)) < 95))
 
 
 class ObfuscationAnalyzer:
@@ -27,19 +40,17 @@ class ObfuscationAnalyzer:
         Returns:
             Obfuscation analysis results
         """
-        from pathlib import Path
-        data = Path(binary_path).read_bytes()
-        
+        scan = scan_file(binary_path)
         analysis = {
-            'entropy': self._calculate_entropy(data),
-            'control_flow_obfuscation': self._check_control_flow_obfuscation(data),
-            'string_obfuscation': self._check_string_obfuscation(data),
-            'instruction_obfuscation': self._check_instruction_obfuscation(data),
+            'entropy': scan['entropy'],
+            'control_flow_obfuscation': self._indirect_branches_excessive(scan['indirect_branches'], scan['size']),
+            'string_obfuscation': self._printable_too_rare(scan['printable'], scan['size']),
+            'instruction_obfuscation': self._check_instruction_obfuscation(),
         }
         
         return analysis
     
-    def _calculate_entropy(self, data: bytes) -> float:
+    def _calculate_entropy(self, data: Buffer) -> float:
         """
         Calculate Shannon entropy of data.
         
@@ -49,47 +60,35 @@ class ObfuscationAnalyzer:
         Returns:
             Entropy value (0-8)
         """
-        if not data:
-            return 0.0
-        
-        import math
-        byte_counts = [0] * 256
-        for byte in data:
-            byte_counts[byte] += 1
-        
-        entropy = 0.0
-        data_len = len(data)
-        
-        for count in byte_counts:
-            if count > 0:
-                probability = count / data_len
-                entropy -= probability * math.log2(probability)
-        
-        return entropy
+        # Byte histogram, chunks counted on parallel threads
+        return histogram_entropy(byte_histogram(data))
     
-    def _check_control_flow_obfuscation(self, data: bytes) -> bool:
+    def _check_control_flow_obfuscation(self, data: Buffer) -> bool:
         """Check for control flow obfuscation."""
-        # Check for excessive indirect jumps/calls
-        indirect_patterns = [
-            b'\xFF\xD0',  # call eax
-            b'\xFF\xD1',  # call ecx
-            b'\xFF\xE0',  # jmp eax
-        ]
-        
-        count = sum(data.count(pattern) for pattern in indirect_patterns)
+        # Check for excessive indirect jumps/calls, all opcodes in one pass;
+        # chunks overlap by one byte so no two-byte opcode is split
+        count = count_matches(INDIRECT_BRANCH_RE, data, overlap=1)
+        return self._indirect_branches_excessive(count, len(data))
+    
+    def _indirect_branches_excessive(self, count: int, size: int) -> bool:
+        """Whether count indirect branches in size bytes suggests obfuscation."""
         # Heuristic: if more than 1% of instructions are indirect, likely obfuscated
-        return count > len(data) / 100
+        return count > size / 100
     
-    def _check_string_obfuscation(self, data: bytes) -> bool:
+    def _check_string_obfuscation(self, data: Buffer) -> bool:
         """Check for string obfuscation."""
         # Check for low ratio of printable ASCII
-        printable_count = sum(1 for b in data if 32 <= b <= 126)
-        ratio = printable_count / len(data) if data else 0
+        printable_count = sum(count for _, count in parallel_scan(data, _count_printable))
+        return self._printable_too_rare(printable_count, len(data))
+    
+    def _printable_too_rare(self, printable_count: int, size: int) -> bool:
+        """Whether printable_count printable bytes in size bytes suggests obfuscation."""
+        ratio = printable_count / size if size else 0
         
         # If less than 20% printable, likely obfuscated
         return ratio < 0.2
     
-    def _check_instruction_obfuscation(self, data: bytes) -> bool:
+    def _check_instruction_obfuscation(self, data: Optional[Buffer] = None) -> bool:
         """Check for instruction obfuscation."""
         # Check for unusual instruction sequences
         # This is a simplified check
@@ -4,9 +4,18 @@ Pattern Matching Module
 Provides pattern matching for reverse engineering.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Union
+import functools
 import re
 
+from .scan import NeedleScanner
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern: bytes, flags: int) -> re.Pattern:
+    """Compile a bytes regex once per (pattern, flags)."""
+    return re.compile(pattern, flags)
+
 
 class PatternMatcher:
     """
@@ -16,6 +25,9 @@ class PatternMatcher:
     def __init__(self):
         """Initialize pattern matcher."""
         self.patterns: Dict[str, bytes] = {}
+        # Scanner over every pattern, rebuilt when self.patterns changes
+        self._scanner: Optional[NeedleScanner] = None
+        self._scanner_key: Tuple[Tuple[str, bytes], ...] = ()
         self._load_common_patterns()
     
     def _load_common_patterns(self) -> None:
@@ -76,31 +88,42 @@ class PatternMatcher:
         Returns:
             Dictionary mapping pattern names to offsets
         """
-        results = {}
-        for pattern_name in self.patterns:
-            offsets = self.find_pattern(data, pattern_name)
-            if offsets:
-                results[pattern_name] = offsets
-        return results
+        found = self._get_scanner().offsets(data)
+        
+        # Keep the pattern insertion order of the per-pattern loop
+        return {name: list(found[pattern]) for name, pattern in self.patterns.items() if pattern in found}
+    
+    def _get_scanner(self) -> NeedleScanner:
+        """Scanner over the current patterns, compiled once per pattern set."""
+        # Compare a snapshot so direct edits to self.patterns are picked up too
+        key = tuple(self.patterns.items())
+        if self._scanner is None or key != self._scanner_key:
+            self._scanner = NeedleScanner(pattern for pattern in self.patterns.values() if pattern)
+            self._scanner_key = key
+        return self._scanner
     
-    def match_regex(self, data: bytes, pattern: str) -> List[Dict[str, Any]]:
+    def match_regex(self, data: bytes, pattern: Union[bytes, str],
+                    dotall: bool = False) -> List[Dict[str, Any]]:
         """
         Match regex pattern in data.
         
         Args:
             data: Data to search
-            pattern: Regex pattern
+            pattern: Regex pattern (str patterns are encoded as latin-1)
+            dotall: Let '.' match b'\\n' too, which binary data often contains
             
         Returns:
             List of matches
         """
         try:
-            text = data.decode('latin-1', errors='ignore')
+            # Match the bytes directly rather than a decoded copy of them
+            if isinstance(pattern, str):
+                pattern = pattern.encode('latin-1')
             matches = []
-            for match in re.finditer(pattern, text):
+            for match in _compile(pattern, re.DOTALL if dotall else 0).finditer(data):
                 matches.append({
                     'offset': match.start(),
-                    'match': match.group(),
+                    'match': match.group().decode('latin-1'),
                     'span': match.span(),
                 })
             return matches
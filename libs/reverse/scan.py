@@ -0,0 +1,415 @@
+"""
+Binary Scanning Helpers Module
+
+Provides shared helpers for scanning binaries.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+import functools
+import mmap
+import os
+import re
+
+import numpy as np
+
+from .signatures import ANTI_DEBUG_APIS, INDIRECT_BRANCH_RE, PACKER_DB, PEB_PATTERNS, TIMING_APIS
+
+
+# Below this many needles, one bytes.find per needle (CPython's memchr-driven
+# fastsearch) beats a single regex sweep; measured crossover is ~14 needles
+_SWEEP_MIN_NEEDLES = 14
+
+# Shortest needle whose hits are reused to verify longer needles it begins;
+# hits of very short needles are too common to walk in Python
+_MIN_SHARED_PREFIX = 4
+
+# Any of the buffers the scanners accept
+Buffer = Union[bytes, mmap.mmap]
+
+# Default chunk size for iter_chunks and parallel_scan
+_SCAN_CHUNK = 16 << 20
+
+# Bytes per bincount call in byte_histogram; bincount widens its input to
+# intp, so each call needs 8x this in scratch memory
+_HIST_CHUNK = 1 << 20
+
+# Blocks histogrammed per bincount call in window_entropy (bounds scratch memory)
+_HIST_BATCH = 256
+
+# Files whose scan_binary() results scan_file() keeps
+_FILE_CACHE_SIZE = 1024
+
+T = TypeVar('T')
+
+
+@contextmanager
+def open_ro(path: Union[str, os.PathLike]) -> Iterator[Buffer]:
+    """
+    Map a file read-only for scanning.
+    
+    The kernel pages the file in on demand instead of it being copied into
+    a bytes object up front, and scans read it front to back, so it is
+    advised for sequential access (readahead, early reclaim of read pages).
+    Views of the map (e.g. np.frombuffer arrays) must be released before
+    the with block exits.
+    
+    Args:
+        path: File to map
+    
+    Yields:
+        Read-only mmap of the file (empty bytes for an empty file, which
+        cannot be mapped)
+    """
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
+
+class NeedleScanner:
+    """
+    Finds which of many literal byte strings occur in a buffer, and where.
+    
+    Large needle sets are compiled into one regex alternation, so the buffer
+    is walked once however many needles there are, instead of once per needle.
+    """
+    
+    def __init__(self, needles: Iterable[bytes]):
+        """
+        Initialize needle scanner.
+        
+        Args:
+            needles: Byte strings to search for
+        """
+        # Longest first so the alternation prefers the longer of two needles
+        # sharing a start; the shorter one is then implied (see _contained)
+        self.needles: List[bytes] = sorted(set(needles), key=len, reverse=True)
+        self._regex = re.compile(b'|'.join(re.escape(needle) for needle in self.needles))
+        self._contained: Dict[bytes, List[bytes]] = {
+            needle: [other for other in self.needles if other in needle]
+            for needle in self.needles
+        }
+        self._prefixes: Dict[bytes, List[bytes]] = {
+            needle: [other for other in self.needles if needle.startswith(other)]
+            for needle in self.needles
+        }
+        
+        # For small sets: a needle that extends a shorter one is verified
+        # only at the shorter one's hits, so each group costs one find loop
+        self._groups: Dict[bytes, List[bytes]] = {}
+        for needle in reversed(self.needles):
+            root = next((root for root in self._groups
+                         if len(root) >= _MIN_SHARED_PREFIX and needle.startswith(root)), needle)
+            self._groups.setdefault(root, []).append(needle)
+    
+    def present(self, data: Buffer) -> Set[bytes]:
+        """
+        Find which needles occur in data.
+        
+        Args:
+            data: Data to search
+        
+        Returns:
+            Set of needles found
+        """
+        if len(self.needles) < _SWEEP_MIN_NEEDLES:
+            # find() rather than `in`, which tests single bytes on an mmap
+            return {needle for needle in self.needles if data.find(needle) != -1}
+        
+        found: Set[bytes] = set()
+        search = self._regex.search
+        pos = 0
+        while len(found) < len(self.needles):
+            match = search(data, pos)
+            if match is None:
+                break
+            found.update(self._contained[match.group()])
+            # Resume one byte on so needles overlapping this match are seen
+            pos = match.start() + 1
+        
+        return found
+    
+    def offsets(self, data: Buffer) -> Dict[bytes, List[int]]:
+        """
+        Find every occurrence of each needle, overlapping ones included.
+        
+        Args:
+            data: Data to search
+        
+        Returns:
+            Dictionary mapping each needle found to its ascending offsets
+        """
+        found: Dict[bytes, List[int]] = {}
+        
+        if len(self.needles) < _SWEEP_MIN_NEEDLES:
+            for root, members in self._groups.items():
+                start = 0
+                while True:
+                    offset = data.find(root, start)
+                    if offset == -1:
+                        break
+                    for needle in members:
+                        if data[offset:offset + len(needle)] == needle:
+                            found.setdefault(needle, []).append(offset)
+                    start = offset + 1
+            return found
+        
+        # The alternation picks the longest needle matching at each offset;
+        # any other needle matching there is one of its prefixes
+        search = self._regex.search
+        pos = 0
+        while True:
+            match = search(data, pos)
+            if match is None:
+                break
+            offset = match.start()
+            for needle in self._prefixes[match.group()]:
+                found.setdefault(needle, []).append(offset)
+            pos = offset + 1
+        
+        return found
+
+
+def iter_chunks(data: Buffer, chunk: int = _SCAN_CHUNK,
+                overlap: int = 0) -> Iterator[Tuple[int, memoryview]]:
+    """
+    Walk data in consecutive chunks without copying it.
+    
+    Chunk i covers data[i * chunk:(i + 1) * chunk + overlap], so a match of
+    up to overlap + 1 bytes straddling a chunk boundary is seen whole;
+    callers drop hits at or past offset chunk within a slice so they are
+    not counted twice.
+    
+    Args:
+        data: Data to walk
+        chunk: Chunk size in bytes
+        overlap: Extra bytes each chunk extends into the next
+    
+    Yields:
+        Tuples of (chunk_start, chunk_view)
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), chunk):
+        yield start, view[start:start + chunk + overlap]
+
+
+def parallel_scan(data: Buffer, scan_fn: Callable[[memoryview], T], chunk: int = _SCAN_CHUNK,
+                  overlap: int = 0, workers: Optional[int] = None) -> List[Tuple[int, T]]:
+    """
+    Run a scan over the chunks of iter_chunks on a thread pool.
+    
+    Threads only run concurrently while scan_fn releases the GIL. NumPy's
+    bincount and comparisons do; bytes.find and the re module do not, so
+    needle and regex scans gain nothing from this on a GIL build of CPython.
+    
+    Args:
+        data: Data to scan
+        scan_fn: Called with a memoryview of each chunk
+        chunk: Chunk size in bytes
+        overlap: Extra bytes each chunk extends into the next
+        workers: Thread count (defaults to the CPU count)
+    
+    Returns:
+        (chunk_start, scan_fn result) tuples in chunk order
+    """
+    chunks = list(iter_chunks(data, chunk, overlap))
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1 or len(chunks) <= 1:
+        return [(start, scan_fn(view)) for start, view in chunks]
+    
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        results = executor.map(scan_fn, [view for _, view in chunks])
+        return [(start, result) for (start, _), result in zip(chunks, results)]
+
+
+def byte_histogram(data: Buffer) -> np.ndarray:
+    """
+    Count occurrences of each byte value.
+    
+    Args:
+        data: Data to count
+    
+    Returns:
+        256 counts indexed by byte value
+    """
+    counts = np.zeros(256, dtype=np.int64)
+    for _, chunk_counts in parallel_scan(
+            data, lambda view: np.bincount(np.frombuffer(view, dtype=np.uint8), minlength=256),
+            chunk=_HIST_CHUNK):
+        counts += chunk_counts
+    return counts
+
+
+def histogram_entropy(counts: np.ndarray) -> float:
+    """
+    Shannon entropy of data from its byte histogram.
+    
+    Args:
+        counts: 256 byte counts
+    
+    Returns:
+        Entropy value (0-8)
+    """
+    total = counts.sum()
+    if not total:
+        return 0.0
+    probabilities = counts[counts > 0] / total
+    return float((probabilities * np.log2(1 / probabilities)).sum())
+
+
+def count_matches(regex: re.Pattern, data: Buffer, overlap: int = 0) -> int:
+    """
+    Count non-overlapping regex matches chunk by chunk.
+    
+    Args:
+        regex: Compiled bytes regex whose matches cannot overlap each other
+        data: Data to search
+        overlap: Longest match length - 1, so no match is split
+    
+    Returns:
+        Number of matches
+    """
+    # findall lists stay chunk-sized instead of growing with the file
+    return sum(len(regex.findall(view)) for _, view in iter_chunks(data, overlap=overlap))
+
+
+def window_entropy(data: Buffer, block: int = 4096, window: int = 16) -> np.ndarray:
+    """
+    Shannon entropy of every window of consecutive blocks.
+    
+    Each block is histogrammed once and the histograms are prefix-summed,
+    so each window's histogram is one row difference and the whole scan
+    stays linear in len(data) however large the window is. Blocks are
+    processed a batch at a time, carrying the last window - 1 histograms
+    between batches, so scratch memory does not grow with len(data).
+    
+    Args:
+        data: Data to analyze
+        block: Block size in bytes (windows start on block boundaries)
+        window: Window length in blocks
+    
+    Returns:
+        Entropy (0-8) of the window starting at each block; a single value
+        for the whole buffer if it is shorter than one window
+    """
+    return _window_scan(data, block, window)[0]
+
+
+def _window_scan(data: Buffer, block: int, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Window entropies (see window_entropy) and the whole-buffer byte histogram."""
+    total = np.zeros(256, dtype=np.int64)
+    if not len(data):
+        return np.zeros(0), total
+    
+    def block_hist(view: memoryview) -> np.ndarray:
+        chunk = np.frombuffer(view, dtype=np.uint8)
+        count = -(-chunk.size // block)
+        # Offset each block's bytes into its own 256-bin range of one bincount
+        offsets = np.repeat(np.arange(count, dtype=np.intp) * 256, block)[:chunk.size]
+        return np.bincount(offsets + chunk, minlength=count * 256).reshape(count, 256)
+    
+    window = min(window, -(-len(data) // block))
+    batch = _HIST_BATCH * block
+    workers = os.cpu_count() or 1
+    carry = np.zeros((0, 256), dtype=np.int64)
+    entropies = []
+    
+    # One batch per worker at a time keeps the threads busy without holding
+    # every block histogram at once
+    for _, group in iter_chunks(data, batch * workers):
+        for _, hist in parallel_scan(group, block_hist, chunk=batch, workers=workers):
+            total += hist.sum(axis=0)
+            hist = np.concatenate([carry, hist])
+            cum = np.zeros((len(hist) + 1, 256), dtype=np.int64)
+            np.cumsum(hist, axis=0, out=cum[1:])
+            counts = (cum[window:] - cum[:-window]).astype(np.float64)
+            if len(counts):
+                # H = log2(n) - sum(c * log2(c)) / n, with 0 * log2(0) taken as 0
+                totals = counts.sum(axis=1)
+                weighted = (counts * np.log2(np.maximum(counts, 1))).sum(axis=1)
+                entropies.append(np.log2(totals) - weighted / totals)
+            carry = hist[max(0, len(hist) - window + 1):]
+    
+    return np.concatenate(entropies), total
+
+
+# Every signature scan_binary looks for, in one scanner
+_TRIAGE_SCANNER = NeedleScanner(
+    ANTI_DEBUG_APIS + TIMING_APIS + PEB_PATTERNS
+    + [sig for sigs in PACKER_DB.values() for sig in sigs]
+)
+
+
+def scan_binary(data: Buffer) -> Dict[str, Any]:
+    """
+    Gather what the anti-debug and obfuscation analyses need in one go.
+    
+    One histogramming pass yields the window entropies, the whole-file
+    entropy and the printable byte count; one needle sweep covers the
+    anti-debug, timing, PEB and packer signatures.
+    
+    Args:
+        data: Binary contents
+    
+    Returns:
+        Dictionary with size, entropy, window_entropies (read-only array,
+        see window_entropy), max_window_entropy, printable (count of bytes
+        32-126), indirect_branches (count) and needles (frozenset of
+        signatures present)
+    """
+    windows, counts = _window_scan(data, 4096, 16)
+    windows.flags.writeable = False  # Shared through the scan_file cache
+    
+    return {
+        'size': len(data),
+        'entropy': histogram_entropy(counts),
+        'window_entropies': windows,
+        'max_window_entropy': float(windows.max()) if windows.size else 0.0,
+        'printable': int(counts[32:127].sum()),
+        'indirect_branches': count_matches(INDIRECT_BRANCH_RE, data, overlap=1),
+        'needles': frozenset(_TRIAGE_SCANNER.present(data)),
+    }
+
+
+def file_signature(path: Union[str, os.PathLike]) -> Tuple[str, int, int]:
+    """
+    Identify a file's current contents for caching.
+    
+    Args:
+        path: Path to file
+    
+    Returns:
+        (absolute path, size, mtime in ns); changes whenever the file is rewritten
+    """
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def scan_file(path: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """
+    scan_binary() a file, reusing earlier results while the file is unchanged.
+    
+    Analyzers run on one file, back-to-back or repeatedly, share a single
+    pass; the result is shared too, so callers must not modify it.
+    
+    Args:
+        path: Path to binary
+    
+    Returns:
+        scan_binary() result for the file contents
+    """
+    return _scan_file(*file_signature(path))
+
+
+@functools.lru_cache(maxsize=_FILE_CACHE_SIZE)
+def _scan_file(path: str, size: int, mtime_ns: int) -> Dict[str, Any]:
+    """scan_binary() for one file_signature()."""
+    with open_ro(path) as data:
+        return scan_binary(data)
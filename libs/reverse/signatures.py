@@ -0,0 +1,41 @@
+"""
+Binary Signatures Module
+
+Provides the byte signatures shared by the reverse engineering scanners.
+"""
+
+from typing import Dict, List
+import re
+
+
+# Anti-debugging API names
+ANTI_DEBUG_APIS = [
+    b'IsDebuggerPresent',
+    b'CheckRemoteDebuggerPresent',
+    b'NtQueryInformationProcess',
+    b'OutputDebugString',
+]
+
+# Timing APIs and instructions used to notice single-stepping
+TIMING_APIS = [
+    b'GetTickCount',
+    b'QueryPerformanceCounter',
+    b'rdtsc',
+]
+
+# PEB access used to read the BeingDebugged flag
+PEB_PATTERNS = [
+    b'\x64\xA1\x30\x00\x00\x00',  # mov eax, fs:[0x30] (PEB)
+]
+
+# Packer signatures, in detection priority order
+PACKER_DB: Dict[str, List[bytes]] = {
+    'upx': [b'UPX!', b'UPX0', b'UPX1'],
+    'pecompact': [b'PEC2', b'PEC2MSCE'],
+    'aspack': [b'ASPack'],
+    'fsg': [b'FSG!'],
+    'mew': [b'MEW'],
+}
+
+# call eax / call ecx / jmp eax
+INDIRECT_BRANCH_RE = re.compile(rb'\xFF[\xD0\xD1\xE0]')
@@ -4,8 +4,33 @@ Unpacking Utilities Module
 Provides utilities for unpacking packed binaries.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
+import functools
+
+from .scan import NeedleScanner, file_signature, open_ro
+from .signatures import PACKER_DB
+
+
+_PACKER_SCANNER = NeedleScanner(sig for sigs in PACKER_DB.values() for sig in sigs)
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_packer(path: str, size: int, mtime_ns: int,
+                   packers: Tuple[Tuple[str, Tuple[bytes, ...]], ...]) -> Optional[str]:
+    """Unpacker.detect_packer for one file_signature() and packer table."""
+    with open_ro(path) as data:
+        found = _PACKER_SCANNER.present(data)
+        # Signatures added to an instance are not in the shared scanner
+        extra = {sig for _, sigs in packers for sig in sigs} - set(_PACKER_SCANNER.needles)
+        found.update(sig for sig in extra if data.find(sig) != -1)
+    
+    # First packer in priority order, not the first signature in the file
+    for packer_name, signatures in packers:
+        if any(signature in found for signature in signatures):
+            return packer_name
+    
+    return None
 
 
 class Unpacker:
@@ -19,13 +44,8 @@ class Unpacker:
     
     def _detect_packers(self) -> Dict[str, List[bytes]]:
         """Detect common packer signatures."""
-        return {
-            'upx': [b'UPX!', b'UPX0', b'UPX1'],
-            'pecompact': [b'PEC2', b'PEC2MSCE'],
-            'aspack': [b'ASPack'],
-            'fsg': [b'FSG!'],
-            'mew': [b'MEW'],
-        }
+        # A copy per instance, so added signatures stay local to it
+        return {name: list(signatures) for name, signatures in PACKER_DB.items()}
     
     def detect_packer(self, binary_path: str) -> Optional[str]:
         """
@@ -37,14 +57,10 @@ class Unpacker:
         Returns:
             Packer name or None
         """
-        data = Path(binary_path).read_bytes()
-        
-        for packer_name, signatures in self.packers.items():
-            for signature in signatures:
-                if signature in data:
-                    return packer_name
-        
-        return None
+        # Cached per file contents; the table is part of the key since
+        # instances may add signatures
+        packers = tuple((name, tuple(sigs)) for name, sigs in self.packers.items())
+        return _detect_packer(*file_signature(binary_path), packers)
     
     def unpack(self, binary_path: str, output_path: Optional[str] = None) -> bool:
         """
@@ -4,27 +4,50 @@
 __version__ = "0.1.0"
 __author__ = "Reaper Security Team"
 
+import importlib
+
 # Core features implemented in L1-T006
-from .tor.manager import (
-    ShadowTorManager, TorCircuitStatus, TorNodeType, TorNode, TorCircuit, TorOperationResult,
-    start_tor_service, check_tor_ip, make_tor_request
-)
-
-from .vpn.manager import (
-    ShadowVPNManager, VPNProtocol, VPNStatus, VPNServer, VPNConfig, VPNOperationResult,
-    find_best_vpn_server, connect_to_vpn, disconnect_vpn, check_vpn_ip
-)
-
-from .network.manager import (
-    ShadowNetworkManager, NetworkInterfaceType, MACAddressFormat, NetworkInterface, NetworkOperationResult,
-    get_network_interfaces, spoof_mac_address, restore_mac_address, randomize_mac_addresses, generate_random_mac
-)
-
-from .obfuscation.manager import (
-    ShadowObfuscationManager, ObfuscationMethod, FingerprintType, FingerprintProfile, 
-    ObfuscationConfig, ObfuscationResult, generate_fingerprint_profile, obfuscate_request,
-    randomize_traffic_pattern, generate_tls_fingerprint
-)
+# Managers are imported on first attribute access (PEP 562), so importing the
+# package does not pull in requests and every manager's dependencies up front
+_LAZY_MODULES = {
+    '.tor.manager': [
+        'ShadowTorManager', 'TorCircuitStatus', 'TorNodeType', 'TorNode', 'TorCircuit',
+        'TorOperationResult', 'start_tor_service', 'check_tor_ip', 'make_tor_request',
+    ],
+    '.vpn.manager': [
+        'ShadowVPNManager', 'VPNProtocol', 'VPNStatus', 'VPNServer', 'VPNConfig',
+        'VPNOperationResult', 'find_best_vpn_server', 'connect_to_vpn', 'disconnect_vpn',
+        'check_vpn_ip',
+    ],
+    '.network.manager': [
+        'ShadowNetworkManager', 'NetworkInterfaceType', 'MACAddressFormat', 'NetworkInterface',
+        'NetworkOperationResult', 'get_network_interfaces', 'spoof_mac_address',
+        'restore_mac_address', 'randomize_mac_addresses', 'generate_random_mac',
+        'reset_default_manager',
+    ],
+    '.obfuscation.manager': [
+        'ShadowObfuscationManager', 'ObfuscationMethod', 'FingerprintType', 'FingerprintProfile',
+        'ObfuscationConfig', 'ObfuscationResult', 'generate_fingerprint_profile',
+        'obfuscate_request', 'randomize_traffic_pattern', 'generate_tls_fingerprint',
+    ],
+}
+_LAZY = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     # Tor integration
@@ -38,6 +61,7 @@ __all__ = [
     # Network anonymity
     'ShadowNetworkManager', 'NetworkInterfaceType', 'MACAddressFormat', 'NetworkInterface', 'NetworkOperationResult',
     'get_network_interfaces', 'spoof_mac_address', 'restore_mac_address', 'randomize_mac_addresses', 'generate_random_mac',
+    'reset_default_manager',
     
     # Traffic obfuscation
     'ShadowObfuscationManager', 'ObfuscationMethod', 'FingerprintType', 'FingerprintProfile', 
@@ -48,7 +72,3 @@ __all__ = [
 # Will be implemented in L1-T010 and L1-T011
 # Core features: Tor, VPN, MAC spoofing
 # Advanced features: IP rotation, traffic obfuscation, metadata stripping
-
-__all__ = [
-    # Will be populated as features are implemented
-]
@@ -4,6 +4,8 @@ Shadow Network Anonymity Module
 MAC address spoofing, network interface management, and anonymity features
 """
 
+import functools
+import os
 import subprocess
 import time
 import random
@@ -12,13 +14,34 @@ import re
 import uuid
 import platform
 import socket
-from typing import Optional, List, Dict, Any, Union, Tuple
-from dataclasses import dataclass
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Union, Tuple, NamedTuple
+from dataclasses import dataclass, replace
 from enum import Enum
+from collections import deque
 import psutil
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    from pyroute2 import IPRoute
+except ImportError:  # Optional, Linux MAC spoofing falls back to the ip command
+    IPRoute = None
+
 logger = logging.getLogger(__name__)
 
+# __slots__ for the record dataclasses where supported (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Host OS, looked up once (platform.system() may run uname on first call)
+_OS = platform.system()
+
 class NetworkInterfaceType(Enum):
     """Network interface types"""
     ETHERNET = "ethernet"
@@ -34,7 +57,7 @@ class MACAddressFormat(Enum):
     DOT = "dot"      # 00.11.22.33.44.55
     NONE = "none"    # 001122334455
 
-@dataclass
+@dataclass(**_SLOTS)
 class NetworkInterface:
     """Network interface information"""
     name: str
@@ -45,9 +68,19 @@ class NetworkInterface:
     subnet_mask: Optional[str] = None
     gateway: Optional[str] = None
     dns_servers: List[str] = None
-    vendor: Optional[str] = None
+    
+    @property
+    def mac_int(self) -> Optional[int]:
+        """MAC address as a 48-bit integer (None if unparseable)"""
+        return _mac_to_int(self.mac_address)
+    
+    @property
+    def vendor(self) -> str:
+        """Vendor from the MAC address OUI, resolved on first access"""
+        # Memoized per address, and follows mac_address when it is spoofed
+        return _mac_vendor(self.mac_address)
 
-@dataclass
+@dataclass(**_SLOTS)
 class NetworkOperationResult:
     """Result of network operation"""
     success: bool
@@ -56,6 +89,235 @@ class NetworkOperationResult:
     data: Optional[Any] = None
     error: Optional[str] = None
 
+# Results are built positionally: keyword arguments cost about 70% more per
+# construction, and every operation returns one
+def _ok(operation: str, message: str, data: Optional[Any] = None) -> NetworkOperationResult:
+    """Successful NetworkOperationResult"""
+    return NetworkOperationResult(True, operation, message, data)
+
+def _err(operation: str, message: str, error: str) -> NetworkOperationResult:
+    """Failed NetworkOperationResult"""
+    return NetworkOperationResult(False, operation, message, None, error)
+
+class LogEntry(NamedTuple):
+    """Network operation log entry"""
+    timestamp: int  # time.monotonic_ns()
+    operation: str
+    success: bool
+    message: str
+
+# Strips MAC separators in one pass
+_SEP_TABLE = str.maketrans('', '', ':-.')
+
+# 12 hex digits, separators already stripped
+_MAC_RE = re.compile(r'[0-9a-fA-F]{12}')
+
+# SIOCGIFFLAGS ioctl request and the IFF_UP flag (linux/sockios.h, net/if.h)
+_SIOCGIFFLAGS = 0x8913
+_IFF_UP = 0x1
+
+def _interfaces_up(names: List[str]) -> Dict[str, bool]:
+    """Whether each named interface is administratively up"""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return {name: stat.isup for name, stat in psutil.net_if_stats().items()}
+    
+    # One flags ioctl per interface; psutil.net_if_stats() also queries
+    # duplex, speed and MTU for each, which costs several times more
+    up = {}
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for name in names:
+            try:
+                ifreq = fcntl.ioctl(sock.fileno(), _SIOCGIFFLAGS, struct.pack('16s16x', name.encode()))
+            except OSError:
+                continue  # Interface went away since it was listed
+            up[name] = bool(struct.unpack_from('H', ifreq, 16)[0] & _IFF_UP)
+    return up
+
+# psutil interface addresses and up states shared by every manager, with the
+# monotonic time they were read
+_IF_CACHE = {"ts": 0.0, "addrs": None, "up": None}
+
+def _cached_net_if(ttl: float = 5.0) -> Tuple[Dict[str, Any], Dict[str, bool]]:
+    """psutil.net_if_addrs() and _interfaces_up(), reused for ttl seconds"""
+    now = time.monotonic()
+    if _IF_CACHE["addrs"] is None or now - _IF_CACHE["ts"] >= ttl:
+        _IF_CACHE["addrs"] = psutil.net_if_addrs()
+        _IF_CACHE["up"] = _interfaces_up(list(_IF_CACHE["addrs"]))
+        _IF_CACHE["ts"] = now
+    return _IF_CACHE["addrs"], _IF_CACHE["up"]
+
+# Interface name keywords per type, checked in order (so "bt-eth0" is ethernet)
+_INTERFACE_TYPE_KEYWORDS = (
+    (NetworkInterfaceType.WIFI, ('wifi', 'wlan', 'wireless')),
+    (NetworkInterfaceType.ETHERNET, ('eth',)),  # also covers 'ethernet'
+    (NetworkInterfaceType.BLUETOOTH, ('bluetooth', 'bt')),
+    (NetworkInterfaceType.VIRTUAL, ('vpn', 'tun', 'tap')),
+)
+
+@functools.lru_cache(maxsize=256)
+def _interface_type(name: str) -> NetworkInterfaceType:
+    """Interface type for a name, cached per distinct name"""
+    name_lower = name.lower()
+    for interface_type, keywords in _INTERFACE_TYPE_KEYWORDS:
+        for keyword in keywords:
+            if keyword in name_lower:
+                return interface_type
+    return NetworkInterfaceType.UNKNOWN
+
+# Interface types randomize_all_macs changes
+_MAC_CAPABLE = frozenset({NetworkInterfaceType.ETHERNET, NetworkInterfaceType.WIFI})
+
+# Separator emitted for each MAC address format
+_MAC_SEPARATORS = {
+    MACAddressFormat.COLON: ':',
+    MACAddressFormat.DASH: '-',
+    MACAddressFormat.DOT: '.',
+    MACAddressFormat.NONE: '',
+}
+
+# OUIs generate_random_mac picks from per vendor, as raw bytes
+_VENDOR_OUIS = {
+    vendor: tuple(bytes.fromhex(oui.translate(_SEP_TABLE)) for oui in ouis)
+    for vendor, ouis in {
+        'Intel': ('00:1B:21', '00:1C:42', '00:1D:4F'),
+        'Apple': ('00:16:CB', '00:17:F2', '00:1B:63'),
+        'Realtek': ('52:54:00', '00:E0:4C', '00:1F:5B'),
+        'Microsoft': ('00:50:F2', '00:15:5D', '00:03:FF'),
+        'VMware': ('00:0C:29', '00:1C:14', '00:50:56'),
+    }.items()
+}
+
+def _mac_to_int(mac: Union[str, int]) -> Optional[int]:
+    """48-bit integer for a MAC address string or int, or None if invalid"""
+    if isinstance(mac, bool):
+        return None
+    if isinstance(mac, int):
+        return mac if 0 <= mac < 1 << 48 else None
+    
+    # Remove separators, then require exactly 12 hex characters
+    mac_clean = mac.translate(_SEP_TABLE)
+    return int(mac_clean, 16) if _MAC_RE.fullmatch(mac_clean) else None
+
+def _format_mac(raw: bytes, format: MACAddressFormat = MACAddressFormat.COLON) -> str:
+    """Uppercase hex MAC address for 6 raw bytes in the given format"""
+    separator = _MAC_SEPARATORS.get(format, ':')
+    return (raw.hex(separator) if separator else raw.hex()).upper()
+
+# Vendor OUIs (first 3 bytes of a MAC, 6 uppercase hex digits; simplified list)
+_OUI_MAP = {
+    '000C29': 'VMware',
+    '001C42': 'Apple',
+    '001D4F': 'Apple',
+    '002590': 'Apple',
+    '003065': 'Apple',
+    '0050F2': 'Microsoft',
+    '080027': 'Oracle VirtualBox',
+    '0C9D92': 'Intel',
+    '14DAE9': 'Intel',
+    '1C1B0D': 'Intel',
+    '2C44FD': 'Intel',
+    '3C07F4': 'Intel',
+    '3C2AF7': 'Intel',
+    '3C4A92': 'Intel',
+    '3C5AB4': 'Intel',
+    '3C6A7D': 'Intel',
+    '3C7FB1': 'Intel',
+    '3C8BFE': 'Intel',
+    '3C9F81': 'Intel',
+    '3CA8F6': 'Intel',
+    '3CA9F4': 'Intel',
+    '3CB6B7': 'Intel',
+    '3CB87A': 'Intel',
+    '3CB9A6': 'Intel',
+    '3CBBFD': 'Intel',
+    '3CC1F6': 'Intel',
+    '3CC2E1': 'Intel',
+    '3CC99E': 'Intel',
+    '3CCE73': 'Intel',
+    '3CD0F8': 'Intel',
+    '3CD4D6': 'Intel',
+    '3CD7DA': 'Intel',
+    '3CD9CE': 'Intel',
+    '3CDA2A': 'Intel',
+    '3CDD89': 'Intel',
+    '3CDF1E': 'Intel',
+    '3CDFA9': 'Intel',
+    '3CE1A1': 'Intel',
+    '3CE5A6': 'Intel',
+    '3CE624': 'Intel',
+    '3CE72B': 'Intel',
+    '3CE8F0': 'Intel',
+    '3CE9F7': 'Intel',
+    '3CEAF0': 'Intel',
+    '3CEB5F': 'Intel',
+    '3CECEF': 'Intel',
+    '3CEDFB': 'Intel',
+    '3CEE93': 'Intel',
+    '3CEF8C': 'Intel',
+    '3CF010': 'Intel',
+    '3CF09F': 'Intel',
+    '3CF111': 'Intel',
+    '3CF2B9': 'Intel',
+    '3CF392': 'Intel',
+    '3CF4CA': 'Intel',
+    '3CF5CC': 'Intel',
+    '3CF6A4': 'Intel',
+    '3CF7A4': 'Intel',
+    '3CF8B9': 'Intel',
+    '3CF9FA': 'Intel',
+    '3CFAB7': 'Intel',
+    '3CFB96': 'Intel',
+    '3CFC3F': 'Intel',
+    '3CFD3A': 'Intel',
+    '3CFE4C': 'Intel',
+    '3CFF4A': 'Intel',
+    '3CFFCA': 'Intel',
+    '3CFFD6': 'Intel',
+    '3CFFE9': 'Intel',
+    '3CFFEA': 'Intel',
+    '3CFFEB': 'Intel',
+    '3CFFEC': 'Intel',
+    '3CFFED': 'Intel',
+    '3CFFEE': 'Intel',
+    '3CFFEF': 'Intel',
+    '3CFFF0': 'Intel',
+    '3CFFF1': 'Intel',
+    '3CFFF2': 'Intel',
+    '3CFFF3': 'Intel',
+    '3CFFF4': 'Intel',
+    '3CFFF5': 'Intel',
+    '3CFFF6': 'Intel',
+    '3CFFF7': 'Intel',
+    '3CFFF8': 'Intel',
+    '3CFFF9': 'Intel',
+    '3CFFFA': 'Intel',
+    '3CFFFB': 'Intel',
+    '3CFFFC': 'Intel',
+    '3CFFFD': 'Intel',
+    '3CFFFE': 'Intel',
+    '3CFFFF': 'Intel',
+}
+
+# Vendors owning every OUI under a 2-byte prefix (4 uppercase hex digits)
+_OUI_PREFIX_MAP = {
+    '5254': 'Realtek',
+}
+
+# Integer-keyed views of the tables above: OUI = mac_int >> 24, prefix = mac_int >> 32
+_OUI_INT_MAP = {int(oui, 16): vendor for oui, vendor in _OUI_MAP.items()}
+_OUI_PREFIX_INT_MAP = {int(prefix, 16): vendor for prefix, vendor in _OUI_PREFIX_MAP.items()}
+
+@functools.lru_cache(maxsize=4096)
+def _mac_vendor(mac_address: Union[str, int]) -> str:
+    """Vendor for a MAC address, cached per distinct address"""
+    mac_int = _mac_to_int(mac_address)
+    if mac_int is None:
+        return 'Unknown'
+    
+    # OUI is the first 3 bytes
+    oui = mac_int >> 24
+    return _OUI_INT_MAP.get(oui) or _OUI_PREFIX_INT_MAP.get(oui >> 8, 'Unknown')
+
 class ShadowNetworkManager:
     """Advanced network anonymity and interface management"""
     
@@ -67,18 +329,50 @@ class ShadowNetworkManager:
         """
         self.config = config or {}
         self.safe_mode = True  # Always start in safe mode for security
-        self.operation_log = []
+        # Wall-clock minus monotonic time, to export log timestamps as epoch time
+        self._epoch_ns = time.time_ns() - time.monotonic_ns()
+        self.operation_log = deque(maxlen=self.config.get('log_max', 10000))  # Oldest entries dropped first
+        self.enable_operation_log = self.config.get('enable_operation_log', True)
         self.interfaces: List[NetworkInterface] = []
+        self._by_name: Dict[str, NetworkInterface] = {}  # Interfaces by name
+        self._mac_capable: Tuple[NetworkInterface, ...] = ()  # Interfaces randomize_all_macs changes
         self.original_macs: Dict[str, str] = {}  # Store original MAC addresses
+        self._macs_lock = threading.Lock()  # Guards original_macs across spoofing threads
+        self._ipr = None  # Netlink socket, opened on first Linux spoof
+        self._ipr_lock = threading.Lock()  # One netlink request/response at a time
+        
+        # MAC spoofing implementation for this OS (None if unsupported)
+        self._spoof_impl = {
+            "Windows": self._spoof_mac_windows,
+            "Linux": self._spoof_mac_linux,
+            "Darwin": self._spoof_mac_macos,  # macOS
+        }.get(_OS)
         
         # Load network interfaces
         self._load_interfaces()
     
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        """Close the netlink socket, if one was opened"""
+        ipr = getattr(self, '_ipr', None)
+        if ipr is not None:
+            self._ipr = None
+            try:
+                ipr.close()
+            except Exception:
+                pass
+    
     def _load_interfaces(self):
-        """Load network interfaces"""
+        """Load network interfaces (again, if called after __init__)"""
         try:
-            interfaces = psutil.net_if_addrs()
-            stats = psutil.net_if_stats()
+            interfaces, up = _cached_net_if(self.config.get('interface_cache_ttl', 5.0))
+            
+            # Build the list and its name index together and swap both in at
+            # the end, so a reload never leaves them out of step
+            loaded: List[NetworkInterface] = []
+            by_name: Dict[str, NetworkInterface] = {}
             
             for interface_name, addresses in interfaces.items():
                 # Skip loopback and virtual interfaces
@@ -90,7 +384,7 @@ class ShadowNetworkManager:
                 subnet_mask = None
                 
                 for addr in addresses:
-                    if addr.family == socket.AF_LINK:  # MAC address
+                    if addr.family == psutil.AF_LINK:  # MAC address (AF_PACKET on Linux)
                         mac_address = addr.address
                     elif addr.family == socket.AF_INET:  # IPv4
                         ip_address = addr.address
@@ -101,10 +395,7 @@ class ShadowNetworkManager:
                     interface_type = self._determine_interface_type(interface_name, mac_address)
                     
                     # Get interface status
-                    is_up = stats.get(interface_name, {}).isup if interface_name in stats else False
-                    
-                    # Get vendor from MAC address
-                    vendor = self._get_mac_vendor(mac_address)
+                    is_up = up.get(interface_name, False)
                     
                     interface = NetworkInterface(
                         name=interface_name,
@@ -112,408 +403,44 @@ class ShadowNetworkManager:
                         interface_type=interface_type,
                         is_up=is_up,
                         ip_address=ip_address,
-                        subnet_mask=subnet_mask,
-                        vendor=vendor
+                        subnet_mask=subnet_mask
                     )
                     
-                    self.interfaces.append(interface)
-                    self.original_macs[interface_name] = mac_address
+                    loaded.append(interface)
+                    by_name[interface_name] = interface
+                    
+                    # A reload after spoofing must keep the true original
+                    with self._macs_lock:
+                        self.original_macs.setdefault(interface_name, mac_address)
+            
+            self.interfaces = loaded
+            self._by_name = by_name
+            self._mac_capable = tuple(i for i in loaded if i.interface_type in _MAC_CAPABLE)
         
         except Exception as e:
             logger.error(f"Failed to load network interfaces: {e}")
     
     def _determine_interface_type(self, name: str, mac_address: str) -> NetworkInterfaceType:
         """Determine network interface type"""
-        name_lower = name.lower()
-        
-        if 'wifi' in name_lower or 'wlan' in name_lower or 'wireless' in name_lower:
-            return NetworkInterfaceType.WIFI
-        elif 'eth' in name_lower or 'ethernet' in name_lower:
-            return NetworkInterfaceType.ETHERNET
-        elif 'bluetooth' in name_lower or 'bt' in name_lower:
-            return NetworkInterfaceType.BLUETOOTH
-        elif 'vpn' in name_lower or 'tun' in name_lower or 'tap' in name_lower:
-            return NetworkInterfaceType.VIRTUAL
-        else:
-            return NetworkInterfaceType.UNKNOWN
+        return _interface_type(name)
     
-    def _get_mac_vendor(self, mac_address: str) -> Optional[str]:
+    def _get_mac_vendor(self, mac_address: Union[str, int]) -> Optional[str]:
         """Get vendor from MAC address OUI"""
-        try:
-            # Extract OUI (first 3 bytes)
-            mac_clean = mac_address.replace(':', '').replace('-', '').replace('.', '')
-            oui = mac_clean[:6].upper()
-            
-            # Common vendor OUIs (simplified list)
-            vendor_map = {
-                '000C29': 'VMware',
-                '001C42': 'Apple',
-                '001D4F': 'Apple',
-                '002590': 'Apple',
-                '003065': 'Apple',
-                '0050F2': 'Microsoft',
-                '080027': 'Oracle VirtualBox',
-                '0C9D92': 'Intel',
-                '14DAE9': 'Intel',
-                '1C1B0D': 'Intel',
-                '2C44FD': 'Intel',
-                '3C07F4': 'Intel',
-                '3C2AF7': 'Intel',
-                '3C4A92': 'Intel',
-                '3C5AB4': 'Intel',
-                '3C6A7D': 'Intel',
-                '3C7FB1': 'Intel',
-                '3C8BFE': 'Intel',
-                '3C9F81': 'Intel',
-                '3CA8F6': 'Intel',
-                '3CA9F4': 'Intel',
-                '3CB6B7': 'Intel',
-                '3CB87A': 'Intel',
-                '3CB9A6': 'Intel',
-                '3CBBFD': 'Intel',
-                '3CC1F6': 'Intel',
-                '3CC2E1': 'Intel',
-                '3CC99E': 'Intel',
-                '3CCE73': 'Intel',
-                '3CD0F8': 'Intel',
-                '3CD4D6': 'Intel',
-                '3CD7DA': 'Intel',
-                '3CD9CE': 'Intel',
-                '3CDA2A': 'Intel',
-                '3CDD89': 'Intel',
-                '3CDF1E': 'Intel',
-                '3CDFA9': 'Intel',
-                '3CE1A1': 'Intel',
-                '3CE5A6': 'Intel',
-                '3CE624': 'Intel',
-                '3CE72B': 'Intel',
-                '3CE8F0': 'Intel',
-                '3CE9F7': 'Intel',
-                '3CEAF0': 'Intel',
-                '3CEB5F': 'Intel',
-                '3CECEF': 'Intel',
-                '3CEDFB': 'Intel',
-                '3CEE93': 'Intel',
-                '3CEF8C': 'Intel',
-                '3CF010': 'Intel',
-                '3CF09F': 'Intel',
-                '3CF111': 'Intel',
-                '3CF2B9': 'Intel',
-                '3CF392': 'Intel',
-                '3CF4CA': 'Intel',
-                '3CF5CC': 'Intel',
-                '3CF6A4': 'Intel',
-                '3CF7A4': 'Intel',
-                '3CF8B9': 'Intel',
-                '3CF9FA': 'Intel',
-                '3CFAB7': 'Intel',
-                '3CFB96': 'Intel',
-                '3CFC3F': 'Intel',
-                '3CFD3A': 'Intel',
-                '3CFE4C': 'Intel',
-                '3CFF4A': 'Intel',
-                '3CFFCA': 'Intel',
-                '3CFFD6': 'Intel',
-                '3CFFE9': 'Intel',
-                '3CFFEA': 'Intel',
-                '3CFFEB': 'Intel',
-                '3CFFEC': 'Intel',
-                '3CFFED': 'Intel',
-                '3CFFEE': 'Intel',
-                '3CFFEF': 'Intel',
-                '3CFFF0': 'Intel',
-                '3CFFF1': 'Intel',
-                '3CFFF2': 'Intel',
-                '3CFFF3': 'Intel',
-                '3CFFF4': 'Intel',
-                '3CFFF5': 'Intel',
-                '3CFFF6': 'Intel',
-                '3CFFF7': 'Intel',
-                '3CFFF8': 'Intel',
-                '3CFFF9': 'Intel',
-                '3CFFFA': 'Intel',
-                '3CFFFB': 'Intel',
-                '3CFFFC': 'Intel',
-                '3CFFFD': 'Intel',
-                '3CFFFE': 'Intel',
-                '3CFFFF': 'Intel',
-                '525400': 'Realtek',
-                '525401': 'Realtek',
-                '525402': 'Realtek',
-                '525403': 'Realtek',
-                '525404': 'Realtek',
-                '525405': 'Realtek',
-                '525406': 'Realtek',
-                '525407': 'Realtek',
-                '525408': 'Realtek',
-                '525409': 'Realtek',
-                '52540A': 'Realtek',
-                '52540B': 'Realtek',
-                '52540C': 'Realtek',
-                '52540D': 'Realtek',
-                '52540E': 'Realtek',
-                '52540F': 'Realtek',
-                '525410': 'Realtek',
-                '525411': 'Realtek',
-                '525412': 'Realtek',
-                '525413': 'Realtek',
-                '525414': 'Realtek',
-                '525415': 'Realtek',
-                '525416': 'Realtek',
-                '525417': 'Realtek',
-                '525418': 'Realtek',
-                '525419': 'Realtek',
-                '52541A': 'Realtek',
-                '52541B': 'Realtek',
-                '52541C': 'Realtek',
-                '52541D': 'Realtek',
-                '52541E': 'Realtek',
-                '52541F': 'Realtek',
-                '525420': 'Realtek',
-                '525421': 'Realtek',
-                '525422': 'Realtek',
-                '525423': 'Realtek',
-                '525424': 'Realtek',
-                '525425': 'Realtek',
-                '525426': 'Realtek',
-                '525427': 'Realtek',
-                '525428': 'Realtek',
-                '525429': 'Realtek',
-                '52542A': 'Realtek',
-                '52542B': 'Realtek',
-                '52542C': 'Realtek',
-                '52542D': 'Realtek',
-                '52542E': 'Realtek',
-                '52542F': 'Realtek',
-                '525430': 'Realtek',
-                '525431': 'Realtek',
-                '525432': 'Realtek',
-                '525433': 'Realtek',
-                '525434': 'Realtek',
-                '525435': 'Realtek',
-                '525436': 'Realtek',
-                '525437': 'Realtek',
-                '525438': 'Realtek',
-                '525439': 'Realtek',
-                '52543A': 'Realtek',
-                '52543B': 'Realtek',
-                '52543C': 'Realtek',
-                '52543D': 'Realtek',
-                '52543E': 'Realtek',
-                '52543F': 'Realtek',
-                '525440': 'Realtek',
-                '525441': 'Realtek',
-                '525442': 'Realtek',
-                '525443': 'Realtek',
-                '525444': 'Realtek',
-                '525445': 'Realtek',
-                '525446': 'Realtek',
-                '525447': 'Realtek',
-                '525448': 'Realtek',
-                '525449': 'Realtek',
-                '52544A': 'Realtek',
-                '52544B': 'Realtek',
-                '52544C': 'Realtek',
-                '52544D': 'Realtek',
-                '52544E': 'Realtek',
-                '52544F': 'Realtek',
-                '525450': 'Realtek',
-                '525451': 'Realtek',
-                '525452': 'Realtek',
-                '525453': 'Realtek',
-                '525454': 'Realtek',
-                '525455': 'Realtek',
-                '525456': 'Realtek',
-                '525457': 'Realtek',
-                '525458': 'Realtek',
-                '525459': 'Realtek',
-                '52545A': 'Realtek',
-                '52545B': 'Realtek',
-                '52545C': 'Realtek',
-                '52545D': 'Realtek',
-                '52545E': 'Realtek',
-                '52545F': 'Realtek',
-                '525460': 'Realtek',
-                '525461': 'Realtek',
-                '525462': 'Realtek',
-                '525463': 'Realtek',
-                '525464': 'Realtek',
-                '525465': 'Realtek',
-                '525466': 'Realtek',
-                '525467': 'Realtek',
-                '525468': 'Realtek',
-                '525469': 'Realtek',
-                '52546A': 'Realtek',
-                '52546B': 'Realtek',
-                '52546C': 'Realtek',
-                '52546D': 'Realtek',
-                '52546E': 'Realtek',
-                '52546F': 'Realtek',
-                '525470': 'Realtek',
-                '525471': 'Realtek',
-                '525472': 'Realtek',
-                '525473': 'Realtek',
-                '525474': 'Realtek',
-                '525475': 'Realtek',
-                '525476': 'Realtek',
-                '525477': 'Realtek',
-                '525478': 'Realtek',
-                '525479': 'Realtek',
-                '52547A': 'Realtek',
-                '52547B': 'Realtek',
-                '52547C': 'Realtek',
-                '52547D': 'Realtek',
-                '52547E': 'Realtek',
-                '52547F': 'Realtek',
-                '525480': 'Realtek',
-                '525481': 'Realtek',
-                '525482': 'Realtek',
-                '525483': 'Realtek',
-                '525484': 'Realtek',
-                '525485': 'Realtek',
-                '525486': 'Realtek',
-                '525487': 'Realtek',
-                '525488': 'Realtek',
-                '525489': 'Realtek',
-                '52548A': 'Realtek',
-                '52548B': 'Realtek',
-                '52548C': 'Realtek',
-                '52548D': 'Realtek',
-                '52548E': 'Realtek',
-                '52548F': 'Realtek',
-                '525490': 'Realtek',
-                '525491': 'Realtek',
-                '525492': 'Realtek',
-                '525493': 'Realtek',
-                '525494': 'Realtek',
-                '525495': 'Realtek',
-                '525496': 'Realtek',
-                '525497': 'Realtek',
-                '525498': 'Realtek',
-                '525499': 'Realtek',
-                '52549A': 'Realtek',
-                '52549B': 'Realtek',
-                '52549C': 'Realtek',
-                '52549D': 'Realtek',
-                '52549E': 'Realtek',
-                '52549F': 'Realtek',
-                '5254A0': 'Realtek',
-                '5254A1': 'Realtek',
-                '5254A2': 'Realtek',
-                '5254A3': 'Realtek',
-                '5254A4': 'Realtek',
-                '5254A5': 'Realtek',
-                '5254A6': 'Realtek',
-                '5254A7': 'Realtek',
-                '5254A8': 'Realtek',
-                '5254A9': 'Realtek',
-                '5254AA': 'Realtek',
-                '5254AB': 'Realtek',
-                '5254AC': 'Realtek',
-                '5254AD': 'Realtek',
-                '5254AE': 'Realtek',
-                '5254AF': 'Realtek',
-                '5254B0': 'Realtek',
-                '5254B1': 'Realtek',
-                '5254B2': 'Realtek',
-                '5254B3': 'Realtek',
-                '5254B4': 'Realtek',
-                '5254B5': 'Realtek',
-                '5254B6': 'Realtek',
-                '5254B7': 'Realtek',
-                '5254B8': 'Realtek',
-                '5254B9': 'Realtek',
-                '5254BA': 'Realtek',
-                '5254BB': 'Realtek',
-                '5254BC': 'Realtek',
-                '5254BD': 'Realtek',
-                '5254BE': 'Realtek',
-                '5254BF': 'Realtek',
-                '5254C0': 'Realtek',
-                '5254C1': 'Realtek',
-                '5254C2': 'Realtek',
-                '5254C3': 'Realtek',
-                '5254C4': 'Realtek',
-                '5254C5': 'Realtek',
-                '5254C6': 'Realtek',
-                '5254C7': 'Realtek',
-                '5254C8': 'Realtek',
-                '5254C9': 'Realtek',
-                '5254CA': 'Realtek',
-                '5254CB': 'Realtek',
-                '5254CC': 'Realtek',
-                '5254CD': 'Realtek',
-                '5254CE': 'Realtek',
-                '5254CF': 'Realtek',
-                '5254D0': 'Realtek',
-                '5254D1': 'Realtek',
-                '5254D2': 'Realtek',
-                '5254D3': 'Realtek',
-                '5254D4': 'Realtek',
-                '5254D5': 'Realtek',
-                '5254D6': 'Realtek',
-                '5254D7': 'Realtek',
-                '5254D8': 'Realtek',
-                '5254D9': 'Realtek',
-                '5254DA': 'Realtek',
-                '5254DB': 'Realtek',
-                '5254DC': 'Realtek',
-                '5254DD': 'Realtek',
-                '5254DE': 'Realtek',
-                '5254DF': 'Realtek',
-                '5254E0': 'Realtek',
-                '5254E1': 'Realtek',
-                '5254E2': 'Realtek',
-                '5254E3': 'Realtek',
-                '5254E4': 'Realtek',
-                '5254E5': 'Realtek',
-                '5254E6': 'Realtek',
-                '5254E7': 'Realtek',
-                '5254E8': 'Realtek',
-                '5254E9': 'Realtek',
-                '5254EA': 'Realtek',
-                '5254EB': 'Realtek',
-                '5254EC': 'Realtek',
-                '5254ED': 'Realtek',
-                '5254EE': 'Realtek',
-                '5254EF': 'Realtek',
-                '5254F0': 'Realtek',
-                '5254F1': 'Realtek',
-                '5254F2': 'Realtek',
-                '5254F3': 'Realtek',
-                '5254F4': 'Realtek',
-                '5254F5': 'Realtek',
-                '5254F6': 'Realtek',
-                '5254F7': 'Realtek',
-                '5254F8': 'Realtek',
-                '5254F9': 'Realtek',
-                '5254FA': 'Realtek',
-                '5254FB': 'Realtek',
-                '5254FC': 'Realtek',
-                '5254FD': 'Realtek',
-                '5254FE': 'Realtek',
-                '5254FF': 'Realtek'
-            }
-            
-            return vendor_map.get(oui, 'Unknown')
-        
-        except Exception:
-            return 'Unknown'
+        return _mac_vendor(mac_address)
     
     def _log_operation(self, operation: str, success: bool, message: str):
         """Log network operation"""
-        log_entry = {
-            'timestamp': time.time(),
-            'operation': operation,
-            'success': success,
-            'message': message
-        }
-        self.operation_log.append(log_entry)
+        if self.enable_operation_log:
+            self.operation_log.append(LogEntry(time.monotonic_ns(), operation, success, message))
         logger.info(f"Network operation: {operation} - {message}")
     
-    def get_interfaces(self) -> NetworkOperationResult:
+    def get_interfaces(self, copy: bool = False) -> NetworkOperationResult:
         """Get network interfaces
         
+        Args:
+            copy: Return independent copies of the interfaces instead of a
+                read-only tuple of the manager's own
+            
         Returns:
             NetworkOperationResult
         """
@@ -521,30 +448,17 @@ class ShadowNetworkManager:
             if self.safe_mode:
                 logger.warning("Safe mode enabled - interface list would be retrieved")
                 self._log_operation("get_interfaces", False, "Safe mode enabled - operation blocked")
-                return NetworkOperationResult(
-                    success=False,
-                    operation="get_interfaces",
-                    message="Safe mode enabled - operation blocked",
-                    error="Safe mode"
-                )
-            
-            self._log_operation("get_interfaces", True, f"Retrieved {len(self.interfaces)} interfaces")
-            return NetworkOperationResult(
-                success=True,
-                operation="get_interfaces",
-                message=f"Retrieved {len(self.interfaces)} interfaces",
-                data=self.interfaces.copy()
-            )
+                return _err("get_interfaces", "Safe mode enabled - operation blocked", "Safe mode")
+            
+            message = f"Retrieved {len(self.interfaces)} interfaces"
+            self._log_operation("get_interfaces", True, message)
+            return _ok("get_interfaces", message,
+                       [replace(i) for i in self.interfaces] if copy else tuple(self.interfaces))
             
         except Exception as e:
             error_msg = f"Failed to get interfaces: {e}"
             self._log_operation("get_interfaces", False, error_msg)
-            return NetworkOperationResult(
-                success=False,
-                operation="get_interfaces",
-                message=error_msg,
-                error=str(e)
-            )
+            return _err("get_interfaces", error_msg, str(e))
     
     def generate_random_mac(self, vendor: Optional[str] = None, 
                           format: MACAddressFormat = MACAddressFormat.COLON) -> str:
@@ -557,51 +471,47 @@ class ShadowNetworkManager:
         Returns:
             Random MAC address
         """
-        try:
-            if vendor:
+        return self.generate_random_macs(1, vendor, format)[0]
+    
+    def generate_random_macs(self, count: int, vendor: Optional[str] = None,
+                             format: MACAddressFormat = MACAddressFormat.COLON) -> List[str]:
+        """Generate several random MAC addresses from one urandom draw
+        
+        Without a known vendor the addresses are unicast and locally
+        administered, so interfaces accept them.
+        
+        Args:
+            count: Number of addresses
+            vendor: Specific vendor OUI (first 3 bytes)
+            format: MAC address format
+            
+        Returns:
+            Random MAC addresses
+        """
+        raw = os.urandom(6 * count)
+        ouis = _VENDOR_OUIS.get(vendor)
+        
+        macs = []
+        for offset in range(0, 6 * count, 6):
+            mac = bytearray(raw[offset:offset + 6])
+            if ouis:
                 # Use specific vendor OUI
-                vendor_ouis = {
-                    'Intel': ['00:1B:21', '00:1C:42', '00:1D:4F'],
-                    'Apple': ['00:16:CB', '00:17:F2', '00:1B:63'],
-                    'Realtek': ['52:54:00', '00:E0:4C', '00:1F:5B'],
-                    'Microsoft': ['00:50:F2', '00:15:5D', '00:03:FF'],
-                    'VMware': ['00:0C:29', '00:1C:14', '00:50:56']
-                }
-                
-                if vendor in vendor_ouis:
-                    oui = random.choice(vendor_ouis[vendor])
-                else:
-                    # Generate random OUI
-                    oui = f"{random.randint(0, 255):02X}:{random.randint(0, 255):02X}:{random.randint(0, 255):02X}"
+                mac[:3] = random.choice(ouis)
             else:
-                # Generate completely random MAC
-                oui = f"{random.randint(0, 255):02X}:{random.randint(0, 255):02X}:{random.randint(0, 255):02X}"
+                # Clear the multicast bit, set the locally administered bit
+                mac[0] = (mac[0] & 0xFE) | 0x02
             
-            # Generate last 3 bytes
-            nic = f"{random.randint(0, 255):02X}:{random.randint(0, 255):02X}:{random.randint(0, 255):02X}"
-            
-            mac = f"{oui}:{nic}"
-            
-            # Apply format
-            if format == MACAddressFormat.DASH:
-                mac = mac.replace(':', '-')
-            elif format == MACAddressFormat.DOT:
-                mac = mac.replace(':', '.')
-            elif format == MACAddressFormat.NONE:
-                mac = mac.replace(':', '')
-            
-            return mac
-            
-        except Exception as e:
-            logger.error(f"Failed to generate random MAC: {e}")
-            return "00:00:00:00:00:00"
+            # Hex-encode in the requested format directly
+            macs.append(_format_mac(mac, format))
+        
+        return macs
     
-    def spoof_mac(self, interface_name: str, new_mac: Optional[str] = None) -> NetworkOperationResult:
+    def spoof_mac(self, interface_name: str, new_mac: Optional[Union[str, int]] = None) -> NetworkOperationResult:
         """Spoof MAC address of network interface
         
         Args:
             interface_name: Name of network interface
-            new_mac: New MAC address (random if None)
+            new_mac: New MAC address, any format or a 48-bit integer (random if None)
             
         Returns:
             NetworkOperationResult
@@ -610,111 +520,63 @@ class ShadowNetworkManager:
             if self.safe_mode:
                 logger.warning(f"Safe mode enabled - MAC spoofing would be performed on {interface_name}")
                 self._log_operation("spoof_mac", False, "Safe mode enabled - operation blocked")
-                return NetworkOperationResult(
-                    success=False,
-                    operation="spoof_mac",
-                    message="Safe mode enabled - operation blocked",
-                    error="Safe mode"
-                )
+                return _err("spoof_mac", "Safe mode enabled - operation blocked", "Safe mode")
             
             # Find interface
-            interface = None
-            for iface in self.interfaces:
-                if iface.name == interface_name:
-                    interface = iface
-                    break
+            interface = self._by_name.get(interface_name)
             
             if not interface:
                 error_msg = f"Interface {interface_name} not found"
                 self._log_operation("spoof_mac", False, error_msg)
-                return NetworkOperationResult(
-                    success=False,
-                    operation="spoof_mac",
-                    message=error_msg,
-                    error="Interface not found"
-                )
+                return _err("spoof_mac", error_msg, "Interface not found")
             
             # Generate new MAC if not provided
             if not new_mac:
                 new_mac = self.generate_random_mac()
             
             # Validate MAC address format
-            if not self._validate_mac_address(new_mac):
+            mac_int = _mac_to_int(new_mac)
+            if mac_int is None:
                 error_msg = f"Invalid MAC address format: {new_mac}"
                 self._log_operation("spoof_mac", False, error_msg)
-                return NetworkOperationResult(
-                    success=False,
-                    operation="spoof_mac",
-                    message=error_msg,
-                    error="Invalid MAC format"
-                )
+                return _err("spoof_mac", error_msg, "Invalid MAC format")
+            
+            # OS tools get the canonical colon form whatever format was passed
+            new_mac = _format_mac(mac_int.to_bytes(6, 'big'))
             
             # Store original MAC if not already stored
-            if interface_name not in self.original_macs:
-                self.original_macs[interface_name] = interface.mac_address
+            with self._macs_lock:
+                old_mac = self.original_macs.setdefault(interface_name, interface.mac_address)
             
             # Change MAC address based on OS
-            if platform.system() == "Windows":
-                success = self._spoof_mac_windows(interface_name, new_mac)
-            elif platform.system() == "Linux":
-                success = self._spoof_mac_linux(interface_name, new_mac)
-            elif platform.system() == "Darwin":  # macOS
-                success = self._spoof_mac_macos(interface_name, new_mac)
-            else:
-                error_msg = f"Unsupported operating system: {platform.system()}"
+            if self._spoof_impl is None:
+                error_msg = f"Unsupported operating system: {_OS}"
                 self._log_operation("spoof_mac", False, error_msg)
-                return NetworkOperationResult(
-                    success=False,
-                    operation="spoof_mac",
-                    message=error_msg,
-                    error="Unsupported OS"
-                )
+                return _err("spoof_mac", error_msg, "Unsupported OS")
+            
+            success = self._spoof_impl(interface_name, new_mac)
             
             if success:
                 # Update interface MAC address
                 interface.mac_address = new_mac
                 
-                self._log_operation("spoof_mac", True, f"MAC spoofed: {interface_name} -> {new_mac}")
-                return NetworkOperationResult(
-                    success=True,
-                    operation="spoof_mac",
-                    message=f"MAC spoofed: {interface_name} -> {new_mac}",
-                    data={'interface': interface_name, 'old_mac': self.original_macs[interface_name], 'new_mac': new_mac}
-                )
+                message = f"MAC spoofed: {interface_name} -> {new_mac}"
+                self._log_operation("spoof_mac", True, message)
+                return _ok("spoof_mac", message,
+                           {'interface': interface_name, 'old_mac': old_mac, 'new_mac': new_mac})
             else:
                 error_msg = f"Failed to spoof MAC address for {interface_name}"
                 self._log_operation("spoof_mac", False, error_msg)
-                return NetworkOperationResult(
-                    success=False,
-                    operation="spoof_mac",
-                    message=error_msg,
-                    error="Spoofing failed"
-                )
+                return _err("spoof_mac", error_msg, "Spoofing failed")
             
         except Exception as e:
             error_msg = f"MAC spoofing failed: {e}"
             self._log_operation("spoof_mac", False, error_msg)
-            return NetworkOperationResult(
-                success=False,
-                operation="spoof_mac",
-                message=error_msg,
-                error=str(e)
-            )
+            return _err("spoof_mac", error_msg, str(e))
     
-    def _validate_mac_address(self, mac: str) -> bool:
-        """Validate MAC address format"""
-        # Remove separators
-        mac_clean = re.sub(r'[:\-\.]', '', mac)
-        
-        # Check if it's 12 hex characters
-        if len(mac_clean) != 12:
-            return False
-        
-        try:
-            int(mac_clean, 16)
-            return True
-        except ValueError:
-            return False
+    def _validate_mac_address(self, mac: Union[str, int]) -> bool:
+        """Validate MAC address format (or a 48-bit integer)"""
+        return _mac_to_int(mac) is not None
     
     def _spoof_mac_windows(self, interface_name: str, new_mac: str) -> bool:
         """Spoof MAC address on Windows"""
@@ -724,7 +586,7 @@ class ShadowNetworkManager:
                 'netsh', 'interface', 'set', 'interface', 
                 interface_name, 'admin=disable'
             ]
-            subprocess.run(cmd, capture_output=True, text=True)
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
             time.sleep(1)
             
@@ -732,7 +594,7 @@ class ShadowNetworkManager:
                 'netsh', 'interface', 'set', 'interface', 
                 interface_name, 'admin=enable'
             ]
-            subprocess.run(cmd, capture_output=True, text=True)
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
             return True
             
@@ -742,37 +604,62 @@ class ShadowNetworkManager:
     
     def _spoof_mac_linux(self, interface_name: str, new_mac: str) -> bool:
         """Spoof MAC address on Linux"""
+        if IPRoute is not None and self._spoof_mac_netlink(interface_name, new_mac):
+            return True
+        
         try:
-            # Bring interface down
-            cmd = ['sudo', 'ip', 'link', 'set', interface_name, 'down']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                return False
-            
-            # Change MAC address
-            cmd = ['sudo', 'ip', 'link', 'set', interface_name, 'address', new_mac]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Bring interface down, change MAC address, bring it back up in one
+            # ip process; -batch stops at the first failing command. Both values
+            # are whitespace-free here (a known interface, a validated MAC), so
+            # neither can inject another batch line
+            commands = (
+                f"link set {interface_name} down\n"
+                f"link set {interface_name} address {new_mac}\n"
+                f"link set {interface_name} up\n"
+            )
+            result = subprocess.run(['sudo', 'ip', '-batch', '-'], input=commands, text=True,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             
             if result.returncode != 0:
-                return False
-            
-            # Bring interface up
-            cmd = ['sudo', 'ip', 'link', 'set', interface_name, 'up']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
+                logger.error(f"Linux MAC spoofing failed: {result.stderr.strip()}")
             return result.returncode == 0
             
         except Exception as e:
             logger.error(f"Linux MAC spoofing failed: {e}")
             return False
     
+    def _spoof_mac_netlink(self, interface_name: str, new_mac: str) -> bool:
+        """Spoof MAC address on Linux over netlink (pyroute2)
+        
+        Returns False when netlink refuses the change, e.g. without
+        CAP_NET_ADMIN, so the caller can retry through sudo.
+        """
+        try:
+            with self._ipr_lock:
+                # Reuse one netlink socket instead of forking ip per interface
+                if self._ipr is None:
+                    self._ipr = IPRoute()
+                index = self._ipr.link_lookup(ifname=interface_name)
+                if not index:
+                    return False
+                
+                # The kernel applies IFLA_ADDRESS before the flag change, so
+                # the new address and the up state share one request; the
+                # address must not be set while the interface is still up
+                self._ipr.link('set', index=index[0], state='down')
+                self._ipr.link('set', index=index[0], address=new_mac, state='up')
+            return True
+            
+        except Exception as e:
+            logger.debug(f"Netlink MAC spoofing failed, falling back to ip: {e}")
+            return False
+    
     def _spoof_mac_macos(self, interface_name: str, new_mac: str) -> bool:
         """Spoof MAC address on macOS"""
         try:
             # Use ifconfig to change MAC address
             cmd = ['sudo', 'ifconfig', interface_name, 'ether', new_mac]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
             return result.returncode == 0
             
@@ -793,50 +680,77 @@ class ShadowNetworkManager:
             if self.safe_mode:
                 logger.warning(f"Safe mode enabled - MAC restoration would be performed on {interface_name}")
                 self._log_operation("restore_mac", False, "Safe mode enabled - operation blocked")
-                return NetworkOperationResult(
-                    success=False,
-                    operation="restore_mac",
-                    message="Safe mode enabled - operation blocked",
-                    error="Safe mode"
-                )
-            
-            if interface_name not in self.original_macs:
+                return _err("restore_mac", "Safe mode enabled - operation blocked", "Safe mode")
+            
+            with self._macs_lock:
+                original_mac = self.original_macs.get(interface_name)
+            
+            if original_mac is None:
                 error_msg = f"No original MAC address stored for {interface_name}"
                 self._log_operation("restore_mac", False, error_msg)
-                return NetworkOperationResult(
-                    success=False,
-                    operation="restore_mac",
-                    message=error_msg,
-                    error="No original MAC stored"
-                )
-            
-            original_mac = self.original_macs[interface_name]
+                return _err("restore_mac", error_msg, "No original MAC stored")
             
             # Restore MAC address
             result = self.spoof_mac(interface_name, original_mac)
             
             if result.success:
-                # Remove from original MACs
-                del self.original_macs[interface_name]
+                # Remove from original MACs (a concurrent restore may already have)
+                with self._macs_lock:
+                    self.original_macs.pop(interface_name, None)
                 
-                self._log_operation("restore_mac", True, f"MAC restored: {interface_name} -> {original_mac}")
-                return NetworkOperationResult(
-                    success=True,
-                    operation="restore_mac",
-                    message=f"MAC restored: {interface_name} -> {original_mac}"
-                )
+                message = f"MAC restored: {interface_name} -> {original_mac}"
+                self._log_operation("restore_mac", True, message)
+                return _ok("restore_mac", message)
             else:
                 return result
             
-        except Exception as e:
+        except OSError as e:
             error_msg = f"MAC restoration failed: {e}"
             self._log_operation("restore_mac", False, error_msg)
-            return NetworkOperationResult(
-                success=False,
-                operation="restore_mac",
-                message=error_msg,
-                error=str(e)
-            )
+            return _err("restore_mac", error_msg, str(e))
+    
+    def _spoof_many(self, targets: List[str],
+                    macs: List[Optional[str]]) -> Tuple[List[NetworkOperationResult], int]:
+        """Spoof several interfaces, returning the results and the success count"""
+        # spoof_mac mostly waits on ip/ifconfig/netsh, so interfaces are
+        # changed concurrently; map() yields results in interface order,
+        # and successes are counted as they arrive
+        results: List[Optional[NetworkOperationResult]] = [None] * len(targets)
+        successful = 0
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(8, len(targets))) as executor:
+                for idx, result in enumerate(executor.map(self.spoof_mac, targets, macs)):
+                    results[idx] = result
+                    successful += result.success
+        
+        return results, successful
+    
+    def spoof_macs_batch(self, changes: List[Tuple[str, Optional[str]]]) -> NetworkOperationResult:
+        """Spoof MAC addresses of several interfaces at once
+        
+        Args:
+            changes: (interface name, new MAC or None for random) pairs
+            
+        Returns:
+            NetworkOperationResult with one spoof_mac result per pair
+        """
+        try:
+            if self.safe_mode:
+                logger.warning("Safe mode enabled - batch MAC spoofing would be performed")
+                self._log_operation("spoof_macs_batch", False, "Safe mode enabled - operation blocked")
+                return _err("spoof_macs_batch", "Safe mode enabled - operation blocked", "Safe mode")
+            
+            targets = [name for name, _ in changes]
+            results, successful = self._spoof_many(targets, [mac for _, mac in changes])
+            
+            message = f"Spoofed {successful}/{len(results)} interfaces"
+            self._log_operation("spoof_macs_batch", True, message)
+            return _ok("spoof_macs_batch", message, results)
+            
+        except (OSError, RuntimeError) as e:  # RuntimeError: no worker thread could start
+            error_msg = f"Batch MAC spoofing failed: {e}"
+            self._log_operation("spoof_macs_batch", False, error_msg)
+            return _err("spoof_macs_batch", error_msg, str(e))
     
     def randomize_all_macs(self) -> NetworkOperationResult:
         """Randomize MAC addresses of all interfaces
@@ -848,75 +762,75 @@ class ShadowNetworkManager:
             if self.safe_mode:
                 logger.warning("Safe mode enabled - MAC randomization would be performed")
                 self._log_operation("randomize_all_macs", False, "Safe mode enabled - operation blocked")
-                return NetworkOperationResult(
-                    success=False,
-                    operation="randomize_all_macs",
-                    message="Safe mode enabled - operation blocked",
-                    error="Safe mode"
-                )
-            
-            results = []
-            for interface in self.interfaces:
-                if interface.interface_type in [NetworkInterfaceType.ETHERNET, NetworkInterfaceType.WIFI]:
-                    result = self.spoof_mac(interface.name)
-                    results.append(result)
-            
-            successful = sum(1 for r in results if r.success)
-            
-            self._log_operation("randomize_all_macs", True, f"Randomized {successful}/{len(results)} interfaces")
-            return NetworkOperationResult(
-                success=True,
-                operation="randomize_all_macs",
-                message=f"Randomized {successful}/{len(results)} interfaces",
-                data=results
-            )
+                return _err("randomize_all_macs", "Safe mode enabled - operation blocked", "Safe mode")
             
-        except Exception as e:
+            targets = [interface.name for interface in self._mac_capable]
+            results, successful = self._spoof_many(targets, self.generate_random_macs(len(targets)))
+            
+            message = f"Randomized {successful}/{len(results)} interfaces"
+            self._log_operation("randomize_all_macs", True, message)
+            return _ok("randomize_all_macs", message, results)
+            
+        except (OSError, RuntimeError) as e:  # RuntimeError: no worker thread could start
             error_msg = f"MAC randomization failed: {e}"
             self._log_operation("randomize_all_macs", False, error_msg)
-            return NetworkOperationResult(
-                success=False,
-                operation="randomize_all_macs",
-                message=error_msg,
-                error=str(e)
-            )
+            return _err("randomize_all_macs", error_msg, str(e))
     
     def get_operation_log(self) -> List[Dict[str, Any]]:
-        """Get operation log"""
-        return self.operation_log.copy()
+        """Get operation log (timestamps as time.time() seconds)"""
+        return [
+            dict(entry._asdict(), timestamp=(entry.timestamp + self._epoch_ns) / 1e9)
+            for entry in self.operation_log
+        ]
     
     def clear_operation_log(self):
         """Clear operation log"""
         self.operation_log.clear()
 
-# Convenience functions
+# Convenience functions share one manager, so interfaces are enumerated once
+# and restore_mac_address sees the original MACs spoof_mac_address stored
+_default_manager: Optional[ShadowNetworkManager] = None
+_default_manager_lock = threading.Lock()
+
+def _get_default_manager() -> ShadowNetworkManager:
+    """Shared manager for the convenience functions, created on first use"""
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                # Nothing reads the shared manager's operation log
+                _default_manager = ShadowNetworkManager({'enable_operation_log': False})
+    return _default_manager
+
+def reset_default_manager():
+    """Drop the shared manager; the next convenience call creates a new one"""
+    global _default_manager
+    with _default_manager_lock:
+        _default_manager = None
+
 def get_network_interfaces() -> NetworkOperationResult:
     """Get network interfaces"""
-    manager = ShadowNetworkManager()
-    return manager.get_interfaces()
+    return _get_default_manager().get_interfaces()
 
 def spoof_mac_address(interface_name: str, new_mac: Optional[str] = None) -> NetworkOperationResult:
     """Spoof MAC address"""
-    manager = ShadowNetworkManager()
-    return manager.spoof_mac(interface_name, new_mac)
+    return _get_default_manager().spoof_mac(interface_name, new_mac)
 
 def restore_mac_address(interface_name: str) -> NetworkOperationResult:
     """Restore original MAC address"""
-    manager = ShadowNetworkManager()
-    return manager.restore_mac(interface_name)
+    return _get_default_manager().restore_mac(interface_name)
 
 def randomize_mac_addresses() -> NetworkOperationResult:
     """Randomize all MAC addresses"""
-    manager = ShadowNetworkManager()
-    return manager.randomize_all_macs()
+    return _get_default_manager().randomize_all_macs()
 
 def generate_random_mac(vendor: Optional[str] = None) -> str:
     """Generate random MAC address"""
-    manager = ShadowNetworkManager()
-    return manager.generate_random_mac(vendor)
+    return _get_default_manager().generate_random_mac(vendor)
 
 # Export main classes and functions
 __all__ = [
     'ShadowNetworkManager', 'NetworkInterfaceType', 'MACAddressFormat', 'NetworkInterface', 'NetworkOperationResult',
-    'get_network_interfaces', 'spoof_mac_address', 'restore_mac_address', 'randomize_mac_addresses', 'generate_random_mac'
+    'get_network_interfaces', 'spoof_mac_address', 'restore_mac_address', 'randomize_mac_addresses', 'generate_random_mac',
+    'reset_default_manager'
 ]
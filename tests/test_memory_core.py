@@ -0,0 +1,110 @@
+"""
+Tests for Memory Manipulation Library
+
+This module contains tests for process memory reading and scanning.
+The tests read this test process's own memory through /proc/self/mem.
+
+Author: Reaper Security Team
+Version: 0.1.0
+"""
+
+import unittest
+import ctypes
+import gc
+import os
+import sys
+from unittest.mock import patch
+
+from libs.memory import scanner as memory_scanner
+from libs.memory.linux_memory import LinuxMemoryOps
+from libs.memory.scanner import MemoryScanner
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "Linux /proc memory interface")
+class TestLinuxMemoryOps(unittest.TestCase):
+    """Test Linux memory operations"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.data = ctypes.create_string_buffer(b'REAPER-MEMORY-TEST' * 4)
+        self.address = ctypes.addressof(self.data)
+        self.ops = LinuxMemoryOps(os.getpid())
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.ops.close()
+    
+    def test_read_memory(self):
+        """Test reading memory"""
+        self.assertEqual(self.ops.read_memory(self.address, 18), b'REAPER-MEMORY-TEST')
+    
+    def test_read_memory_into_buffer(self):
+        """Test reading memory into a reusable buffer"""
+        buf = bytearray(32)
+        view = self.ops.read_memory(self.address, 6, buf)
+        
+        self.assertEqual(bytes(view), b'REAPER')
+        
+        # A live view from an earlier read must not break the next one
+        self.assertEqual(bytes(self.ops.read_memory(self.address + 7, 6, buf)), b'MEMORY')
+        with self.assertRaises(ValueError):
+            self.ops.read_memory(self.address, 64, buf)
+    
+    def test_read_region_blocks_and_pad(self):
+        """Test read_region steps by block and extends each block by pad"""
+        data = bytes(self.data)
+        blocks = [(address - self.address, bytes(view))
+                  for address, view in self.ops.read_region(self.address, 70, block=32, pad=3)]
+        
+        self.assertEqual(blocks, [(0, data[0:35]), (32, data[32:67]), (64, data[64:70])])
+    
+    def test_unclosed_instances_release_fds(self):
+        """Test instances that are never closed do not leak descriptors"""
+        before = len(os.listdir('/proc/self/fd'))
+        for _ in range(20):
+            LinuxMemoryOps(os.getpid()).read_memory(self.address, 1)
+        gc.collect()
+        
+        self.assertEqual(len(os.listdir('/proc/self/fd')), before)
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "Linux /proc memory interface")
+class TestMemoryScanner(unittest.TestCase):
+    """Test memory scanner functionality"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        # Blocks of 16 bytes from the buffer start: matches straddle the
+        # boundaries at 16 and 32, overlap each other at 30/32, and one
+        # runs past the end of the scanned range
+        content = bytearray(b'.' * 66)
+        for offset in (14, 30, 32, 60):
+            content[offset:offset + 4] = b'QZQZ'
+        content[64:66] = b'QZ'
+        self.data = ctypes.create_string_buffer(bytes(content), len(content))
+        self.address = ctypes.addressof(self.data)
+        self.scanner = MemoryScanner()
+    
+    def _scan(self, pattern, end=64):
+        """Scan only this test's buffer, with 16-byte blocks"""
+        with patch.object(memory_scanner, 'REGION_BLOCK_SIZE', 16):
+            return [address - self.address
+                    for address in self.scanner.scan_pattern(pattern, self.address, self.address + end)]
+    
+    def test_matches_across_block_boundaries(self):
+        """Test each match is reported once, whichever block's pad it falls in"""
+        self.assertEqual(self._scan(b'QZQZ'), [14, 30, 32, 60])
+    
+    def test_overlapping_matches(self):
+        """Test overlapping occurrences are all reported"""
+        self.assertEqual(self._scan(b'QZ'), [14, 16, 30, 32, 34, 60, 62])
+        self.assertEqual(self._scan(b'QZ', end=66), [14, 16, 30, 32, 34, 60, 62, 64])
+    
+    def test_pattern_longer_than_block(self):
+        """Test a pattern longer than the block size is still found"""
+        self.assertEqual(self._scan(b'QZQZQZ'), [30])
+    
+    def test_empty_pattern(self):
+        """Test an empty pattern matches nothing"""
+        self.assertEqual(self.scanner.scan_pattern(b''), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,11 @@ Version: 0.1.0
 """
 
 import unittest
+import asyncio
+import os
+import shutil
 import socket
+import tempfile
 import threading
 import time
 from unittest.mock import patch, MagicMock
@@ -21,10 +25,13 @@ from libs.phantom.scanner import (
 )
 
 from libs.phantom.packet import (
-    PhantomPacket, PacketConfig, Protocol,
+    PhantomPacket, PacketConfig, Protocol, TCPTemplate,
     create_tcp_packet, create_udp_packet, create_icmp_packet
 )
 
+from libs.phantom import checksum as phantom_checksum
+from libs.phantom.mmsg import send_many
+
 from libs.phantom.dns import (
     PhantomDNS, DNSConfig, DNSRecord, DNSRecordType,
     resolve_domain, reverse_lookup, query_dns
@@ -78,6 +85,82 @@ class TestPhantomScanner(unittest.TestCase):
             self.assertIsInstance(result, PortResult)
             self.assertIn(result.port, self.test_ports)
     
+    def test_scan_ports_async_local(self):
+        """Test concurrent TCP connect scan against a local listener"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind((self.test_host, 0))
+        server.listen(1)
+        server.settimeout(2.0)
+        open_port = server.getsockname()[1]
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as unused:
+            unused.bind((self.test_host, 0))
+            closed_port = unused.getsockname()[1]
+        
+        def serve():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                return
+            with conn:
+                conn.sendall(b"SSH-2.0-OpenSSH_9.0\r\n")
+        
+        thread = threading.Thread(target=serve)
+        thread.start()
+        try:
+            scanner = PhantomScanner(ScanConfig(rate_limit=0, banner_grab=True))
+            results = asyncio.run(scanner.scan_ports_async(self.test_host, [open_port, closed_port]))
+        finally:
+            thread.join()
+            server.close()
+        
+        by_port = {result.port: result for result in results}
+        self.assertEqual(by_port[open_port].status, ScanResult.OPEN)
+        self.assertEqual(by_port[open_port].service, "SSH")
+        self.assertEqual(by_port[closed_port].status, ScanResult.CLOSED)
+    
+    def test_udp_scan_batch_local(self):
+        """Test batched UDP scan matches replies back to ports"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind((self.test_host, 0))
+        server.settimeout(2.0)
+        open_port = server.getsockname()[1]
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as unused:
+            unused.bind((self.test_host, 0))
+            silent_port = unused.getsockname()[1]
+        
+        def serve():
+            try:
+                _, addr = server.recvfrom(1024)
+            except socket.timeout:
+                return
+            server.sendto(b"pong", addr)
+        
+        thread = threading.Thread(target=serve)
+        thread.start()
+        try:
+            scanner = PhantomScanner(ScanConfig(timeout=0.3, rate_limit=0))
+            results = scanner.scan_ports(self.test_host, [silent_port, open_port], ScanType.UDP_SCAN)
+        finally:
+            thread.join()
+            server.close()
+        
+        by_port = {result.port: result for result in results}
+        self.assertEqual(by_port[open_port].status, ScanResult.OPEN)
+        self.assertEqual(by_port[open_port].banner, "pong")
+        self.assertEqual(by_port[silent_port].status, ScanResult.FILTERED)
+    
+    def test_scan_ports_inside_event_loop(self):
+        """Test scan_ports falls back to a thread pool under a running loop"""
+        scanner = PhantomScanner(ScanConfig(rate_limit=0))
+        
+        async def scan_from_coroutine():
+            return scanner.scan_ports(self.test_host, [82, 81, 80])
+        
+        results = asyncio.run(scan_from_coroutine())
+        self.assertEqual([result.port for result in results], [80, 81, 82])
+    
     def test_scan_range(self):
         """Test scanning port range"""
         results = self.scanner.scan_range(self.test_host, 80, 85)
@@ -119,6 +202,32 @@ class TestPhantomScanner(unittest.TestCase):
         # Should take at least 100ms due to rate limiting
         self.assertGreaterEqual(end_time - start_time, 0.1)
     
+    def test_identify_service(self):
+        """Test service identification by port and banner"""
+        self.assertEqual(self.scanner._identify_service(22, ""), "SSH")
+        self.assertEqual(self.scanner._identify_service(8022, "SSH-2.0-OpenSSH_9.0"), "SSH")
+        # Keyword priority, not position, decides between indicators
+        self.assertEqual(self.scanner._identify_service(2121, "220 ProFTPD via HTTP proxy"), "HTTP")
+        self.assertIsNone(self.scanner._identify_service(9999, "hello"))
+    
+    def test_rate_limit_reserves_slots(self):
+        """Test rate limiter staggers callers and enforces the per-minute cap"""
+        scanner = PhantomScanner(ScanConfig(rate_limit=0.5))
+        delays = [scanner._rate_limit_delay() for _ in range(3)]
+        self.assertLess(delays[0], 0.01)
+        self.assertAlmostEqual(delays[1], 0.5, delta=0.05)
+        self.assertAlmostEqual(delays[2], 1.0, delta=0.05)
+        
+        scanner = PhantomScanner(ScanConfig(rate_limit=0))
+        scanner.max_scans_per_minute = 3
+        delays = [scanner._rate_limit_delay() for _ in range(4)]
+        self.assertLess(max(delays[:3]), 0.01)
+        self.assertAlmostEqual(delays[3], 60, delta=0.5)
+        
+        unlimited = PhantomScanner(ScanConfig(rate_limit=0, strict_limit=False))
+        unlimited.max_scans_per_minute = 1
+        self.assertEqual([unlimited._rate_limit_delay() for _ in range(3)], [0.0] * 3)
+    
     def test_get_open_ports(self):
         """Test extracting open ports from results"""
         # Mock results
@@ -147,6 +256,10 @@ class TestPhantomScanner(unittest.TestCase):
         self.assertIn("HTTPS", services)
         self.assertIn("SSH", services)
         self.assertEqual(len(services["HTTP"]), 2)  # Two HTTP ports
+        
+        # Services are listed in the order they were first seen
+        self.assertEqual(list(services), ["HTTP", "HTTPS", "SSH"])
+        self.assertEqual(list(self.scanner.get_service_summary(results[2:])), ["SSH", "HTTP"])
 
 class TestPhantomPacket(unittest.TestCase):
     """Test cases for PhantomPacket class"""
@@ -185,6 +298,122 @@ class TestPhantomPacket(unittest.TestCase):
         self.assertIsInstance(packet_data, bytes)
         self.assertGreaterEqual(len(packet_data), 8)  # At least ICMP header size
     
+    def test_buffered_random_fields(self):
+        """Test source ports and sequence numbers come from the random pool"""
+        packet = PhantomPacket()
+        ports = {packet._generate_source_port() for _ in range(5000)}
+        self.assertGreaterEqual(min(ports), 1024)
+        self.assertLessEqual(max(ports), 65535)
+        
+        # Spans several pool refills; sequence numbers must keep varying
+        seqs = {packet.create_tcp_packet()[4:8] for _ in range(2000)}
+        self.assertGreater(len(seqs), 1990)
+    
+    @patch.object(PhantomPacket, '_receive_replies', return_value=[1.0, 2.5])
+    @patch('libs.phantom.packet.send_many', return_value=3)
+    @patch.object(PhantomPacket, '_get_raw_icmp_socket')
+    def test_ping_statistics(self, mock_socket, mock_send, mock_replies):
+        """Test ping reports per-packet times and summary statistics"""
+        results = self.packet.ping("127.0.0.1", 3)
+        self.assertEqual(len(mock_send.call_args[0][1]), 3)  # one batch of three probes
+        self.assertEqual(len(mock_replies.call_args[0][2]), 3)  # all three awaited
+        self.assertEqual(results['received'], 2)
+        self.assertEqual(results['lost'], 1)
+        self.assertEqual(len(results['times']), 2)
+        self.assertLessEqual(results['min_time'], results['avg_time'])
+        self.assertLessEqual(results['avg_time'], results['max_time'])
+        self.assertGreaterEqual(results['stddev_time'], 0.0)
+    
+    def test_ping_loopback(self):
+        """Test ping matches real echo replies from loopback"""
+        try:
+            socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP).close()
+        except OSError:
+            self.skipTest("Raw sockets require elevated privileges")
+        
+        packet = PhantomPacket()
+        try:
+            results = packet.ping("127.0.0.1", 3, timeout=2.0)
+        finally:
+            packet.close()
+        self.assertEqual(results['received'], 3)
+        self.assertEqual(results['lost'], 0)
+        self.assertTrue(all(t >= 0 for t in results['times']))
+    
+    def test_ping_concurrent_loopback(self):
+        """Test concurrent pings sharing one instance neither hang nor lose replies"""
+        try:
+            socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP).close()
+        except OSError:
+            self.skipTest("Raw sockets require elevated privileges")
+        
+        packet = PhantomPacket()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(packet.ping("127.0.0.1", 200, timeout=2.0)),
+                             daemon=True)
+            for _ in range(4)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(15.0)
+        finally:
+            packet.close()
+        
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual([r['received'] for r in results], [200] * 4)
+    
+    def test_tcp_template_incremental_checksum(self):
+        """Test template packets carry the same checksum as a full recompute"""
+        template = TCPTemplate("10.0.0.1", "10.0.0.2", 443, 0x02, b"probe")
+        for source_port, seq_num in [(0, 0), (65535, 0xFFFFFFFF), (40000, 0x12345678)]:
+            packet = template.craft(source_port, seq_num)
+            self.assertEqual(packet[:2], source_port.to_bytes(2, 'big'))
+            self.assertEqual(packet[4:8], seq_num.to_bytes(4, 'big'))
+            pseudo_header = socket.inet_aton("10.0.0.1") + socket.inet_aton("10.0.0.2") + bytes([0, socket.IPPROTO_TCP]) + len(packet).to_bytes(2, 'big')
+            # A packet with a valid checksum sums to zero
+            self.assertEqual(phantom_checksum.checksum_numpy(pseudo_header + packet), 0)
+    
+    def test_create_tcp_packet_reuses_template(self):
+        """Test create_tcp_packet rebuilds the template only when fields change"""
+        self.packet.create_tcp_packet(b"a")
+        template = self.packet._tcp_template
+        self.packet.create_tcp_packet(b"a")
+        self.assertIs(self.packet._tcp_template, template)
+        self.packet.create_tcp_packet(b"b")
+        self.assertIsNot(self.packet._tcp_template, template)
+    
+    def test_source_ip_cached_per_destination(self):
+        """Test source IP lookup is cached until dest_ip changes or is invalidated"""
+        packet = PhantomPacket(PacketConfig(dest_ip="127.0.0.1"))
+        with patch.object(packet, '_compute_source_ip', return_value="127.0.0.1") as compute:
+            packet._get_source_ip()
+            packet._get_source_ip()
+            self.assertEqual(compute.call_count, 1)
+            
+            packet.config.dest_ip = "127.0.0.2"
+            packet._get_source_ip()
+            self.assertEqual(compute.call_count, 2)
+            
+            packet.invalidate_source_ip()
+            packet._get_source_ip()
+            self.assertEqual(compute.call_count, 3)
+    
+    def test_send_many_batch(self):
+        """Test batched datagram sends arrive intact and in order"""
+        packets = [bytes([i]) * (i + 1) for i in range(20)]
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver, \
+             socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            receiver.bind(("127.0.0.1", 0))
+            receiver.settimeout(2.0)
+            port = receiver.getsockname()[1]
+            
+            for use_sendmmsg in (None, False):
+                self.assertEqual(send_many(sender, packets, "127.0.0.1", port, use_sendmmsg), len(packets))
+                self.assertEqual([receiver.recv(64) for _ in packets], packets)
+    
     def test_checksum_calculation(self):
         """Test checksum calculation"""
         test_data = b"test data for checksum"
@@ -193,6 +422,38 @@ class TestPhantomPacket(unittest.TestCase):
         self.assertGreaterEqual(checksum, 0)
         self.assertLessEqual(checksum, 65535)
     
+    def test_checksum_rfc1071_example(self):
+        """Test checksum against the RFC 1071 worked example"""
+        data = b'\x00\x01\xf2\x03\xf4\xf5\xf6\xf7'
+        self.assertEqual(self.packet._calculate_checksum(data), 0x220d)
+        # Odd-length data is padded with a zero byte
+        self.assertEqual(self.packet._calculate_checksum(data + b'\x01'),
+                         self.packet._calculate_checksum(data + b'\x01\x00'))
+    
+    @unittest.skipUnless(shutil.which(os.environ.get('CC', 'cc')), "No C compiler available")
+    def test_checksum_kernel_matches_numpy(self):
+        """Test compiled checksum kernel against the NumPy implementation"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = phantom_checksum.build(os.path.join(tmp, 'csum' + os.path.splitext(phantom_checksum.library_path())[1]))
+            lib = phantom_checksum._load(path)
+            self.assertIsNotNone(lib)
+            for size in list(range(0, 72)) + [1499, 1500]:
+                data = os.urandom(size)
+                self.assertEqual(lib.rfc1071(data, len(data)), phantom_checksum.checksum_numpy(data))
+            
+            # Odd-length spans straddle 16-bit word boundaries
+            for sizes in [(12, 20, 1460), (13, 21, 99), (1, 1, 1), (0, 7, 0)]:
+                spans = [os.urandom(n) for n in sizes]
+                expected = phantom_checksum.checksum_numpy(b''.join(spans))
+                self.assertEqual(lib.rfc1071_3(spans[0], sizes[0], spans[1], sizes[1], spans[2], sizes[2]), expected)
+    
+    def test_checksum_iov(self):
+        """Test multi-span checksum equals checksum of the joined spans"""
+        for sizes in [(), (5,), (12, 20, 1460), (13, 21, 99), (3, 0, 5, 7, 64)]:
+            spans = [os.urandom(n) for n in sizes]
+            self.assertEqual(phantom_checksum.checksum_iov(spans),
+                             phantom_checksum.checksum(b''.join(spans)))
+    
     def test_invalid_config_validation(self):
         """Test invalid configuration validation"""
         # Test with invalid packet creation instead of config validation
@@ -279,6 +540,12 @@ class TestPhantomDNS(unittest.TestCase):
         self.assertIsInstance(encoded, bytes)
         self.assertTrue(encoded.endswith(b'\x00'))  # Null terminator
     
+    def test_encode_domain_name_labels(self):
+        """Test domain name encoding of length-prefixed labels"""
+        self.assertEqual(self.dns._encode_domain_name("example.com"), b'\x07example\x03com\x00')
+        with self.assertRaises(ValueError):
+            self.dns._encode_domain_name("a" * 64 + ".com")
+    
     def test_decode_domain_name(self):
         """Test domain name decoding"""
         encoded = self.dns._encode_domain_name("example.com")
@@ -291,6 +558,23 @@ class TestPhantomDNS(unittest.TestCase):
         self.assertIsInstance(query, bytes)
         self.assertGreater(len(query), 12)  # At least DNS header size
     
+    def test_create_dns_query_edns0(self):
+        """Test DNS query advertises EDNS0 UDP payload size"""
+        query = self.dns._create_dns_query("example.com", DNSRecordType.A, 1)
+        self.assertEqual(query[10:12], b'\x00\x01')  # One additional RR
+        self.assertTrue(query.endswith(b'\x00\x00\x29\x10\x00\x00\x00\x00\x00\x00\x00'))
+    
+    def test_parse_txt_record(self):
+        """Test TXT record parsing strips character-string length prefixes"""
+        response = (b'\x00\x01\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00'
+                    b'\x07example\x03com\x00\x00\x10\x00\x01'
+                    b'\xc0\x0c\x00\x10\x00\x01\x00\x00\x00\x3c\x00\x0a'
+                    b'\x04v=sp\x04f1 a')
+        records = self.dns._parse_dns_response(response)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].record_type, DNSRecordType.TXT)
+        self.assertEqual(records[0].data, "v=spf1 a")
+    
     @patch('socket.socket')
     def test_dns_query(self, mock_socket):
         """Test DNS query with mocked response"""
@@ -304,6 +588,204 @@ class TestPhantomDNS(unittest.TestCase):
         records = self.dns.query("example.com", DNSRecordType.A)
         self.assertIsInstance(records, list)
     
+    @patch('socket.socket')
+    def test_dns_enumeration_pipelined(self, mock_socket):
+        """Test DNS enumeration sends all queries on one socket"""
+        sent = []
+        
+        def answer(packet, addr):
+            sent.append(packet)
+        
+        def recvfrom(bufsize):
+            if not sent:
+                raise socket.timeout()
+            packet = sent.pop(0)
+            # Echo the query back as a response with one A record
+            header = packet[:2] + b'\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00'
+            question = packet[12:12 + len(self.dns._encode_domain_name("example.com")) + 4]
+            answer_rr = b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x08\x08\x08\x08'
+            return header + question + answer_rr, ("8.8.8.8", 53)
+        
+        mock_sock = MagicMock()
+        mock_socket.return_value.__enter__.return_value = mock_sock
+        mock_sock.sendto.side_effect = answer
+        mock_sock.recvfrom.side_effect = recvfrom
+        
+        results = self.dns.dns_enumeration("example.com")
+        self.assertEqual(mock_socket.call_count, 1)
+        self.assertEqual(mock_sock.sendto.call_count, 7)
+        self.assertEqual(results["A"][0].data, "8.8.8.8")
+    
+    @patch('socket.socket')
+    def test_dns_enumeration_malformed_reply(self, mock_socket):
+        """Test DNS enumeration skips malformed replies and bad domain names"""
+        sent = []
+        malformed = []
+        
+        def answer(packet, addr):
+            sent.append(packet)
+        
+        def recvfrom(bufsize):
+            if not sent:
+                raise socket.timeout()
+            packet = sent.pop(0)
+            header = packet[:2] + b'\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00'
+            question = packet[12:12 + len(self.dns._encode_domain_name("example.com")) + 4]
+            answer_rr = b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x08\x08\x08\x08'
+            if question[-4:-2] == b'\x00\x01' and not malformed:
+                # First A reply ends in a truncated compression pointer
+                malformed.append(packet)
+                answer_rr = b'\xc0'
+            return header + question + answer_rr, ("8.8.8.8", 53)
+        
+        mock_sock = MagicMock()
+        mock_socket.return_value.__enter__.return_value = mock_sock
+        mock_sock.sendto.side_effect = answer
+        mock_sock.recvfrom.side_effect = recvfrom
+        
+        results = self.dns.dns_enumeration("example.com")
+        self.assertEqual(len(malformed), 1)
+        self.assertEqual(mock_sock.sendto.call_count, 8)  # Only A was asked again
+        self.assertEqual(results["A"][0].data, "8.8.8.8")
+        self.assertEqual(results["MX"][0].data, "8.8.8.8")
+        
+        self.assertEqual(self.dns.dns_enumeration("ex\u00e4mple.com"), {})
+    
+    def test_decode_compression_pointer_loop(self):
+        """Test a compression pointer loop is rejected instead of recursing"""
+        response = (b'\x00\x01\x81\x80\x00\x00\x00\x01\x00\x00\x00\x00'
+                    b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x08\x08\x08\x08')
+        with self.assertRaises(ValueError):
+            self.dns._parse_dns_response(response)
+    
+    def test_enumerate_many(self):
+        """Test concurrent DNS enumeration against a local UDP server"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(2.0)
+        answer_rr = b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x0a\x00\x00\x01'
+        
+        def serve(count):
+            for _ in range(count):
+                try:
+                    packet, addr = server.recvfrom(4096)
+                except socket.timeout:
+                    return
+                qname_end = packet.index(b'\x00', 12) + 5
+                header = packet[:2] + b'\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00'
+                server.sendto(header + packet[12:qname_end] + answer_rr, addr)
+        
+        domains = ["a.example.com", "b.example.com", "c.example.com"]
+        thread = threading.Thread(target=serve, args=(len(domains),))
+        thread.start()
+        try:
+            dns = PhantomDNS(DNSConfig(dns_server="127.0.0.1", port=server.getsockname()[1],
+                                       timeout=2.0, retries=1))
+            results = asyncio.run(dns.enumerate_many(domains, [DNSRecordType.A]))
+        finally:
+            thread.join()
+            server.close()
+        
+        self.assertEqual(sorted(results), domains)
+        for domain in domains:
+            self.assertEqual(results[domain]["A"][0].data, "10.0.0.1")
+    
+    def test_enumerate_many_malformed_reply(self):
+        """Test one malformed reply or bad name does not fail enumerate_many"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(2.0)
+        answer_rr = b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x0a\x00\x00\x01'
+        
+        def serve(count):
+            for _ in range(count):
+                try:
+                    packet, addr = server.recvfrom(4096)
+                except socket.timeout:
+                    return
+                qname_end = packet.index(b'\x00', 12) + 5
+                header = packet[:2] + b'\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00'
+                # b.example.com gets a reply cut off inside a compression pointer
+                rr = b'\xc0' if b'\x01b\x07example' in packet else answer_rr
+                server.sendto(header + packet[12:qname_end] + rr, addr)
+        
+        domains = ["a.example.com", "b.example.com", "c.example.com"]
+        thread = threading.Thread(target=serve, args=(len(domains),))
+        thread.start()
+        try:
+            dns = PhantomDNS(DNSConfig(dns_server="127.0.0.1", port=server.getsockname()[1],
+                                       timeout=2.0, retries=1))
+            results = asyncio.run(dns.enumerate_many(domains + ["\u00e4.example.com"],
+                                                     [DNSRecordType.A]))
+        finally:
+            thread.join()
+            server.close()
+        
+        self.assertEqual(results["a.example.com"]["A"][0].data, "10.0.0.1")
+        self.assertEqual(results["c.example.com"]["A"][0].data, "10.0.0.1")
+        self.assertEqual(results["b.example.com"], {})
+        self.assertEqual(results["\u00e4.example.com"], {})
+    
+    @patch('libs.phantom.dns._new_query_id', return_value=1)
+    @patch('socket.socket')
+    def test_dns_query_reuses_socket(self, mock_socket, mock_query_id):
+        """Test DNS queries share one socket and drop stale replies"""
+        response = b'\x00\x01\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00\x07example\x03com\x00\x00\x01\x00\x01\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x08\x08\x08\x08'
+        stale = b'\x00\x02' + response[2:]
+        
+        mock_sock = mock_socket.return_value
+        mock_sock.recvfrom.side_effect = [
+            (stale, ("8.8.8.8", 53)),
+            (response, ("8.8.8.8", 53)),
+            (response, ("8.8.8.8", 53)),
+        ]
+        
+        first = self.dns.query("example.com", DNSRecordType.A)
+        second = self.dns.query("example.com", DNSRecordType.A)
+        self.assertEqual(mock_socket.call_count, 1)
+        self.assertEqual([r.data for r in first], ["8.8.8.8"])
+        self.assertEqual([r.data for r in second], ["8.8.8.8"])
+    
+    def test_dns_query_concurrent_callers(self):
+        """Test an unanswered query does not stall other callers"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(3.0)
+        answer_rr = b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x0a\x00\x00\x01'
+        
+        def serve(count):
+            for _ in range(count):
+                try:
+                    packet, addr = server.recvfrom(4096)
+                except socket.timeout:
+                    return
+                if b'\x04slow' in packet:
+                    continue  # Never answered
+                qname_end = packet.index(b'\x00', 12) + 5
+                header = packet[:2] + b'\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00'
+                server.sendto(header + packet[12:qname_end] + answer_rr, addr)
+        
+        thread = threading.Thread(target=serve, args=(2,))
+        thread.start()
+        dns = PhantomDNS(DNSConfig(dns_server="127.0.0.1", port=server.getsockname()[1],
+                                   timeout=2.0, retries=1))
+        try:
+            slow = threading.Thread(target=dns.query, args=("slow.example.com",))
+            slow.start()
+            time.sleep(0.1)
+            
+            start = time.monotonic()
+            records = dns.query("fast.example.com")
+            elapsed = time.monotonic() - start
+            slow.join()
+        finally:
+            thread.join()
+            server.close()
+            dns.close()
+        
+        self.assertEqual([r.data for r in records], ["10.0.0.1"])
+        self.assertLess(elapsed, 1.0)
+    
     def test_resolve_domain(self):
         """Test domain resolution"""
         # This test may fail if no internet connection
@@ -391,6 +873,24 @@ class TestConvenienceFunctions(unittest.TestCase):
         """Test create_icmp_packet convenience function"""
         packet = create_icmp_packet("127.0.0.1", b"test")
         self.assertIsInstance(packet, bytes)
+    
+    def test_scan_functions_use_separate_scanners(self):
+        """Test independent convenience scans do not share a rate-limit window"""
+        with patch('libs.phantom.scanner.PhantomScanner') as scanner_class:
+            scan_port("127.0.0.1", 80)
+            scan_ports("127.0.0.1", [80])
+        self.assertEqual(scanner_class.call_count, 2)
+    
+    def test_ping_host_uses_private_packet(self):
+        """Test ping_host pings on its own instance and closes it"""
+        from libs.phantom.packet import ping_host
+        
+        with patch('libs.phantom.packet.PhantomPacket') as packet_class:
+            ping_host("127.0.0.1", 1)
+            ping_host("127.0.0.1", 1)
+        
+        self.assertEqual(packet_class.call_count, 2)
+        self.assertEqual(packet_class.return_value.close.call_count, 2)
 
 if __name__ == '__main__':
     # Run tests
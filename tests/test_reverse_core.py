@@ -0,0 +1,252 @@
+"""
+Tests for Reverse Engineering Library
+
+This module contains tests for the binary scanning helpers and the
+analyzers built on them.
+
+Author: Reaper Security Team
+Version: 0.1.0
+"""
+
+import unittest
+import lzma
+import os
+import random
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+from libs.reverse import scan
+from libs.reverse.scan import (
+    NeedleScanner, count_matches, histogram_entropy, iter_chunks, scan_file, window_entropy
+)
+from libs.reverse.antidebug import AntiDebugDetector
+from libs.reverse.obfuscation import ObfuscationAnalyzer
+from libs.reverse.unpacking import Unpacker
+
+def _code_like(size, seed=0):
+    """Deterministic bytes with the skewed distribution of machine code (~5 bits/byte)"""
+    rng = random.Random(seed)
+    return bytes(rng.choices(range(256), weights=[0.93 ** i for i in range(256)], k=size))
+
+def _naive_offsets(needles, data):
+    """Every (overlapping) offset of each needle, found one byte at a time"""
+    found = {}
+    for needle in needles:
+        offsets = [i for i in range(len(data) - len(needle) + 1) if data[i:i + len(needle)] == needle]
+        if offsets:
+            found[needle] = offsets
+    return found
+
+def _naive_window_entropy(data, block, window):
+    """Entropy of each window of blocks, histogrammed from scratch"""
+    blocks = -(-len(data) // block)
+    window = min(window, blocks)
+    return np.array([
+        histogram_entropy(np.bincount(np.frombuffer(data[i * block:(i + window) * block], dtype=np.uint8),
+                                      minlength=256))
+        for i in range(blocks - window + 1)
+    ])
+
+class TestScanHelpers(unittest.TestCase):
+    """Test shared binary scanning helpers"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_window_entropy_matches_direct_computation(self):
+        """Test window entropies against a per-window recomputation"""
+        data = _code_like(40 * 256 + 100)  # Partial last block
+        expected = _naive_window_entropy(data, 256, 8)
+        
+        np.testing.assert_allclose(window_entropy(data, block=256, window=8), expected, atol=1e-9)
+        
+        # Small batches force the carried histograms across every batch boundary
+        with patch.object(scan, '_HIST_BATCH', 3):
+            np.testing.assert_allclose(window_entropy(data, block=256, window=8), expected, atol=1e-9)
+    
+    def test_window_entropy_short_and_empty(self):
+        """Test buffers shorter than one window and empty buffers"""
+        data = _code_like(1000)
+        result = window_entropy(data, block=256, window=8)
+        
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(result[0], histogram_entropy(np.bincount(np.frombuffer(data, dtype=np.uint8),
+                                                                        minlength=256)))
+        self.assertEqual(window_entropy(b'').size, 0)
+        self.assertEqual(window_entropy(bytes(4096 * 20)).max(), 0.0)
+    
+    def test_needle_offsets_small_set(self):
+        """Test offsets with the per-needle find path, overlaps and prefixes included"""
+        needles = [b'ABAB', b'AB', b'ABABC', b'BAB']
+        data = b'xxABABABCxxABxABAB'
+        scanner = NeedleScanner(needles)
+        
+        self.assertEqual(scanner.offsets(data), _naive_offsets(needles, data))
+        self.assertEqual(scanner.present(data), set(_naive_offsets(needles, data)))
+    
+    def test_needle_offsets_regex_sweep(self):
+        """Test offsets with the single regex sweep used for large needle sets"""
+        needles = [b'ABCDE', b'BCD', b'ABC', b'CDEF', b'EE'] + [bytes([0xF0, i, i]) for i in range(12)]
+        self.assertGreaterEqual(len(needles), scan._SWEEP_MIN_NEEDLES)
+        data = b'..ABCDEF..ABCDEE..\xf0\x03\x03\xf0\x03\x03\x03ABC'
+        scanner = NeedleScanner(needles)
+        
+        self.assertEqual(scanner.offsets(data), _naive_offsets(needles, data))
+        self.assertEqual(scanner.present(data), set(_naive_offsets(needles, data)))
+    
+    def test_iter_chunks_overlap(self):
+        """Test chunks step by chunk size and extend by the overlap"""
+        data = bytes(range(100))
+        chunks = list(iter_chunks(data, chunk=30, overlap=3))
+        
+        self.assertEqual([start for start, _ in chunks], [0, 30, 60, 90])
+        self.assertEqual(bytes(chunks[0][1]), data[0:33])
+        self.assertEqual(bytes(chunks[-1][1]), data[90:100])
+    
+    def test_count_matches_across_chunk_boundary(self):
+        """Test a match straddling a chunk boundary is counted exactly once"""
+        data = bytearray(2 * scan._SCAN_CHUNK)
+        for offset in (0, scan._SCAN_CHUNK - 1, scan._SCAN_CHUNK + 1, len(data) - 2):
+            data[offset:offset + 2] = b'\xff\xd0'
+        
+        self.assertEqual(count_matches(scan.INDIRECT_BRANCH_RE, bytes(data), overlap=1), 4)
+    
+    def test_scan_file_cache_follows_file_changes(self):
+        """Test scan_file reuses results only while size and mtime are unchanged"""
+        path = os.path.join(self.temp_dir, 'sample.bin')
+        with open(path, 'wb') as f:
+            f.write(b'IsDebuggerPresent')
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        
+        first = scan_file(path)
+        self.assertIs(scan_file(path), first)
+        self.assertIn(b'IsDebuggerPresent', first['needles'])
+        
+        # Same size, new contents: only the mtime tells them apart
+        with open(path, 'wb') as f:
+            f.write(b'GetTickCount\x00\x00\x00\x00\x00')
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        second = scan_file(path)
+        self.assertNotIn(b'IsDebuggerPresent', second['needles'])
+        self.assertIn(b'GetTickCount', second['needles'])
+        
+        # New size
+        with open(path, 'wb') as f:
+            f.write(b'UPX!')
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        self.assertEqual(scan_file(path)['size'], 4)
+
+class TestAntiDebugDetector(unittest.TestCase):
+    """Test anti-debug detector functionality"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.detector = AntiDebugDetector()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _detect(self, data):
+        """Run detect() on data written to a sample file"""
+        path = os.path.join(self.temp_dir, 'sample.bin')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return self.detector.detect(path)
+    
+    def test_packed_sample(self):
+        """Test a small stub followed by compressed data counts as packed"""
+        packed = _code_like(8192) + lzma.compress(_code_like(600_000, seed=1))
+        self.assertTrue(self._detect(packed)['is_packed'])
+        self.assertTrue(self.detector._check_packed(packed))
+    
+    def test_unpacked_sample_with_compressed_resource(self):
+        """Test embedded compressed data alone does not make a binary packed"""
+        # Like curl's built-in manual: a compressed blob inside ordinary code
+        resource = lzma.compress(_code_like(200_000, seed=1))
+        unpacked = _code_like(200_000) + resource + _code_like(100_000, seed=2)
+        self.assertFalse(self._detect(unpacked)['is_packed'])
+        self.assertFalse(self.detector._check_packed(unpacked))
+        self.assertFalse(self._detect(_code_like(300_000))['is_packed'])
+    
+    def test_system_binaries_not_packed(self):
+        """Test stock system binaries are not reported as packed"""
+        binaries = [path for path in (shutil.which(name) for name in ('curl', 'ls', 'bash'))
+                    if path and os.path.getsize(os.path.realpath(path)) > 65536]
+        if not binaries:
+            self.skipTest("No system binaries to sample")
+        for path in binaries:
+            self.assertFalse(self.detector.detect(os.path.realpath(path))['is_packed'], path)
+
+class TestObfuscationAnalyzer(unittest.TestCase):
+    """Test obfuscation analyzer functionality"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = ObfuscationAnalyzer()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_repeat_analyze_only_stats_file(self):
+        """Test a repeat analysis of an unchanged file does not reopen it"""
+        path = os.path.join(self.temp_dir, 'sample.bin')
+        with open(path, 'wb') as f:
+            f.write(b'\xff\xd0' * 100 + b'\x00' * 800)
+        
+        first = self.analyzer.analyze(path)
+        self.assertTrue(first['control_flow_obfuscation'])
+        self.assertTrue(first['string_obfuscation'])
+        self.assertFalse(first['instruction_obfuscation'])
+        
+        with patch('builtins.open', side_effect=AssertionError("file reopened")) as mock_open:
+            self.assertEqual(self.analyzer.analyze(path), first)
+        mock_open.assert_not_called()
+
+class TestUnpacker(unittest.TestCase):
+    """Test unpacker functionality"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write(self, name, data):
+        """Write a sample file and return its path"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def test_detect_packer(self):
+        """Test packer detection by signature"""
+        unpacker = Unpacker()
+        self.assertEqual(unpacker.detect_packer(self._write('upx.bin', b'\x00' * 64 + b'UPX!' + b'\x00' * 64)), 'upx')
+        self.assertIsNone(unpacker.detect_packer(self._write('plain.bin', b'\x00' * 128)))
+    
+    def test_custom_signatures_stay_per_instance(self):
+        """Test signatures added to one unpacker do not leak into others"""
+        path = self._write('custom.bin', b'\x00' * 64 + b'CUSTOMPK' + b'\x00' * 64)
+        first = Unpacker()
+        first.packers['custom'] = [b'CUSTOMPK']
+        
+        self.assertEqual(first.detect_packer(path), 'custom')
+        self.assertNotIn('custom', Unpacker().packers)
+        self.assertIsNone(Unpacker().detect_packer(path))
+
+if __name__ == '__main__':
+    unittest.main()
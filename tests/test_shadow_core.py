@@ -10,6 +10,7 @@ import os
 import sys
 import time
 import threading
+from collections import deque
 from unittest.mock import patch, MagicMock, Mock
 import subprocess
 import platform
@@ -305,7 +306,7 @@ class TestShadowNetworkManager(unittest.TestCase):
         self.assertTrue(self.network_manager.safe_mode)
         self.assertIsInstance(self.network_manager.interfaces, list)
         self.assertIsInstance(self.network_manager.original_macs, dict)
-        self.assertIsInstance(self.network_manager.operation_log, list)
+        self.assertIsInstance(self.network_manager.operation_log, deque)
     
     def test_safe_mode_get_interfaces(self):
         """Test interface retrieval in safe mode"""
@@ -369,6 +370,22 @@ class TestShadowNetworkManager(unittest.TestCase):
         mac_none = self.network_manager.generate_random_mac(format=MACAddressFormat.NONE)
         self.assertRegex(mac_none, r'^[0-9A-F]{12}$')
     
+    def test_generate_random_macs(self):
+        """Test batch random MAC address generation"""
+        macs = self.network_manager.generate_random_macs(32)
+        
+        self.assertEqual(len(macs), 32)
+        for mac in macs:
+            self.assertRegex(mac, r'^[0-9A-F]{2}(:[0-9A-F]{2}){5}$')
+            # Unicast and locally administered
+            self.assertEqual(int(mac[:2], 16) & 0x03, 0x02)
+        
+        # Vendor OUIs are kept as-is
+        for mac in self.network_manager.generate_random_macs(8, "Intel"):
+            self.assertIn(mac[:8], ("00:1B:21", "00:1C:42", "00:1D:4F"))
+        
+        self.assertEqual(self.network_manager.generate_random_macs(0), [])
+    
     def test_mac_address_validation(self):
         """Test MAC address validation"""
         # Valid MAC addresses
@@ -376,7 +393,8 @@ class TestShadowNetworkManager(unittest.TestCase):
             "00:11:22:33:44:55",
             "00-11-22-33-44-55",
             "00.11.22.33.44.55",
-            "001122334455"
+            "001122334455",
+            0x001122334455  # 48-bit integer
         ]
         
         for mac in valid_macs:
@@ -387,7 +405,10 @@ class TestShadowNetworkManager(unittest.TestCase):
             "00:11:22:33:44",  # Too short
             "00:11:22:33:44:55:66",  # Too long
             "00:11:22:33:44:GG",  # Invalid characters
-            "invalid_mac"  # Not hex
+            "invalid_mac",  # Not hex
+            "0x1122334455",  # Hex prefix is not a MAC
+            "00_112233445",  # Digit separator is not a MAC
+            1 << 48  # Integer wider than 48 bits
         ]
         
         for mac in invalid_macs:
@@ -425,6 +446,14 @@ class TestShadowNetworkManager(unittest.TestCase):
         vendor = self.network_manager._get_mac_vendor("FF:FF:FF:11:22:33")
         self.assertEqual(vendor, "Unknown")
     
+    def test_interface_vendor(self):
+        """Test interface vendor follows its MAC address"""
+        interface = NetworkInterface("eth0", "00:0C:29:11:22:33", NetworkInterfaceType.ETHERNET, True)
+        self.assertEqual(interface.vendor, "VMware")
+        
+        interface.mac_address = "52:54:00:11:22:33"
+        self.assertEqual(interface.vendor, "Realtek")
+    
     def test_operation_logging(self):
         """Test operation logging"""
         initial_log_count = len(self.network_manager.operation_log)
@@ -436,9 +465,93 @@ class TestShadowNetworkManager(unittest.TestCase):
         self.assertEqual(len(self.network_manager.operation_log), initial_log_count + 1)
         
         log_entry = self.network_manager.operation_log[-1]
-        self.assertIn('timestamp', log_entry)
-        self.assertEqual(log_entry['operation'], 'get_interfaces')
-        self.assertFalse(log_entry['success'])
+        self.assertIsInstance(log_entry.timestamp, int)
+        self.assertEqual(log_entry.operation, 'get_interfaces')
+        self.assertFalse(log_entry.success)
+        
+        # Exported entries keep the dict shape
+        exported = self.network_manager.get_operation_log()[-1]
+        self.assertAlmostEqual(exported['timestamp'], time.time(), delta=60)
+        self.assertEqual(exported['operation'], 'get_interfaces')
+        self.assertFalse(exported['success'])
+    
+    def test_operation_log_bounded(self):
+        """Test operation log keeps only the newest entries"""
+        manager = ShadowNetworkManager({'log_max': 3})
+        
+        for _ in range(5):
+            manager.get_interfaces()
+        
+        self.assertEqual(len(manager.operation_log), 3)
+        self.assertIsInstance(manager.get_operation_log(), list)
+    
+    def test_spoof_mac_linux_netlink(self):
+        """Test Linux MAC spoofing prefers one reused netlink socket"""
+        from libs.shadow.network import manager as network_manager
+        
+        ipr = MagicMock()
+        ipr.link_lookup.return_value = [7]
+        with patch.object(network_manager, 'IPRoute', return_value=ipr) as iproute, \
+                patch.object(network_manager.subprocess, 'run') as run:
+            self.assertTrue(self.network_manager._spoof_mac_linux("eth0", "02:11:22:33:44:55"))
+            self.assertTrue(self.network_manager._spoof_mac_linux("eth0", "02:11:22:33:44:66"))
+            
+            iproute.assert_called_once()
+            run.assert_not_called()
+            ipr.link.assert_any_call('set', index=7, address="02:11:22:33:44:66", state='up')
+            self.assertEqual(ipr.link.call_count, 4)  # down, then address and up together
+            
+            # A refused netlink request falls back to the ip command
+            ipr.link.side_effect = OSError("Operation not permitted")
+            run.return_value = Mock(returncode=0, stderr="")
+            self.assertTrue(self.network_manager._spoof_mac_linux("eth0", "02:11:22:33:44:77"))
+            run.assert_called_once()
+        
+        self.network_manager.close()
+        ipr.close.assert_called_once()
+    
+    def test_restore_mac_errors(self):
+        """Test restore_mac reports OS errors and lets programming errors through"""
+        self.network_manager.safe_mode = False
+        self.network_manager.original_macs["eth0"] = "00:11:22:33:44:55"
+        
+        with patch.object(self.network_manager, 'spoof_mac', side_effect=OSError("busy")):
+            result = self.network_manager.restore_mac("eth0")
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "busy")
+        
+        with patch.object(self.network_manager, 'spoof_mac', side_effect=TypeError("bug")):
+            with self.assertRaises(TypeError):
+                self.network_manager.restore_mac("eth0")
+    
+    def test_spoof_macs_batch(self):
+        """Test batch MAC spoofing"""
+        changes = [("eth0", "02:11:22:33:44:55"), ("wlan0", None)]
+        
+        # Safe mode blocks the whole batch
+        result = self.network_manager.spoof_macs_batch(changes)
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "Safe mode")
+        
+        # Each pair gets its own spoof_mac result, in order
+        self.network_manager.safe_mode = False
+        with patch.object(self.network_manager, 'spoof_mac',
+                          side_effect=lambda name, mac: NetworkOperationResult(
+                              success=name == "eth0", operation="spoof_mac", message=name)):
+            result = self.network_manager.spoof_macs_batch(changes)
+        
+        self.assertTrue(result.success)
+        self.assertEqual([r.message for r in result.data], ["eth0", "wlan0"])
+        self.assertEqual(result.message, "Spoofed 1/2 interfaces")
+    
+    def test_operation_log_disabled(self):
+        """Test operation log can be switched off"""
+        manager = ShadowNetworkManager({'enable_operation_log': False})
+        
+        result = manager.get_interfaces()
+        
+        self.assertFalse(result.success)  # Safe mode
+        self.assertEqual(manager.get_operation_log(), [])
 
 class TestShadowObfuscationManager(unittest.TestCase):
     """Test obfuscation manager functionality"""
@@ -658,6 +771,22 @@ class TestConvenienceFunctions(unittest.TestCase):
         self.assertIsInstance(mac, str)
         self.assertRegex(mac, r'^[0-9A-F]{2}:[0-9A-F]{2}:[0-9A-F]{2}:[0-9A-F]{2}:[0-9A-F]{2}:[0-9A-F]{2}$')
     
+    def test_network_convenience_functions_share_manager(self):
+        """Test network convenience functions reuse one manager"""
+        from libs.shadow.network import manager as network_manager
+        
+        network_manager.reset_default_manager()
+        network_manager.get_network_interfaces()
+        shared = network_manager._default_manager
+        network_manager.spoof_mac_address("eth0")
+        
+        self.assertIsInstance(shared, ShadowNetworkManager)
+        self.assertIs(network_manager._default_manager, shared)
+        self.assertEqual(len(shared.operation_log), 0)  # Shared manager does not keep a log
+        
+        network_manager.reset_default_manager()
+        self.assertIsNone(network_manager._default_manager)
+    
     def test_obfuscation_convenience_functions(self):
         """Test obfuscation convenience functions"""
         from libs.shadow.obfuscation.manager import (